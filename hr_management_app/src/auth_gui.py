@@ -14,6 +14,7 @@ from hr_management_app.src.database.database import (
     reset_password_with_token,
     send_password_reset_email,
     send_verification_code,
+    user_must_reset,
     verify_user,
 )
 
@@ -253,6 +254,14 @@ class AuthWindow(tk.Tk):
             messagebox.showerror("Error", "Email and password required", parent=self)
             return
         if not verify_user(email, pw):
+            if user_must_reset(email):
+                messagebox.showinfo(
+                    "Set password",
+                    "This account was created by an import and has no password yet.\n"
+                    "Use 'Forgot Password' to set one.",
+                    parent=self,
+                )
+                return
             messagebox.showerror("Error", "Invalid credentials", parent=self)
             return
 
@@ -57,3 +57,11 @@ def clean_tables_before_test():
         # If cleanup fails, let tests surface the issue
         pass
     yield
+    # Release pooled connections so tests can delete/replace their DB files
+    # (open handles block os.remove on Windows).
+    try:
+        from hr_management_app.src.database import database as db
+
+        db.close_all_connections()
+    except Exception:
+        pass
@@ -0,0 +1,231 @@
+"""Streaming export of the audit tables (imputation_audit, role_audit,
+subset_status_history).
+
+Rows are read with cursor.fetchmany in chunks of ``chunk_size`` and written
+as they arrive, so memory use does not depend on the size of the table.
+Output is CSV or JSON Lines, optionally gzip-compressed; both are inferred
+from the file name (``.csv``, ``.jsonl``/``.ndjson``, plus ``.gz``) unless
+given explicitly.
+
+Filters (all optional, combined with AND):
+
+- since / until: ISO-8601 timestamps (or date/datetime objects) compared as
+  text against the table's time column; since is inclusive, until exclusive.
+- source: imputation_audit.source (other tables have no source column).
+- actor_user_id: the user who made the change.
+- import_session_id: imputation_audit rows written by one import.
+
+When several tables are exported into one file, each row (CSV line or JSON
+object) carries a "table" value and CSV output uses the union of the tables'
+columns. `columns` narrows the export to a subset of the columns.
+"""
+
+import csv
+import gzip
+import json
+import logging
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .database import _conn
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLES: Dict[str, Dict[str, Any]] = {
+    "imputation_audit": {
+        "columns": (
+            "id",
+            "row_index",
+            "field",
+            "old_value",
+            "new_value",
+            "source",
+            "actor_user_id",
+            "applied_at",
+            "import_session_id",
+        ),
+        "time": "applied_at",
+    },
+    "role_audit": {
+        "columns": ("id", "changed_user_id", "old_role", "new_role", "actor_user_id", "changed_at"),
+        "time": "changed_at",
+    },
+    "subset_status_history": {
+        "columns": ("id", "subset_id", "old_status", "new_status", "actor_user_id", "changed_at"),
+        "time": "changed_at",
+    },
+}
+FORMATS = ("csv", "jsonl")
+EXPORT_CHUNK_SIZE = 5000
+
+TimeBound = Union[str, date, None]
+
+
+def _as_text(value: TimeBound) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _audit_query(
+    table: str,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    source: Optional[str] = None,
+    actor_user_id: Optional[int] = None,
+    import_session_id: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Tuple[str, List[Any]]:
+    spec = AUDIT_TABLES.get(table)
+    if spec is None:
+        raise ValueError(f"unknown audit table {table!r} (expected one of {', '.join(AUDIT_TABLES)})")
+    unknown = [col for col in columns or () if col not in spec["columns"]]
+    if unknown:
+        raise ValueError(f"{table} has no column {', '.join(unknown)}")
+    where: List[str] = []
+    params: List[Any] = []
+    if _as_text(since) is not None:
+        where.append(f"{spec['time']} >= ?")
+        params.append(_as_text(since))
+    if _as_text(until) is not None:
+        where.append(f"{spec['time']} < ?")
+        params.append(_as_text(until))
+    for column, value in (("source", source), ("import_session_id", import_session_id)):
+        if value is None:
+            continue
+        if column not in spec["columns"]:
+            raise ValueError(f"{table} has no {column} column to filter on")
+        where.append(f"{column} = ?")
+        params.append(value)
+    if actor_user_id is not None:
+        where.append("actor_user_id = ?")
+        params.append(actor_user_id)
+    sql = f"SELECT {', '.join(columns or spec['columns'])} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY id", params
+
+
+def iter_audit_rows(
+    table: str,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    source: Optional[str] = None,
+    actor_user_id: Optional[int] = None,
+    import_session_id: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[List[Tuple]]:
+    """Yield lists of at most chunk_size matching rows of one audit table, in id order.
+
+    Columns are `columns` or else AUDIT_TABLES[table]["columns"]. The pooled
+    connection is held until the generator is exhausted or closed.
+    """
+    sql, params = _audit_query(
+        table, since, until, source, actor_user_id, import_session_id, columns
+    )
+    with _conn() as conn:
+        c = conn.cursor()
+        c.execute(sql, params)
+        while True:
+            rows = c.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+
+def resolve_format(path: str, fmt: Optional[str] = None, compress: Optional[bool] = None) -> Tuple[str, bool]:
+    """Return (format, compress) for path; explicit arguments win over the file name."""
+    name = path.lower()
+    if compress is None:
+        compress = name.endswith(".gz")
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if fmt is None:
+        fmt = "jsonl" if name.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    return fmt, compress
+
+
+def _open_output(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def export_audit(
+    path: str,
+    tables: Sequence[str] = ("imputation_audit",),
+    fmt: Optional[str] = None,
+    compress: Optional[bool] = None,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    source: Optional[str] = None,
+    actor_user_id: Optional[int] = None,
+    import_session_id: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> int:
+    """Stream the matching rows of the given audit tables to path. Returns the number of rows written."""
+    if isinstance(tables, str):
+        tables = [tables]
+    tables = list(dict.fromkeys(tables))
+    if not tables:
+        raise ValueError("no audit table to export")
+    fmt, compress = resolve_format(path, fmt, compress)
+    filters = {
+        "since": since,
+        "until": until,
+        "source": source,
+        "actor_user_id": actor_user_id,
+        "import_session_id": import_session_id,
+    }
+    # validate every table's filters before creating the file
+    for table in tables:
+        _audit_query(table, columns=columns, **filters)
+
+    multi = len(tables) > 1
+    header: List[str] = ["table"] if multi else []
+    for table in tables:
+        header += [col for col in columns or AUDIT_TABLES[table]["columns"] if col not in header]
+
+    total = 0
+    try:
+        with _open_output(path, compress) as fh:
+            if fmt == "csv":
+                writer = csv.writer(fh)
+                writer.writerow(header)
+            for table in tables:
+                table_columns = list(columns or AUDIT_TABLES[table]["columns"])
+                if fmt == "csv" and multi:
+                    positions = [header.index(col) for col in table_columns]
+                keys = (["table"] if multi else []) + table_columns
+                prefix = (table,) if multi else ()
+                for rows in iter_audit_rows(
+                    table, chunk_size=chunk_size, columns=table_columns, **filters
+                ):
+                    if fmt == "csv":
+                        if multi:
+                            out = []
+                            for row in rows:
+                                line: List[Any] = [None] * len(header)
+                                line[0] = table
+                                for pos, value in zip(positions, row):
+                                    line[pos] = value
+                                out.append(line)
+                            writer.writerows(out)
+                        else:
+                            writer.writerows(rows)
+                    else:
+                        fh.write(
+                            "".join(
+                                json.dumps(dict(zip(keys, prefix + tuple(row))), ensure_ascii=False) + "\n"
+                                for row in rows
+                            )
+                        )
+                    total += len(rows)
+        return total
+    except Exception as exc:
+        logger.exception("Failed to export %s to %s: %s", ", ".join(tables), path, exc)
+        raise
@@ -1,10 +1,9 @@
-import csv
 import hashlib
 import logging
 import os
 import random
+import re
 import secrets
-import smtplib
 import uuid
 import sqlite3
 import threading
@@ -13,8 +12,11 @@ import json
 from contextlib import contextmanager
 from types import SimpleNamespace
 from datetime import date, datetime, timedelta, timezone
-from email.message import EmailMessage
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .migrations import migrate
+from .pool import DEFAULT_MAX_IDLE, PoolRegistry
+from .pragmas import DEFAULT_PROFILE, SINGLE_WRITER_PROFILES, apply_pragmas, resolve_profile
 
 DB_NAME = os.getenv("HR_MANAGEMENT_TEST_DB", "hr_management.db")
 
@@ -25,305 +27,113 @@ if not logger.handlers:
     logging.basicConfig(level=logging.INFO)
 
 
-@contextmanager
-def _conn():
-    """Context manager that yields a sqlite3.Connection and ensures it is closed.
+# Connection pooling: every helper goes through _conn(), so connections are
+# opened once per resolved DB path and reused. Pool size can be tuned with
+# HR_MANAGEMENT_DB_POOL_SIZE (number of idle connections retained per DB file).
+POOL_SIZE = int(os.getenv("HR_MANAGEMENT_DB_POOL_SIZE", str(DEFAULT_MAX_IDLE)))
 
-    Use like: with _conn() as conn: ...
-    This prevents ResourceWarnings when callers forget to close connections.
+# Pragma profile applied to every new connection (see pragmas.py). Set
+# HR_MANAGEMENT_DB_PROFILE=multi_reader_single_writer for shared deployments.
+DB_PROFILE = os.getenv("HR_MANAGEMENT_DB_PROFILE", DEFAULT_PROFILE)
+
+# serializes writers inside this process in single-writer profiles
+_write_lock = threading.RLock()
+
+
+def _resolve_db_path() -> str:
+    """Return the DB file path for this call.
+
+    Resolved at call time so tests can override via HR_MANAGEMENT_TEST_DB env var.
     """
-    # Resolve DB path at call time so tests can override via HR_MANAGEMENT_TEST_DB env var.
     env_db = os.getenv("HR_MANAGEMENT_TEST_DB")
     if env_db:
         # if absolute path provided, use it; otherwise treat as relative to package dir
         if os.path.isabs(env_db):
-            path = env_db
-        else:
-            path = os.path.join(os.path.dirname(__file__), env_db)
-    else:
-        path = os.path.join(os.path.dirname(__file__), DB_NAME)
-    conn = sqlite3.connect(path)
-    # ensure core schema exists for this connection (helps tests that change the env var)
+            return env_db
+        return os.path.join(os.path.dirname(__file__), env_db)
+    return os.path.join(os.path.dirname(__file__), DB_NAME)
+
+
+def _configure_connection(conn) -> None:
+    """Run once for every newly opened pooled connection."""
+    apply_pragmas(conn, resolve_profile(DB_PROFILE))
+    # ensure the schema for this DB file is current (helps tests that change the
+    # env var); when it already is, this is a single PRAGMA user_version read
     try:
-        c = conn.cursor()
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        if not c.fetchone():
-            # create tables on this connection
-            _create_tables(conn)
+        migrate(conn)
     except Exception:
         # best-effort; if something goes wrong, let callers handle errors
-        pass
+        logger.exception("Failed to migrate DB schema for %s", _resolve_db_path())
+
+
+_pools = PoolRegistry(max_idle=POOL_SIZE, configure=_configure_connection)
+
+
+@contextmanager
+def _conn():
+    """Context manager that yields a pooled sqlite3.Connection.
+
+    Use like: with _conn() as conn: ...
+    The connection is returned to the pool on exit; any work that was not
+    committed is rolled back, exactly as closing a fresh connection would.
+    """
+    pool = _pools.get(_resolve_db_path())
+    conn = pool.acquire()
     try:
         yield conn
         # commit is usually explicit in callers; do not auto-commit here
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
+        pool.release(conn)
 
-def init_db() -> None:
-    """Create required tables if missing."""
-    with _conn() as conn:
-        _create_tables(conn)
 
+@contextmanager
+def _write_conn():
+    """Like _conn() but the yielded connection already holds the write lock.
 
-def _create_tables(conn) -> None:
-    """Create core tables on the given sqlite3 connection object."""
-    c = conn.cursor()
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS contracts (
-            id INTEGER PRIMARY KEY,
-            employee_id INTEGER,
-            construction_id INTEGER,
-            parent_contract_id INTEGER,
-            area TEXT,
-            incharge TEXT,
-            start_date TEXT,
-            end_date TEXT,
-            terms TEXT,
-            contract_file_path TEXT
-        )
-    """
-    )
-    # Contract subsets (each contract can have many subsets/phases/tasks)
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS contract_subsets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_id INTEGER,
-            title TEXT,
-            description TEXT,
-            status TEXT,
-            order_index INTEGER DEFAULT 0
-        )
-    """
-    )
-    # History of status changes for contract subsets
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS subset_status_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            subset_id INTEGER,
-            old_status TEXT,
-            new_status TEXT,
-            actor_user_id INTEGER,
-            changed_at TEXT
-        )
+    The transaction is opened with BEGIN IMMEDIATE, so a locked database is
+    waited on (busy_timeout) before any work is done and reads made inside the
+    block are consistent with the write. Callers commit as usual. In
+    single-writer profiles, writers in this process also take turns on a lock.
     """
-    )
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS attendance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_id INTEGER,
-            check_in TEXT,
-            check_out TEXT
-        )
-    """
-    )
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            salt TEXT NOT NULL,
-            reset_token TEXT,
-            reset_expiry TEXT,
-            totp_secret TEXT,
-            role TEXT DEFAULT 'engineer'
-        )
-    """
-    )
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS employees (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER UNIQUE,
-            employee_number INTEGER UNIQUE,
-            name TEXT,
-            dob TEXT,
-            job_title TEXT,
-            role TEXT,
-            year_start INTEGER,
-            year_end INTEGER,
-            profile_pic TEXT,
-            contract_type TEXT,
-            FOREIGN KEY(user_id) REFERENCES users(id)
-        )
-    """
-    )
-    # Create useful indices for search performance
+    serialize = str(DB_PROFILE).strip().lower() in SINGLE_WRITER_PROFILES
+    if serialize:
+        _write_lock.acquire()
     try:
-        c.execute("CREATE INDEX IF NOT EXISTS idx_employees_employee_number ON employees(employee_number)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_contracts_construction_id ON contracts(construction_id)")
-    except Exception:
-        # ignore if index creation unsupported
-        pass
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS role_audit (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            changed_user_id INTEGER,
-            old_role TEXT,
-            new_role TEXT,
-            actor_user_id INTEGER,
-            changed_at TEXT
-        )
-    """
-    )
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS imputation_audit (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            row_index INTEGER,
-            field TEXT,
-            old_value TEXT,
-            new_value TEXT,
-            source TEXT,
-            actor_user_id INTEGER,
-            applied_at TEXT
-        )
+        with _conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+    finally:
+        if serialize:
+            _write_lock.release()
+
+
+def get_pool_stats() -> dict:
+    """Return connection pool statistics keyed by DB path.
+
+    Each entry has created/reused/closed/discarded/overflow counters plus the
+    current in_use/idle counts.
     """
-    )
-    conn.commit()
+    return _pools.stats()
 
-    # Email outbox table for durable sends & retries
-    try:
-        c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS email_outbox (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                to_email TEXT,
-                subject TEXT,
-                body TEXT,
-                raw_message TEXT,
-                status TEXT DEFAULT 'pending', -- pending, sent, failed
-                attempt_count INTEGER DEFAULT 0,
-                last_error TEXT,
-                last_attempt_at TEXT,
-                created_at TEXT,
-                tracking_code TEXT
-            )
-        """
-        )
-        conn.commit()
-    except Exception:
-        # non-fatal; outbox is optional
-        logger.exception("Failed to create email_outbox table")
-    # Pending contracts table: stores submissions that require management approval
-    try:
-        c.execute(
-            """
-            CREATE TABLE IF NOT EXISTS pending_contracts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contract_id INTEGER,
-                employee_id INTEGER,
-                construction_id INTEGER,
-                parent_contract_id INTEGER,
-                area TEXT,
-                incharge TEXT,
-                start_date TEXT,
-                end_date TEXT,
-                terms TEXT,
-                file_path TEXT,
-                submitted_by INTEGER,
-                submitted_at TEXT,
-                status TEXT DEFAULT 'pending', -- pending, approved, rejected
-                approved_by INTEGER,
-                approved_at TEXT,
-                rejection_reason TEXT
-            )
-        """
-        )
-        conn.commit()
-    except Exception:
-        logger.exception("Failed to create pending_contracts table")
 
-    # Create FTS5 virtual table for contracts text search (terms, area, incharge)
-    try:
-        # Create a shadow FTS table and triggers if not present
-        c.execute(
-            "CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(terms, area, incharge, content='contracts', content_rowid='id')"
-        )
-        # Triggers to keep FTS in sync
-        c.executescript(
-            """
-            CREATE TRIGGER IF NOT EXISTS contracts_ai AFTER INSERT ON contracts BEGIN
-                INSERT INTO contracts_fts(rowid, terms, area, incharge) VALUES (new.id, new.terms, new.area, new.incharge);
-            END;
-            CREATE TRIGGER IF NOT EXISTS contracts_ad AFTER DELETE ON contracts BEGIN
-                INSERT INTO contracts_fts(contracts_fts, rowid, terms, area, incharge) VALUES('delete', old.id, old.terms, old.area, old.incharge);
-            END;
-            CREATE TRIGGER IF NOT EXISTS contracts_au AFTER UPDATE ON contracts BEGIN
-                INSERT INTO contracts_fts(contracts_fts, rowid, terms, area, incharge) VALUES('delete', old.id, old.terms, old.area, old.incharge);
-                INSERT INTO contracts_fts(rowid, terms, area, incharge) VALUES (new.id, new.terms, new.area, new.incharge);
-            END;
-            """
-        )
-        conn.commit()
-    except Exception:
-        # FTS may not be available in the SQLite build; that's fine — fall back to LIKE queries
-        pass
+def close_all_connections() -> int:
+    """Close idle pooled connections (e.g. before deleting or replacing a DB file)."""
+    return _pools.close_all()
 
-    # Migration: ensure contract_file_path column exists on older DBs
-    def _ensure_column(table: str, column: str, column_type: str = "TEXT") -> None:
-        try:
-            with _conn() as conn:
-                c = conn.cursor()
-                c.execute(f"PRAGMA table_info({table})")
-                cols = [r[1] for r in c.fetchall()]
-                if column not in cols:
-                    # ALTER TABLE add column is supported by SQLite and is idempotent here
-                    c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
-                    conn.commit()
-        except Exception:
-            logger.exception("Failed to ensure column %s on table %s", column, table)
-
-    _ensure_column("contracts", "contract_file_path", "TEXT")
-    # ensure new columns for hierarchical contracts exist
-    _ensure_column("contracts", "parent_contract_id", "INTEGER")
-    _ensure_column("contracts", "area", "TEXT")
-    _ensure_column("contracts", "incharge", "TEXT")
-    # soft-delete support
-    _ensure_column("contracts", "deleted", "INTEGER DEFAULT 0")
-    _ensure_column("contracts", "deleted_at", "TEXT")
-    # ensure new construction_id column exists and migrate values from old employee_id if present
-    try:
-        with _conn() as conn:
-            c = conn.cursor()
-            c.execute("PRAGMA table_info(contracts)")
-            cols = [r[1] for r in c.fetchall()]
-            if "construction_id" not in cols:
-                c.execute("ALTER TABLE contracts ADD COLUMN construction_id INTEGER")
-                conn.commit()
-                # if employee_id exists, copy values into construction_id for backward compatibility
-                if "employee_id" in cols:
-                    try:
-                        c.execute(
-                            "UPDATE contracts SET construction_id = employee_id WHERE construction_id IS NULL AND employee_id IS NOT NULL"
-                        )
-                        conn.commit()
-                    except Exception:
-                        logger.exception(
-                            "Failed to copy employee_id -> construction_id during migration"
-                        )
-    except Exception:
-        logger.exception("Failed to ensure construction_id column on contracts table")
 
-    def _safe_lastrowid(cursor) -> int:
-        """Return an int lastrowid or 0 if None/invalid."""
-        try:
-            lid = getattr(cursor, "lastrowid", None)
-            if lid is None:
-                return 0
-            return int(lid)
-        except Exception:
-            return 0
+def init_db() -> None:
+    """Create required tables if missing and apply pending schema migrations.
+
+    Calling this is optional: the first pooled connection to a DB file runs the
+    same migrations, so importing this module never touches the database.
+    """
+    with _conn() as conn:
+        migrate(conn)
+
+
+def new_import_session_id() -> str:
+    """A fresh id for grouping the imputation audit rows of one import."""
+    return uuid.uuid4().hex
 
 
 def record_imputation_audit(
@@ -333,6 +143,7 @@ def record_imputation_audit(
     new_value: Optional[str],
     source: str = "import_preview",
     actor_user_id: Optional[int] = None,
+    import_session_id: Optional[str] = None,
 ) -> None:
     """Record an imputation decision into the imputation_audit table.
 
@@ -341,61 +152,99 @@ def record_imputation_audit(
     old_value/new_value: textual values prior to and after imputation.
     source: where the imputation originated (preview, ml, heuristic, etc.).
     actor_user_id: optional user id who accepted the imputation.
+    import_session_id: optional id of the import the row belongs to.
+
+    For more than a handful of decisions use record_imputation_audits.
     """
-    try:
-        from datetime import datetime
+    record_imputation_audits(
+        [
+            {
+                "row_index": row_index,
+                "field": field,
+                "old_value": old_value,
+                "new_value": new_value,
+                "source": source,
+                "actor_user_id": actor_user_id,
+            }
+        ],
+        import_session_id=import_session_id,
+    )
 
-        applied_at = datetime.now(timezone.utc).isoformat()
-        with _conn() as conn:
-            c = conn.cursor()
-            c.execute(
-                "INSERT INTO imputation_audit (row_index, field, old_value, new_value, source, actor_user_id, applied_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    row_index,
-                    field,
-                    old_value,
-                    new_value,
-                    source,
-                    actor_user_id,
-                    applied_at,
-                ),
+
+def record_imputation_audits(
+    rows: Iterable[Dict[str, Any]],
+    import_session_id: Optional[str] = None,
+    source: str = "import_preview",
+    actor_user_id: Optional[int] = None,
+) -> int:
+    """Record many imputation decisions in one transaction. Returns the rows written.
+
+    Each row is a dict with row_index, field, old_value and new_value, and
+    optionally source and actor_user_id (defaulting to the arguments). All
+    rows share one applied_at timestamp and `import_session_id`. Like
+    record_imputation_audit this is best-effort: a failure is logged, nothing
+    is written and 0 is returned.
+    """
+    applied_at = datetime.now(timezone.utc).isoformat()
+    params = [
+        (
+            r.get("row_index"),
+            r.get("field"),
+            r.get("old_value"),
+            r.get("new_value"),
+            r.get("source", source),
+            r.get("actor_user_id", actor_user_id),
+            applied_at,
+            import_session_id,
+        )
+        for r in rows
+    ]
+    if not params:
+        return 0
+    try:
+        with _write_conn() as conn:
+            conn.executemany(
+                "INSERT INTO imputation_audit (row_index, field, old_value, new_value, source, actor_user_id, applied_at, import_session_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                params,
             )
             conn.commit()
     except Exception:
         logger.exception(
-            "Failed to write imputation_audit for row %s field %s", row_index, field
+            "Failed to write %s imputation_audit rows (session %s)", len(params), import_session_id
         )
+        return 0
+    return len(params)
+
+
+# columns of the imputation audit CSV, in order
+IMPUTATION_AUDIT_CSV_COLUMNS = (
+    "row_index",
+    "field",
+    "old_value",
+    "new_value",
+    "source",
+    "actor_user_id",
+    "applied_at",
+    "import_session_id",
+)
 
 
-def export_imputation_audit_csv(path: str) -> int:
-    """Export imputation_audit table to CSV. Returns number of rows exported."""
-    try:
-        with _conn() as conn:
-            c = conn.cursor()
-            c.execute(
-                "SELECT row_index, field, old_value, new_value, source, actor_user_id, applied_at FROM imputation_audit ORDER BY id"
-            )
-            rows = c.fetchall()
-        # write CSV
-        with open(path, "w", newline="", encoding="utf-8") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(
-                [
-                    "row_index",
-                    "field",
-                    "old_value",
-                    "new_value",
-                    "source",
-                    "actor_user_id",
-                    "applied_at",
-                ]
-            )
-            for r in rows:
-                writer.writerow(r)
-        return len(rows)
-    except Exception as exc:
-        logger.exception("Failed to export imputation_audit to %s: %s", path, exc)
-        raise
+def export_imputation_audit_csv(path: str, **filters) -> int:
+    """Export imputation_audit table to CSV. Returns number of rows exported.
+
+    Rows are streamed in chunks; filters (since, until, source, actor_user_id,
+    import_session_id) and the other tables/formats are in audit_export.
+    """
+    from .audit_export import export_audit
+
+    return export_audit(
+        path,
+        ["imputation_audit"],
+        fmt="csv",
+        compress=False,
+        columns=IMPUTATION_AUDIT_CSV_COLUMNS,
+        **filters,
+    )
 
 
 # ---------- Contracts ----------
@@ -467,68 +316,129 @@ def get_all_contracts_filtered(include_deleted: bool = False) -> List[Tuple]:
             return c.fetchall()
 
 
+_CONTRACT_SEARCH_COLUMNS = "id, employee_id, construction_id, parent_contract_id, start_date, end_date, area, incharge, terms, contract_file_path, deleted, deleted_at"
+
+# markers put around matched words in contract search snippets, and snippet length in tokens
+SNIPPET_MARKERS = ("[", "]")
+SNIPPET_TOKENS = 12
+
+
+def _has_contracts_fts(c) -> bool:
+    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='contracts_fts'")
+    return c.fetchone() is not None
+
+
+def _search_contract_hits(
+    c, term: str, include_deleted: bool, offset: int, limit: Optional[int], with_total: bool
+) -> Tuple[List[Tuple], Optional[int]]:
+    """Rows (search_contracts columns + snippet of terms) for one page of hits, and the hit count.
+
+    Exact id / construction_id hits for numeric terms come first, then FTS hits
+    by rank (bm25). Without a term every contract is returned, newest first; the
+    LIKE fallback (no FTS5) also orders by id.
+    """
+    cols = "c." + _CONTRACT_SEARCH_COLUMNS.replace(", ", ", c.")
+    deleted_sql = "" if include_deleted else " AND (c.deleted IS NULL OR c.deleted = 0)"
+    stop = None if limit is None else offset + limit
+    if term:
+        try:
+            if _has_contracts_fts(c):
+                exact: List[Tuple] = []
+                if term.isdigit():
+                    c.execute(
+                        f"SELECT {cols}, NULL FROM contracts c WHERE (c.id = ? OR c.construction_id = ?){deleted_sql} ORDER BY c.id DESC",
+                        (int(term), int(term)),
+                    )
+                    exact = c.fetchall()
+                rows = exact[offset:stop]
+                query = _fts_prefix_query(term)
+                if not query:
+                    return rows, len(exact)
+                match_sql = (
+                    " FROM contracts_fts JOIN contracts c ON c.id = contracts_fts.rowid"
+                    " WHERE contracts_fts MATCH ? AND c.id NOT IN (SELECT value FROM json_each(?))" + deleted_sql
+                )
+                match_params = (query, json.dumps([r[0] for r in exact]))
+                total = None
+                if with_total:
+                    c.execute("SELECT COUNT(*)" + match_sql, match_params)
+                    total = len(exact) + c.fetchone()[0]
+                if limit is None or len(rows) < limit:
+                    c.execute(
+                        f"SELECT {cols}, snippet(contracts_fts, 0, ?, ?, '…', ?)" + match_sql + " ORDER BY rank LIMIT ? OFFSET ?",
+                        (
+                            *SNIPPET_MARKERS,
+                            SNIPPET_TOKENS,
+                            *match_params,
+                            -1 if limit is None else limit - len(rows),
+                            max(0, offset - len(exact)),
+                        ),
+                    )
+                    rows.extend(c.fetchall())
+                return rows, total
+        except Exception:
+            # if anything goes wrong with FTS, fall back
+            logger.debug("contracts_fts search failed; falling back to LIKE", exc_info=True)
+
+    # Fallback to LIKE-based search (older SQLite)
+    params: List[object] = []
+    search_parts: List[str] = []
+    if term:
+        like = f"%{term}%"
+        search_parts.append("(c.area LIKE ? OR c.incharge LIKE ? OR c.terms LIKE ?)")
+        params.extend([like, like, like])
+        if term.isdigit():
+            search_parts.append("(c.id = ? OR c.construction_id = ?)")
+            params.extend([int(term), int(term)])
+    where_sql = " WHERE 1 = 1"
+    if search_parts:
+        where_sql += " AND (" + " OR ".join(search_parts) + ")"
+    where_sql += deleted_sql
+    total = None
+    if with_total:
+        c.execute("SELECT COUNT(*) FROM contracts c" + where_sql, tuple(params))
+        total = c.fetchone()[0]
+    c.execute(
+        f"SELECT {cols}, NULL FROM contracts c" + where_sql + " ORDER BY c.id DESC LIMIT ? OFFSET ?",
+        (*params, -1 if limit is None else limit, offset),
+    )
+    return c.fetchall(), total
+
+
 def search_contracts(term: str, include_deleted: bool = False, limit: Optional[int] = None) -> List[Tuple]:
     """Search contracts by id, area, incharge, terms, or construction_id.
 
-    term: search string; numeric strings will be matched against id and construction_id.
+    term: search string; every word is matched as a word prefix against terms,
+    area and incharge, best matches (bm25) first. Numeric strings also match id
+    and construction_id exactly; those rows come first.
     include_deleted: include soft-deleted rows when True.
     limit: optional cap on returned rows.
     Returns list of rows in the same shape as get_all_contracts_filtered.
     """
     term = (term or "").strip()
-    term = (term or "").strip()
+    limit = int(limit) if limit and int(limit) > 0 else None
     with _conn() as conn:
-        c = conn.cursor()
-        # Prefer FTS5 when available for text search
-        try:
-            # check if FTS table exists
-            c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='contracts_fts'")
-            if c.fetchone() and term:
-                # Use MATCH for fts5; numeric terms should match id/construction_id OR the FTS match
-                params: List[object] = []
-                search_or: List[str] = []
-                if term.isdigit():
-                    search_or.append("(id = ? OR construction_id = ?)")
-                    params.extend([int(term), int(term)])
-                # FTS MATCH query (match against terms, area, incharge)
-                search_or.append("id IN (SELECT rowid FROM contracts_fts WHERE contracts_fts MATCH ?)")
-                params.append(term)
-                where = []
-                where.append("(" + " OR ".join(search_or) + ")")
-                if not include_deleted:
-                    where.append("(deleted IS NULL OR deleted = 0)")
-                sql = "SELECT id, employee_id, construction_id, parent_contract_id, start_date, end_date, area, incharge, terms, contract_file_path, deleted, deleted_at FROM contracts WHERE " + " AND ".join(where) + " ORDER BY id DESC"
-                if limit and int(limit) > 0:
-                    sql += f" LIMIT {int(limit)}"
-                c.execute(sql, tuple(params))
-                return c.fetchall()
-        except Exception:
-            # if anything goes wrong with FTS, fall back
-            pass
+        rows, _ = _search_contract_hits(conn.cursor(), term, include_deleted, 0, limit, with_total=False)
+    return [r[:12] for r in rows]
 
-        # Fallback to LIKE-based search (older SQLite)
-        params: List[object] = []
-        search_parts: List[str] = []
-        if term:
-            like = f"%{term}%"
-            search_parts.append("(area LIKE ? OR incharge LIKE ? OR terms LIKE ?)")
-            params.extend([like, like, like])
-            if term.isdigit():
-                search_parts.append("(id = ? OR construction_id = ?)")
-                params.extend([int(term), int(term)])
-        where_clauses: List[str] = []
-        if search_parts:
-            where_clauses.append("(" + " OR ".join(search_parts) + ")")
-        if not include_deleted:
-            where_clauses.append("(deleted IS NULL OR deleted = 0)")
-        where_sql = ""
-        if where_clauses:
-            where_sql = " WHERE " + " AND ".join(where_clauses)
-        limit_sql = f" LIMIT {int(limit)}" if limit and int(limit) > 0 else ""
-        base = "SELECT id, employee_id, construction_id, parent_contract_id, start_date, end_date, area, incharge, terms, contract_file_path, deleted, deleted_at FROM contracts"
-        sql = base + where_sql + " ORDER BY id DESC" + limit_sql
-        c.execute(sql, tuple(params))
-        return c.fetchall()
+
+def search_contracts_page(
+    term: str, include_deleted: bool = False, page: int = 1, page_size: int = 50
+) -> Tuple[List[Tuple], int]:
+    """One page of ranked contract search results plus the total number of hits.
+
+    Same matching and order as search_contracts. Each row has the
+    search_contracts columns followed by a snippet of `terms` around the matched
+    words, wrapped in SNIPPET_MARKERS ("…" marks cut text). The snippet is None
+    for exact id / construction_id hits and when FTS5 is unavailable.
+    page is 1-based.
+    """
+    term = (term or "").strip()
+    page_size = max(1, int(page_size))
+    offset = (max(1, int(page)) - 1) * page_size
+    with _conn() as conn:
+        rows, total = _search_contract_hits(conn.cursor(), term, include_deleted, offset, page_size, with_total=True)
+    return rows, int(total or 0)
 
 
 # ---------- Contract subsets & status tracking ----------
@@ -622,15 +532,134 @@ def get_child_contracts(contract_id: int) -> List[Tuple]:
         return c.fetchall()
 
 
-def get_subsets_count(contract_id: int) -> int:
+def get_subset_counts(contract_ids: Iterable[int]) -> Dict[int, int]:
+    """Return {contract_id: number of subsets} for the given ids (0 when none).
+
+    Uses one grouped query per 500 ids instead of a COUNT per contract.
+    """
+    ids = sorted({int(i) for i in contract_ids})
+    counts = {cid: 0 for cid in ids}
+    if not ids:
+        return counts
+    with _conn() as conn:
+        c = conn.cursor()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            c.execute(
+                f"SELECT contract_id, COUNT(1) FROM contract_subsets WHERE contract_id IN ({marks}) GROUP BY contract_id",
+                chunk,
+            )
+            for cid, n in c.fetchall():
+                counts[int(cid)] = int(n)
+    return counts
+
+
+def get_contract_forest(include_deleted: bool = False) -> List[Tuple]:
+    """Return all contracts with their subset counts in a single grouped query.
+
+    Row shape: id, employee_id, construction_id, parent_contract_id, start_date,
+    end_date, area, incharge, terms, contract_file_path, deleted, deleted_at,
+    subset_count. Callers build the tree from parent_contract_id.
+    """
+    where = "" if include_deleted else "WHERE c.deleted = 0"
+    with _conn() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT c.id, c.employee_id, c.construction_id, c.parent_contract_id, c.start_date, c.end_date,
+                   c.area, c.incharge, c.terms, c.contract_file_path, c.deleted, c.deleted_at,
+                   COUNT(s.id) AS subset_count
+            FROM contracts c
+            LEFT JOIN contract_subsets s ON s.contract_id = c.id
+            {where}
+            GROUP BY c.id
+            ORDER BY c.id
+        """
+        )
+        return c.fetchall()
+
+
+# sortable columns of the contracts tree -> SQL expression
+CONTRACT_TREE_SORT_COLUMNS = {
+    "cid": "c.id",
+    "area": "c.area",
+    "incharge": "c.incharge",
+    "start": "c.start_date",
+    "end": "c.end_date",
+    "subsets": "subset_count",
+}
+
+
+def get_contract_children(
+    parent_id: Optional[int],
+    include_deleted: bool = False,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+) -> List[Tuple]:
+    """Return the direct children of `parent_id` (root contracts when None).
+
+    Row shape is that of get_contract_forest plus a trailing has_children flag
+    (0/1), so a tree view can show an expander without loading the next level.
+    order_by is a key of CONTRACT_TREE_SORT_COLUMNS; ties are ordered by id.
+    """
+    deleted_filter = "" if include_deleted else " AND c.deleted = 0"
+    child_filter = "" if include_deleted else " AND ch.deleted = 0"
+    if parent_id is None:
+        where = "c.parent_contract_id IS NULL"
+        params: Tuple = ()
+    else:
+        where = "c.parent_contract_id = ?"
+        params = (int(parent_id),)
+    order = "c.id"
+    sort_expr = CONTRACT_TREE_SORT_COLUMNS.get(order_by or "")
+    if sort_expr:
+        direction = "DESC" if descending else "ASC"
+        order = f"{sort_expr} {direction}, c.id {direction}"
     with _conn() as conn:
         c = conn.cursor()
         c.execute(
-            "SELECT COUNT(1) FROM contract_subsets WHERE contract_id = ?",
-            (contract_id,),
+            f"""
+            SELECT c.id, c.employee_id, c.construction_id, c.parent_contract_id, c.start_date, c.end_date,
+                   c.area, c.incharge, c.terms, c.contract_file_path, c.deleted, c.deleted_at,
+                   (SELECT COUNT(1) FROM contract_subsets s WHERE s.contract_id = c.id) AS subset_count,
+                   EXISTS (SELECT 1 FROM contracts ch WHERE ch.parent_contract_id = c.id{child_filter}) AS has_children
+            FROM contracts c
+            WHERE {where}{deleted_filter}
+            ORDER BY {order}
+        """,
+            params,
         )
-        row = c.fetchone()
-        return int(row[0]) if row and row[0] else 0
+        return c.fetchall()
+
+
+def get_contract_ancestry(
+    contract_ids: Iterable[int], include_deleted: bool = False
+) -> Dict[int, Optional[int]]:
+    """Return {id: parent_contract_id} for the given contracts and all their ancestors.
+
+    A tree view can show exactly these nodes to keep every match reachable from
+    a root.
+    """
+    ids = sorted({int(i) for i in contract_ids})
+    deleted_filter = "" if include_deleted else " AND deleted = 0"
+    ancestor_filter = "" if include_deleted else " WHERE p.deleted = 0"
+    with _conn() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            WITH RECURSIVE ancestry(id, parent_contract_id) AS (
+                SELECT id, parent_contract_id FROM contracts
+                WHERE id IN (SELECT value FROM json_each(?)){deleted_filter}
+                UNION
+                SELECT p.id, p.parent_contract_id
+                FROM contracts p JOIN ancestry a ON p.id = a.parent_contract_id{ancestor_filter}
+            )
+            SELECT id, parent_contract_id FROM ancestry
+        """,
+            (json.dumps(ids),),
+        )
+        return {int(r[0]): (int(r[1]) if r[1] is not None else None) for r in c.fetchall()}
 
 
 def get_contract_by_id(
@@ -664,6 +693,25 @@ def get_contract_by_id(
             return c.fetchone()
 
 
+# Contract hierarchies are walked in SQL: `subtree` holds the seed contracts and
+# every descendant via parent_contract_id (UNION, not UNION ALL, so a bad
+# parent cycle cannot recurse forever). Format with a WHERE clause for the seed.
+_SUBTREE_CTE = """
+    WITH RECURSIVE subtree(id) AS (
+        SELECT id FROM contracts WHERE {seed}
+        UNION
+        SELECT c.id FROM contracts c JOIN subtree s ON c.parent_contract_id = s.id
+    )
+"""
+
+
+def _subtree_ids_sql(cascade: bool) -> str:
+    """SQL selecting the ids of contract `?` (and its descendants when cascading)."""
+    if not cascade:
+        return "SELECT ?"
+    return _SUBTREE_CTE.format(seed="id = ?") + " SELECT id FROM subtree"
+
+
 def soft_delete_contract(contract_id: int, cascade: bool = True) -> None:
     """Mark a contract (and optionally descendants) as deleted (soft delete).
 
@@ -673,32 +721,11 @@ def soft_delete_contract(contract_id: int, cascade: bool = True) -> None:
         from datetime import datetime
 
         when = datetime.now().isoformat()
-        with _conn() as conn:
-            c = conn.cursor()
-            # collect all descendant contract ids (DFS)
-            to_mark = [int(contract_id)]
-            if cascade:
-                stack = [int(contract_id)]
-                while stack:
-                    cur = stack.pop()
-                    c.execute(
-                        "SELECT id FROM contracts WHERE parent_contract_id = ?", (cur,)
-                    )
-                    rows = c.fetchall()
-                    for r in rows:
-                        cid = int(r[0])
-                        to_mark.append(cid)
-                        stack.append(cid)
-
-            for cid in set(to_mark):
-                try:
-                    c.execute(
-                        "UPDATE contracts SET deleted = 1, deleted_at = ? WHERE id = ?",
-                        (when, cid),
-                    )
-                except Exception:
-                    # best-effort per-row update
-                    logger.exception("Failed to soft-delete contract %s", cid)
+        with _write_conn() as conn:
+            conn.execute(
+                f"UPDATE contracts SET deleted = 1, deleted_at = ? WHERE id IN ({_subtree_ids_sql(cascade)})",
+                (when, int(contract_id)),
+            )
             conn.commit()
     except Exception:
         logger.exception("Failed to soft-delete contract %s", contract_id)
@@ -711,30 +738,11 @@ def restore_contract(contract_id: int, cascade: bool = True) -> None:
     Clears deleted flag and deleted_at timestamp.
     """
     try:
-        with _conn() as conn:
-            c = conn.cursor()
-            to_unmark = [int(contract_id)]
-            if cascade:
-                stack = [int(contract_id)]
-                while stack:
-                    cur = stack.pop()
-                    c.execute(
-                        "SELECT id FROM contracts WHERE parent_contract_id = ?", (cur,)
-                    )
-                    rows = c.fetchall()
-                    for r in rows:
-                        cid = int(r[0])
-                        to_unmark.append(cid)
-                        stack.append(cid)
-
-            for cid in set(to_unmark):
-                try:
-                    c.execute(
-                        "UPDATE contracts SET deleted = 0, deleted_at = NULL WHERE id = ?",
-                        (cid,),
-                    )
-                except Exception:
-                    logger.exception("Failed to restore contract %s", cid)
+        with _write_conn() as conn:
+            conn.execute(
+                f"UPDATE contracts SET deleted = 0, deleted_at = NULL WHERE id IN ({_subtree_ids_sql(cascade)})",
+                (int(contract_id),),
+            )
             conn.commit()
     except Exception:
         logger.exception("Failed to restore contract %s", contract_id)
@@ -763,75 +771,58 @@ def purge_deleted_older_than(days: int) -> int:
         from datetime import datetime, timedelta
 
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        purged = 0
-        with _conn() as conn:
+        with _write_conn() as conn:
             c = conn.cursor()
-            # find ids to purge
             try:
                 c.execute(
-                    "SELECT id FROM contracts WHERE deleted = 1 AND deleted_at < ?",
+                    "SELECT COUNT(*) FROM contracts WHERE deleted = 1 AND deleted_at < ?",
                     (cutoff,),
                 )
-                rows = c.fetchall()
+                purged = int(c.fetchone()[0])
             except Exception:
                 return 0
-            ids = [r[0] for r in rows]
-            if not ids:
+            if not purged:
                 return 0
-            # reuse existing hard-delete helper for each id
-            for cid in ids:
-                delete_contract_and_descendants(cid)
-                purged += 1
+            _delete_subtrees(c, "deleted = 1 AND deleted_at < ?", (cutoff,))
+            conn.commit()
         return purged
     except Exception:
         logger.exception("Failed to purge deleted contracts")
         raise
 
 
+def _delete_subtrees(c, seed: str, params: tuple) -> None:
+    """Delete the contracts matching `seed`, their descendants, subsets and subset history.
+
+    Three set-based statements; the caller owns the transaction. Children are
+    removed before the contracts themselves because the subtree is recomputed
+    from the contracts table by each statement.
+    """
+    cte = _SUBTREE_CTE.format(seed=seed)
+    c.execute(
+        cte
+        + """
+        DELETE FROM subset_status_history WHERE subset_id IN (
+            SELECT id FROM contract_subsets WHERE contract_id IN (SELECT id FROM subtree)
+        )
+        """,
+        params,
+    )
+    c.execute(
+        cte + " DELETE FROM contract_subsets WHERE contract_id IN (SELECT id FROM subtree)",
+        params,
+    )
+    c.execute(cte + " DELETE FROM contracts WHERE id IN (SELECT id FROM subtree)", params)
+
+
 def delete_contract_and_descendants(contract_id: int) -> None:
     """Recursively delete a contract, its subsets, subset history, and all descendant contracts.
 
     This operates in a single transaction to ensure consistency.
     """
     try:
-        with _conn() as conn:
-            c = conn.cursor()
-            # collect all descendant contract ids (DFS)
-            to_delete = []
-            stack = [int(contract_id)]
-            while stack:
-                cur = stack.pop()
-                to_delete.append(cur)
-                c.execute(
-                    "SELECT id FROM contracts WHERE parent_contract_id = ?", (cur,)
-                )
-                rows = c.fetchall()
-                for r in rows:
-                    stack.append(r[0])
-
-            # delete subsets and their history for each contract id
-            for cid in to_delete:
-                # delete history entries for subsets belonging to this contract
-                c.execute(
-                    "SELECT id FROM contract_subsets WHERE contract_id = ?",
-                    (cid,),
-                )
-                subset_ids = [r[0] for r in c.fetchall()]
-                if subset_ids:
-                    # delete subset status history
-                    c.executemany(
-                        "DELETE FROM subset_status_history WHERE subset_id = ?",
-                        [(sid,) for sid in subset_ids],
-                    )
-                    # delete subsets
-                    c.executemany(
-                        "DELETE FROM contract_subsets WHERE id = ?",
-                        [(sid,) for sid in subset_ids],
-                    )
-            # finally delete contracts themselves
-            c.executemany(
-                "DELETE FROM contracts WHERE id = ?", [(cid,) for cid in to_delete]
-            )
+        with _write_conn() as conn:
+            _delete_subtrees(conn.cursor(), "id = ?", (int(contract_id),))
             conn.commit()
     except Exception:
         logger.exception("Failed to delete contract %s and descendants", contract_id)
@@ -860,7 +851,7 @@ def update_subset_status(
         )
     from datetime import datetime
 
-    with _conn() as conn:
+    with _write_conn() as conn:
         c = conn.cursor()
         c.execute("SELECT status FROM contract_subsets WHERE id = ?", (subset_id,))
         row = c.fetchone()
@@ -961,6 +952,9 @@ def verify_user(email: str, password: str) -> bool:
     if not row:
         return False
     _, _, stored_hash, salt_hex, _, _, _, _ = row
+    if not stored_hash:
+        # account provisioned without a password (must_reset); only a reset can set one
+        return False
     salt = bytes.fromhex(salt_hex)
     return _hash_password(password, salt) == stored_hash
 
@@ -1002,7 +996,7 @@ def reset_password_with_token(token: str, new_password: str) -> bool:
         salt = os.urandom(16)
         pwd_hash = _hash_password(new_password, salt)
         c.execute(
-            "UPDATE users SET password_hash = ?, salt = ?, reset_token = NULL, reset_expiry = NULL WHERE reset_token = ?",
+            "UPDATE users SET password_hash = ?, salt = ?, reset_token = NULL, reset_expiry = NULL, must_reset = 0 WHERE reset_token = ?",
             (pwd_hash, salt.hex(), token),
         )
         conn.commit()
@@ -1031,6 +1025,11 @@ def send_email(to_email: str, subject: str, body: str) -> None:
             "Missing or invalid email_config.py in src/ — create it with SMTP settings."
         ) from e
 
+    # smtplib/email pull in ssl, socket and friends; import them only when
+    # an email is actually sent to keep module import cheap
+    import smtplib
+    from email.message import EmailMessage
+
     # Build the EmailMessage first so we can both save and send it.
     msg = EmailMessage()
     # Use a friendly display name and include a Reply-To header to help spam filters
@@ -1152,7 +1151,7 @@ def enqueue_email_outbox(
     """Insert an email into the DB outbox and return the outbox row id."""
     created_at = datetime.now(timezone.utc).isoformat()
     status = 'failed' if mark_failed else 'pending'
-    with _conn() as conn:
+    with _write_conn() as conn:
         c = conn.cursor()
         c.execute(
             "INSERT INTO email_outbox (to_email, subject, body, raw_message, status, attempt_count, last_error, last_attempt_at, created_at, tracking_code) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
@@ -1163,7 +1162,7 @@ def enqueue_email_outbox(
 
 
 def mark_outbox_sent(outbox_id: int) -> None:
-    with _conn() as conn:
+    with _write_conn() as conn:
         c = conn.cursor()
         c.execute(
             "UPDATE email_outbox SET status = 'sent', last_attempt_at = ?, attempt_count = attempt_count + 1 WHERE id = ?",
@@ -1173,7 +1172,7 @@ def mark_outbox_sent(outbox_id: int) -> None:
 
 
 def mark_outbox_failed(outbox_id: int, last_error: Optional[str] = None) -> None:
-    with _conn() as conn:
+    with _write_conn() as conn:
         c = conn.cursor()
         c.execute(
             "UPDATE email_outbox SET status = 'failed', last_error = ?, last_attempt_at = ?, attempt_count = attempt_count + 1 WHERE id = ?",
@@ -1347,6 +1346,124 @@ def create_employee(
         raise RuntimeError(f"Failed to create employee: {exc}") from exc
 
 
+def user_must_reset(email: str) -> bool:
+    """True when the account exists but has no password yet (see bulk_import_employees)."""
+    with _conn() as conn:
+        c = conn.cursor()
+        c.execute("SELECT must_reset FROM users WHERE email = ?", (email.strip().lower(),))
+        row = c.fetchone()
+    return bool(row and row[0])
+
+
+def _import_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _import_year(value) -> Optional[int]:
+    if value is None or str(value).strip() == "":
+        return None
+    return int(float(value))
+
+
+def bulk_import_employees(records: Iterable[dict], user_role: str = "engineer") -> dict:
+    """Create users and employees for many cleaned import records in one transaction.
+
+    records: dicts with the normalizer's fields (email, name, dob, job_title,
+    role, year_start, year_end, contract_type); records without an email get
+    an employee row with no user.
+    Emails are looked up in one query; new accounts are inserted with
+    executemany and no password (must_reset = 1, so the owner sets one through
+    the reset-token flow) instead of hashing a throwaway password per row.
+    Employee numbers are allocated as one block after the current maximum.
+
+    Records that fail create_employee's validation (year_start range, role)
+    are reported in "errors" as (index, message) and skipped; a record whose
+    user already has an employee (in the DB or earlier in the batch) is counted
+    in "skipped". Any database error rolls the whole batch back.
+    Returns {"created_users", "created_employees", "skipped", "errors"}.
+    """
+    current_year = datetime.now(timezone.utc).year
+    errors: List[Tuple[int, str]] = []
+    rows = []
+    for index, rec in enumerate(records):
+        try:
+            year_start = _import_year(rec.get("year_start"))
+            year_end = _import_year(rec.get("year_end"))
+        except (TypeError, ValueError):
+            errors.append((index, "year_start/year_end must be numbers"))
+            continue
+        if year_start is not None and not (1975 <= year_start <= current_year):
+            errors.append((index, f"year_start must be between 1975 and {current_year}"))
+            continue
+        role = _import_text(rec.get("role"))
+        if role is not None and role not in ALLOWED_ROLES:
+            errors.append((index, f"Invalid role '{role}'. Allowed roles: {', '.join(ALLOWED_ROLES)}"))
+            continue
+        email = _import_text(rec.get("email"))
+        rows.append(
+            (
+                email.lower() if email else None,
+                str(rec.get("name") or ""),
+                _import_text(rec.get("dob")),
+                _import_text(rec.get("job_title")),
+                role,
+                year_start,
+                year_end,
+                _import_text(rec.get("contract_type")),
+            )
+        )
+
+    emails = sorted({r[0] for r in rows if r[0]})
+    created_users = 0
+    skipped = 0
+    with _write_conn() as conn:
+        c = conn.cursor()
+        c.execute("SELECT email FROM users WHERE email IN (SELECT value FROM json_each(?))", (json.dumps(emails),))
+        existing = {r[0] for r in c.fetchall()}
+        new_emails = [e for e in emails if e not in existing]
+        c.executemany(
+            "INSERT INTO users (email, password_hash, salt, role, must_reset) VALUES (?, '', '', ?, 1)",
+            ((e, user_role) for e in new_emails),
+        )
+        created_users = len(new_emails)
+        c.execute("SELECT email, id FROM users WHERE email IN (SELECT value FROM json_each(?))", (json.dumps(emails),))
+        user_ids = dict(c.fetchall())
+        c.execute(
+            "SELECT user_id FROM employees WHERE user_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(user_ids.values())),),
+        )
+        taken = {r[0] for r in c.fetchall()}
+        employees = []
+        for email, *fields in rows:
+            uid = user_ids.get(email) if email else None
+            if uid is not None:
+                if uid in taken:
+                    skipped += 1
+                    continue
+                taken.add(uid)
+            employees.append((uid, *fields))
+        c.execute("SELECT MAX(employee_number) FROM employees")
+        row = c.fetchone()
+        first_number = (row[0] if row and row[0] else 999) + 1
+        c.executemany(
+            """
+            INSERT INTO employees (user_id, employee_number, name, dob, job_title, role, year_start, year_end, contract_type)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            ((uid, first_number + i, *fields) for i, (uid, *fields) in enumerate(employees)),
+        )
+        conn.commit()
+    return {
+        "created_users": created_users,
+        "created_employees": len(employees),
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
 def get_employee_by_user(user_id: int) -> Optional[Tuple]:
     with _conn() as conn:
         c = conn.cursor()
@@ -1367,38 +1484,197 @@ def get_employee_by_id(emp_id: int) -> Optional[Tuple]:
         return c.fetchone()
 
 
+_FTS_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _fts_prefix_query(term: str) -> str:
+    """Compile free text into a safe FTS5 query of prefix terms.
+
+    Every whitespace-separated word becomes a quoted prefix phrase and the
+    phrases are ANDed: "ali smi" -> '"ali"* "smi"*'. Only letters and digits are
+    kept (the same characters the unicode61 tokenizer indexes), so quotes,
+    operators and punctuation typed by the user can never be parsed as FTS
+    syntax; "o'brien" becomes the phrase '"o brien"*'. Returns "" when the term
+    has nothing searchable.
+    """
+    phrases = []
+    for chunk in term.split():
+        words = _FTS_WORD_RE.findall(chunk)
+        if words:
+            phrases.append('"' + " ".join(words) + '"*')
+    return " ".join(phrases)
+
+
+def _has_employees_fts(c) -> bool:
+    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='employees_fts'")
+    return c.fetchone() is not None
+
+
+def _employee_like_clause(term: str) -> Tuple[str, List[object]]:
+    """LIKE fallback for builds without FTS5 (full scan, substring semantics)."""
+    like = f"%{term}%"
+    parts = ["(name LIKE ? OR job_title LIKE ? OR role LIKE ?)"]
+    params: List[object] = [like, like, like]
+    if term.isdigit():
+        parts.append("(employee_number = ? OR id = ?)")
+        params.extend([int(term), int(term)])
+    return "(" + " OR ".join(parts) + ")", params
+
+
+def _employee_search_clause(c, term: str) -> Tuple[str, List[object]]:
+    """WHERE fragment matching `term` against employees, via employees_fts when present."""
+    if _has_employees_fts(c):
+        parts: List[str] = []
+        params: List[object] = []
+        query = _fts_prefix_query(term)
+        if query:
+            parts.append("id IN (SELECT rowid FROM employees_fts WHERE employees_fts MATCH ?)")
+            params.append(query)
+        if term.isdigit():
+            parts.append("(employee_number = ? OR id = ?)")
+            params.extend([int(term), int(term)])
+        return "(" + (" OR ".join(parts) or "0") + ")", params
+    return _employee_like_clause(term)
+
+
+_EMPLOYEE_COLUMNS = "id, user_id, employee_number, name, dob, job_title, role, year_start, year_end, profile_pic, contract_type"
+
+
 def search_employees(term: str, limit: Optional[int] = None) -> List[Tuple]:
     """Search employees by name, job_title, role, or employee_number.
 
-    term: free-text; numeric strings will match employee_number and id.
+    term: free-text; every word is matched as a word prefix ("ali smi" finds
+    "Alice Smith") and results are ranked by BM25, best first. Numeric strings
+    also match employee_number and id exactly; those rows come first.
+    Without FTS5 the search falls back to substring LIKE matching, newest first.
     Returns list of rows: id, user_id, employee_number, name, dob, job_title, role, year_start, year_end, profile_pic, contract_type
     """
     term = (term or "").strip()
+    limit_sql = f" LIMIT {int(limit)}" if limit and int(limit) > 0 else ""
     with _conn() as conn:
         c = conn.cursor()
-        params = []
-        search_parts = []
         if term:
-            like = f"%{term}%"
-            search_parts.append("(name LIKE ? OR job_title LIKE ? OR role LIKE ?)")
-            params.extend([like, like, like])
-            if term.isdigit():
-                search_parts.append("(employee_number = ? OR id = ?)")
-                params.extend([int(term), int(term)])
+            try:
+                if _has_employees_fts(c):
+                    rows: List[Tuple] = []
+                    if term.isdigit():
+                        # exact number matches come ahead of any text match
+                        c.execute(
+                            "SELECT " + _EMPLOYEE_COLUMNS + " FROM employees WHERE employee_number = ? OR id = ? ORDER BY id DESC",
+                            (int(term), int(term)),
+                        )
+                        rows = c.fetchall()
+                    query = _fts_prefix_query(term)
+                    if not query:
+                        return rows[: int(limit)] if limit and int(limit) > 0 else rows
+                    # rank is FTS5's bm25() score; ORDER BY rank is its optimized ranking path
+                    c.execute(
+                        "SELECT e." + _EMPLOYEE_COLUMNS.replace(", ", ", e.")
+                        + " FROM (SELECT rowid, rank FROM employees_fts WHERE employees_fts MATCH ? ORDER BY rank"
+                        + limit_sql
+                        + ") f JOIN employees e ON e.id = f.rowid ORDER BY f.rank",
+                        (query,),
+                    )
+                    seen = {r[0] for r in rows}
+                    rows.extend(r for r in c.fetchall() if r[0] not in seen)
+                    if limit and int(limit) > 0:
+                        rows = rows[: int(limit)]
+                    return rows
+            except Exception:
+                # if anything goes wrong with FTS, fall back
+                logger.debug("employees_fts search failed; falling back to LIKE", exc_info=True)
         where_sql = ""
-        if search_parts:
-            where_sql = " WHERE (" + " OR ".join(search_parts) + ")"
-        limit_sql = f" LIMIT {int(limit)}" if limit and int(limit) > 0 else ""
-        sql = (
-            "SELECT id, user_id, employee_number, name, dob, job_title, role, year_start, year_end, profile_pic, contract_type FROM employees"
-            + where_sql
-            + " ORDER BY id DESC"
-            + limit_sql
+        params = []
+        if term:
+            clause, params = _employee_like_clause(term)
+            where_sql = " WHERE " + clause
+        c.execute(
+            "SELECT " + _EMPLOYEE_COLUMNS + " FROM employees" + where_sql + " ORDER BY id DESC" + limit_sql,
+            tuple(params),
         )
-        c.execute(sql, tuple(params))
         return c.fetchall()
 
 
+# keyset-pagination sort keys: order_by -> indexed column (ties broken by id)
+EMPLOYEE_PAGE_ORDERS = {
+    "employee_number": "employee_number",
+    "name": "name",
+    "id": "id",
+}
+EMPLOYEE_PAGE_FILTERS = ("search", "role", "job_title")
+
+
+def list_employees_page(
+    after_key: Optional[Tuple] = None,
+    page_size: int = 100,
+    order_by: str = "employee_number",
+    filters: Optional[dict] = None,
+) -> Tuple[List[Tuple], Optional[Tuple]]:
+    """Return one page of employees and the key to pass for the next page.
+
+    Keyset pagination: instead of OFFSET, the page starts right after
+    `after_key` (the (sort value, id) of the previous page's last row), so every
+    page costs the same no matter how deep the caller has scrolled.
+
+    order_by: one of EMPLOYEE_PAGE_ORDERS (all indexed).
+    filters: optional dict with "search" (same word-prefix matching as
+    search_employees; results keep the page order, not relevance),
+    "role" and/or "job_title" (exact match).
+    Returns (rows, next_key); rows have the search_employees shape and next_key
+    is None on the last page.
+    """
+    column = EMPLOYEE_PAGE_ORDERS.get(order_by)
+    if column is None:
+        raise ValueError(f"Unsupported order_by '{order_by}'")
+    filters = dict(filters or {})
+    unknown = set(filters) - set(EMPLOYEE_PAGE_FILTERS)
+    if unknown:
+        raise ValueError(f"Unsupported employee filters: {', '.join(sorted(unknown))}")
+    page_size = max(1, int(page_size))
+
+    where: List[str] = []
+    params: List[object] = []
+    term = (filters.get("search") or "").strip()
+    for key in ("role", "job_title"):
+        if filters.get(key):
+            where.append(f"{key} = ?")
+            params.append(filters[key])
+    if after_key is not None:
+        last_value, last_id = after_key
+        if column == "id":
+            where.append("id > ?")
+            params.append(int(last_id))
+        elif last_value is None:
+            # NULLs sort first: finish the NULL run, then everything non-NULL
+            where.append(f"(({column} IS NULL AND id > ?) OR {column} IS NOT NULL)")
+            params.append(int(last_id))
+        else:
+            where.append(f"({column}, id) > (?, ?)")
+            params.extend([last_value, int(last_id)])
+    order_sql = " ORDER BY id" if column == "id" else f" ORDER BY {column}, id"
+    with _conn() as conn:
+        c = conn.cursor()
+        if term:
+            clause, search_params = _employee_search_clause(c, term)
+            where.insert(0, clause)
+            params[:0] = search_params
+        where_sql = " WHERE " + " AND ".join(where) if where else ""
+        c.execute(
+            "SELECT " + _EMPLOYEE_COLUMNS + " FROM employees"
+            + where_sql
+            + order_sql
+            + " LIMIT ?",
+            (*params, page_size + 1),
+        )
+        rows = c.fetchall()
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    value_index = {"employee_number": 2, "name": 3, "id": 0}[column]
+    return rows, (last[value_index], last[0])
+
+
 def update_employee(emp_id: int, **kwargs) -> None:
     if not kwargs:
         return
@@ -1417,31 +1693,37 @@ def has_checkin_today(employee_id: int) -> bool:
     # Compute today's start/end in UTC to reliably detect a check-in that occurred
     # on the same UTC date. This prevents timezone mismatches where naive local
     # datetimes would not match stored UTC timestamps.
+    with _conn() as conn:
+        return _has_checkin_today(conn.cursor(), employee_id)
+
+
+def _has_checkin_today(c, employee_id: int) -> bool:
     now_utc = datetime.now(timezone.utc)
     today_utc = now_utc.date()
     today_start = datetime.combine(today_utc, datetime.min.time()).replace(tzinfo=timezone.utc).isoformat()
     today_end = datetime.combine(today_utc, datetime.max.time()).replace(tzinfo=timezone.utc).isoformat()
-    with _conn() as conn:
-        c = conn.cursor()
-        c.execute(
-            """
-            SELECT 1 FROM attendance
-            WHERE employee_id = ? AND check_in BETWEEN ? AND ?
-            LIMIT 1
-        """,
-            (employee_id, today_start, today_end),
-        )
-        return c.fetchone() is not None
+    c.execute(
+        """
+        SELECT 1 FROM attendance
+        WHERE employee_id = ? AND check_in BETWEEN ? AND ?
+        LIMIT 1
+    """,
+        (employee_id, today_start, today_end),
+    )
+    return c.fetchone() is not None
 
 
 def has_open_session(employee_id: int) -> bool:
     with _conn() as conn:
-        c = conn.cursor()
-        c.execute(
-            "SELECT 1 FROM attendance WHERE employee_id = ? AND check_out IS NULL LIMIT 1",
-            (employee_id,),
-        )
-        return c.fetchone() is not None
+        return _has_open_session(conn.cursor(), employee_id)
+
+
+def _has_open_session(c, employee_id: int) -> bool:
+    c.execute(
+        "SELECT 1 FROM attendance WHERE employee_id = ? AND check_out IS NULL LIMIT 1",
+        (employee_id,),
+    )
+    return c.fetchone() is not None
 
 
 def has_checked_out_today(employee_id: int) -> bool:
@@ -1460,15 +1742,17 @@ def has_checked_out_today(employee_id: int) -> bool:
 
 
 def record_check_in(employee_id: int) -> Optional[str]:
-    # Prevent creating a new check-in if there's an open session
-    if has_open_session(employee_id):
-        return None
-    # Also prevent multiple check-ins per UTC day
-    if has_checkin_today(employee_id):
-        return None
     now = datetime.now(timezone.utc).isoformat()
-    with _conn() as conn:
+    # the checks run inside the write transaction (BEGIN IMMEDIATE) so two
+    # clients cannot both pass them and insert duplicate check-ins
+    with _write_conn() as conn:
         c = conn.cursor()
+        # Prevent creating a new check-in if there's an open session
+        if _has_open_session(c, employee_id):
+            return None
+        # Also prevent multiple check-ins per UTC day
+        if _has_checkin_today(c, employee_id):
+            return None
         c.execute(
             "INSERT INTO attendance (employee_id, check_in, check_out) VALUES (?, ?, NULL)",
             (employee_id, now),
@@ -1479,7 +1763,7 @@ def record_check_in(employee_id: int) -> Optional[str]:
 
 def record_check_out(employee_id: int) -> Optional[str]:
     now = datetime.now(timezone.utc).isoformat()
-    with _conn() as conn:
+    with _write_conn() as conn:
         c = conn.cursor()
         # Find the most recent open session for this employee and close only that one.
         c.execute(
@@ -1679,6 +1963,25 @@ def get_all_users() -> list:
         return c.fetchall()
 
 
+def get_user_emails_with_prefix(prefix: str) -> List[str]:
+    """Emails of all users whose address starts with `prefix`.
+
+    Runs as a range scan on the users.email unique index, so callers that
+    only care about a few local-part bases (email synthesis) do not have to
+    load every user.
+    """
+    with _conn() as conn:
+        c = conn.cursor()
+        if not prefix:
+            c.execute("SELECT email FROM users")
+        else:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            c.execute(
+                "SELECT email FROM users WHERE email >= ? AND email < ?", (prefix, upper)
+            )
+        return [r[0] for r in c.fetchall()]
+
+
 def update_user_role(
     user_id: int, new_role: str, actor_user_id: Optional[int] = None
 ) -> None:
@@ -1822,10 +2125,3 @@ def can_view_working_hours(
         return False
     target_role_val = target[-1]
     return can_edit(target_role_val, actor_role)
-
-
-# Ensure DB and tables exist when the module is imported
-try:
-    init_db()
-except Exception as exc:
-    logger.exception("Failed to initialize DB: %s", exc)
@@ -0,0 +1,376 @@
+"""Versioned schema migrations for the HR management SQLite database.
+
+The schema version lives in `PRAGMA user_version`. `migrate(conn)` reads it and
+applies only the numbered migrations that are still pending, all inside one
+`BEGIN IMMEDIATE` transaction, then stores the new version. When the database
+is already current the whole check is a single pragma read.
+
+To change the schema, append a new `(version, function)` entry to MIGRATIONS;
+never edit a migration that has already shipped.
+"""
+
+import logging
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(c, table: str) -> List[str]:
+    c.execute(f"PRAGMA table_info({table})")
+    return [r[1] for r in c.fetchall()]
+
+
+def _ensure_column(c, table: str, column: str, column_type: str = "TEXT") -> bool:
+    """Add a column when missing. Returns True if the column was added."""
+    if column in _columns(c, table):
+        return False
+    c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    return True
+
+
+def _m001_base_schema(c) -> None:
+    """Core tables and indices."""
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS contracts (
+            id INTEGER PRIMARY KEY,
+            employee_id INTEGER,
+            construction_id INTEGER,
+            parent_contract_id INTEGER,
+            area TEXT,
+            incharge TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            terms TEXT,
+            contract_file_path TEXT
+        )
+    """
+    )
+    # Contract subsets (each contract can have many subsets/phases/tasks)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS contract_subsets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contract_id INTEGER,
+            title TEXT,
+            description TEXT,
+            status TEXT,
+            order_index INTEGER DEFAULT 0
+        )
+    """
+    )
+    # History of status changes for contract subsets
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS subset_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subset_id INTEGER,
+            old_status TEXT,
+            new_status TEXT,
+            actor_user_id INTEGER,
+            changed_at TEXT
+        )
+    """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attendance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER,
+            check_in TEXT,
+            check_out TEXT
+        )
+    """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            salt TEXT NOT NULL,
+            reset_token TEXT,
+            reset_expiry TEXT,
+            totp_secret TEXT,
+            role TEXT DEFAULT 'engineer'
+        )
+    """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER UNIQUE,
+            employee_number INTEGER UNIQUE,
+            name TEXT,
+            dob TEXT,
+            job_title TEXT,
+            role TEXT,
+            year_start INTEGER,
+            year_end INTEGER,
+            profile_pic TEXT,
+            contract_type TEXT,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    """
+    )
+    # Create useful indices for search performance
+    try:
+        c.execute("CREATE INDEX IF NOT EXISTS idx_employees_employee_number ON employees(employee_number)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_contracts_construction_id ON contracts(construction_id)")
+    except Exception:
+        # older DBs may lack construction_id until migration 2 runs
+        pass
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS role_audit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            changed_user_id INTEGER,
+            old_role TEXT,
+            new_role TEXT,
+            actor_user_id INTEGER,
+            changed_at TEXT
+        )
+    """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS imputation_audit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            row_index INTEGER,
+            field TEXT,
+            old_value TEXT,
+            new_value TEXT,
+            source TEXT,
+            actor_user_id INTEGER,
+            applied_at TEXT
+        )
+    """
+    )
+    # Email outbox table for durable sends & retries
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            to_email TEXT,
+            subject TEXT,
+            body TEXT,
+            raw_message TEXT,
+            status TEXT DEFAULT 'pending', -- pending, sent, failed
+            attempt_count INTEGER DEFAULT 0,
+            last_error TEXT,
+            last_attempt_at TEXT,
+            created_at TEXT,
+            tracking_code TEXT
+        )
+    """
+    )
+    # Pending contracts table: stores submissions that require management approval
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pending_contracts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contract_id INTEGER,
+            employee_id INTEGER,
+            construction_id INTEGER,
+            parent_contract_id INTEGER,
+            area TEXT,
+            incharge TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            terms TEXT,
+            file_path TEXT,
+            submitted_by INTEGER,
+            submitted_at TEXT,
+            status TEXT DEFAULT 'pending', -- pending, approved, rejected
+            approved_by INTEGER,
+            approved_at TEXT,
+            rejection_reason TEXT
+        )
+    """
+    )
+
+
+def _m002_contract_columns(c) -> None:
+    """Columns added to contracts after the first release (hierarchy, soft delete)."""
+    _ensure_column(c, "contracts", "contract_file_path", "TEXT")
+    _ensure_column(c, "contracts", "parent_contract_id", "INTEGER")
+    _ensure_column(c, "contracts", "area", "TEXT")
+    _ensure_column(c, "contracts", "incharge", "TEXT")
+    # soft-delete support
+    _ensure_column(c, "contracts", "deleted", "INTEGER DEFAULT 0")
+    _ensure_column(c, "contracts", "deleted_at", "TEXT")
+    # construction_id replaced employee_id; copy values over for backward compatibility
+    if _ensure_column(c, "contracts", "construction_id", "INTEGER"):
+        if "employee_id" in _columns(c, "contracts"):
+            c.execute(
+                "UPDATE contracts SET construction_id = employee_id WHERE construction_id IS NULL AND employee_id IS NOT NULL"
+            )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_contracts_construction_id ON contracts(construction_id)")
+
+
+def _m003_contracts_fts(c) -> None:
+    """FTS5 index over contracts (terms, area, incharge), kept in sync by triggers.
+
+    Runs after the column backfill so the rebuild can index rows that existed
+    before the FTS table did.
+    """
+    # FTS5 virtual table for contracts text search (terms, area, incharge)
+    try:
+        c.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(terms, area, incharge, content='contracts', content_rowid='id')"
+        )
+        # Triggers to keep FTS in sync (one statement each: executescript would
+        # commit the surrounding migration transaction)
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS contracts_ai AFTER INSERT ON contracts BEGIN
+                INSERT INTO contracts_fts(rowid, terms, area, incharge) VALUES (new.id, new.terms, new.area, new.incharge);
+            END
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS contracts_ad AFTER DELETE ON contracts BEGIN
+                INSERT INTO contracts_fts(contracts_fts, rowid, terms, area, incharge) VALUES('delete', old.id, old.terms, old.area, old.incharge);
+            END
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS contracts_au AFTER UPDATE ON contracts BEGIN
+                INSERT INTO contracts_fts(contracts_fts, rowid, terms, area, incharge) VALUES('delete', old.id, old.terms, old.area, old.incharge);
+                INSERT INTO contracts_fts(rowid, terms, area, incharge) VALUES (new.id, new.terms, new.area, new.incharge);
+            END
+            """
+        )
+        c.execute("INSERT INTO contracts_fts(contracts_fts) VALUES('rebuild')")
+    except Exception:
+        # FTS may not be available in the SQLite build; that's fine — fall back to LIKE queries
+        logger.info("FTS5 unavailable; contract search will use LIKE queries")
+
+
+def _m004_hierarchy_indices(c) -> None:
+    """Indices used by the recursive subtree queries and subset lookups."""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_contracts_parent_contract_id ON contracts(parent_contract_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_contract_subsets_contract_id ON contract_subsets(contract_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_subset_status_history_subset_id ON subset_status_history(subset_id)")
+
+
+def _m005_fts_update_trigger(c) -> None:
+    """Re-index contracts_fts only when an indexed column changes.
+
+    The original trigger fired on every UPDATE, so flipping `deleted` on a large
+    subtree rewrote the FTS entry of every row.
+    """
+    if not c.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='contracts_au'").fetchone():
+        return
+    c.execute("DROP TRIGGER contracts_au")
+    c.execute(
+        """
+        CREATE TRIGGER contracts_au AFTER UPDATE OF terms, area, incharge ON contracts BEGIN
+            INSERT INTO contracts_fts(contracts_fts, rowid, terms, area, incharge) VALUES('delete', old.id, old.terms, old.area, old.incharge);
+            INSERT INTO contracts_fts(rowid, terms, area, incharge) VALUES (new.id, new.terms, new.area, new.incharge);
+        END
+        """
+    )
+
+
+def _m006_employees_fts(c) -> None:
+    """FTS5 index over employees (name, job_title, role), kept in sync by triggers.
+
+    Mirrors contracts_fts. The 2- and 3-character prefix indices make the short
+    prefix queries typed into the search box ("ali*") index lookups too.
+    """
+    try:
+        c.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(name, job_title, role, content='employees', content_rowid='id', prefix='2 3')"
+        )
+    except Exception:
+        logger.info("FTS5 unavailable; employee search will use LIKE queries")
+        return
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS employees_ai AFTER INSERT ON employees BEGIN
+            INSERT INTO employees_fts(rowid, name, job_title, role) VALUES (new.id, new.name, new.job_title, new.role);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS employees_ad AFTER DELETE ON employees BEGIN
+            INSERT INTO employees_fts(employees_fts, rowid, name, job_title, role) VALUES('delete', old.id, old.name, old.job_title, old.role);
+        END
+        """
+    )
+    c.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS employees_au AFTER UPDATE OF name, job_title, role ON employees BEGIN
+            INSERT INTO employees_fts(employees_fts, rowid, name, job_title, role) VALUES('delete', old.id, old.name, old.job_title, old.role);
+            INSERT INTO employees_fts(rowid, name, job_title, role) VALUES (new.id, new.name, new.job_title, new.role);
+        END
+        """
+    )
+    c.execute("INSERT INTO employees_fts(employees_fts) VALUES('rebuild')")
+
+
+def _m007_users_must_reset(c) -> None:
+    """Flag for accounts created without a usable password (bulk import).
+
+    Such accounts get their password through the reset-token flow.
+    """
+    _ensure_column(c, "users", "must_reset", "INTEGER DEFAULT 0")
+
+
+def _m008_imputation_audit_session(c) -> None:
+    """Group imputation audit rows by the import (dialog load) they belong to."""
+    _ensure_column(c, "imputation_audit", "import_session_id", "TEXT")
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_imputation_audit_session ON imputation_audit(import_session_id)"
+    )
+
+
+MIGRATIONS: List[Tuple[int, Callable]] = [
+    (1, _m001_base_schema),
+    (2, _m002_contract_columns),
+    (3, _m003_contracts_fts),
+    (4, _m004_hierarchy_indices),
+    (5, _m005_fts_update_trigger),
+    (6, _m006_employees_fts),
+    (7, _m007_users_must_reset),
+    (8, _m008_imputation_audit_session),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn) -> int:
+    row = conn.execute("PRAGMA user_version").fetchone()
+    return int(row[0]) if row else 0
+
+
+def migrate(conn) -> int:
+    """Bring the database on `conn` up to LATEST_VERSION. Returns the final version.
+
+    Must be called without an open transaction on `conn`.
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION
+    c = conn.cursor()
+    # take the write lock up front so concurrent processes migrate one at a time
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        version = get_schema_version(conn)
+        for number, step in MIGRATIONS:
+            if number <= version:
+                continue
+            logger.info("Applying schema migration %s (%s)", number, step.__name__)
+            step(c)
+            version = number
+        c.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return version
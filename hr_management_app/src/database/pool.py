@@ -0,0 +1,188 @@
+"""Small sqlite3 connection pool used by the database helpers.
+
+Connections are opened once per resolved DB path, configured once (schema
+probe, pragmas) and then checked out / returned by `database._conn()` instead
+of being re-opened for every helper call.
+
+Design notes:
+- A connection is owned by exactly one caller while checked out, so nested
+  `_conn()` blocks get independent connections just like before pooling.
+- Only `max_idle` connections are retained per path; extra connections created
+  under load ("overflow") are closed when returned, which bounds the number of
+  open file handles without ever blocking a caller.
+- A pooled connection is discarded when the DB file it was opened on has been
+  deleted or replaced (tests do this frequently), or when the process forked.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IDLE = 8
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """Return (st_dev, st_ino) for path or None when the file does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of sqlite3 connections for a single database file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        configure: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> None:
+        self.path = path
+        self.max_idle = max(0, int(max_idle))
+        self._configure = configure
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[sqlite3.Connection, Optional[Tuple[int, int]]]] = []
+        self._identity: Dict[int, Optional[Tuple[int, int]]] = {}
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "closed": 0,
+            "discarded": 0,
+            "overflow": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+        }
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread=False: a connection may be returned by one thread and
+        # checked out by another, but it is never used by two threads at once.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self._configure is not None:
+            try:
+                self._configure(conn)
+            except Exception:
+                # best-effort; callers surface real errors on first use
+                logger.exception("Failed to configure connection for %s", self.path)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, reusing an idle one when it is still valid."""
+        current = _file_identity(self.path)
+        stale = []
+        conn = None
+        with self._lock:
+            while self._idle:
+                cand, ident = self._idle.pop()
+                if ident is not None and ident == current:
+                    conn = cand
+                    self._stats["reused"] += 1
+                    break
+                stale.append(cand)
+            self._stats["discarded"] += len(stale)
+            self._stats["in_use"] += 1
+            if self._stats["in_use"] > self._stats["peak_in_use"]:
+                self._stats["peak_in_use"] = self._stats["in_use"]
+        for s in stale:
+            self._safe_close(s)
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._lock:
+                    self._stats["in_use"] -= 1
+                raise
+            with self._lock:
+                self._stats["created"] += 1
+                self._identity[id(conn)] = _file_identity(self.path)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection. Uncommitted work is rolled back, as a close would."""
+        keep = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            # connection is unusable (closed by caller, I/O error, ...)
+            keep = False
+        with self._lock:
+            self._stats["in_use"] -= 1
+            ident = self._identity.get(id(conn))
+            if keep and ident is not None and len(self._idle) < self.max_idle:
+                self._idle.append((conn, ident))
+                return
+            self._identity.pop(id(conn), None)
+            if keep:
+                self._stats["overflow"] += 1
+        self._safe_close(conn)
+
+    def _safe_close(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._identity.pop(id(conn), None)
+            self._stats["closed"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_idle(self) -> int:
+        """Close every idle connection. Returns how many were closed."""
+        with self._lock:
+            idle = [c for c, _ in self._idle]
+            self._idle = []
+        for c in idle:
+            self._safe_close(c)
+        return len(idle)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["idle"] = len(self._idle)
+            out["max_idle"] = self.max_idle
+        return out
+
+
+class PoolRegistry:
+    """Process-wide map of resolved DB path -> ConnectionPool."""
+
+    def __init__(
+        self,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        configure: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> None:
+        self.max_idle = max_idle
+        self.configure = configure
+        self._lock = threading.Lock()
+        self._pools: Dict[str, ConnectionPool] = {}
+        self._pid = os.getpid()
+
+    def get(self, path: str) -> ConnectionPool:
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            if self._pid != os.getpid():
+                # forked child: never reuse the parent's sqlite handles
+                self._pools = {}
+                self._pid = os.getpid()
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    path, max_idle=self.max_idle, configure=self.configure
+                )
+                self._pools[key] = pool
+            return pool
+
+    def close_all(self) -> int:
+        with self._lock:
+            pools = list(self._pools.values())
+        return sum(p.close_idle() for p in pools)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {p.path: p.stats() for p in pools.values()}
@@ -0,0 +1,103 @@
+"""SQLite pragma profiles applied to every new pooled connection.
+
+Select a profile with HR_MANAGEMENT_DB_PROFILE (default: "default"). Single
+pragmas can be overridden with HR_MANAGEMENT_DB_<PRAGMA>, for example
+HR_MANAGEMENT_DB_BUSY_TIMEOUT=20000 or HR_MANAGEMENT_DB_SYNCHRONOUS=FULL.
+
+Profiles:
+
+- default: keeps the rollback journal, waits on locks instead of failing
+  immediately and uses a larger page cache / in-memory temp storage.
+- wal: write-ahead logging. Readers never block the writer and vice versa;
+  synchronous=NORMAL is durable against application crashes (a power loss can
+  drop the last committed transactions, never corrupt the file).
+- multi_reader_single_writer: the wal profile plus write serialization. Write
+  helpers open their transaction with BEGIN IMMEDIATE (so a busy database is
+  waited on for busy_timeout up front instead of failing half-way through)
+  and only one thread per process writes at a time. Use this when several
+  clients share one database file.
+
+WAL needs shared memory between the processes using the database, so it only
+works when all clients run on the same machine (e.g. a terminal server). For a
+database file on a network share use the default profile.
+"""
+
+import logging
+import os
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PragmaValue = Union[int, str]
+
+# order matters: journal_mode must be switched before anything else touches the file
+PRAGMA_ORDER = (
+    "busy_timeout",
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+)
+
+PROFILES: Dict[str, Dict[str, PragmaValue]] = {
+    "default": {
+        "busy_timeout": 5000,
+        "cache_size": -8000,  # negative = KiB, i.e. 8 MB
+        "temp_store": "MEMORY",
+    },
+    "wal": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "multi_reader_single_writer": {
+        "busy_timeout": 30000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+# profiles whose write helpers serialize writers (see database._write_conn)
+SINGLE_WRITER_PROFILES = ("multi_reader_single_writer",)
+
+DEFAULT_PROFILE = "default"
+
+
+def resolve_profile(name: Optional[str] = None) -> Dict[str, PragmaValue]:
+    """Return the pragma settings for `name` with HR_MANAGEMENT_DB_<PRAGMA> overrides applied."""
+    name = (name or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        logger.warning("Unknown DB profile %r; using %r", name, DEFAULT_PROFILE)
+        name = DEFAULT_PROFILE
+    settings = dict(PROFILES[name])
+    for pragma in PRAGMA_ORDER:
+        override = os.getenv(f"HR_MANAGEMENT_DB_{pragma.upper()}")
+        if override:
+            settings[pragma] = int(override) if override.lstrip("-").isdigit() else override
+    return settings
+
+
+def apply_pragmas(conn, settings: Dict[str, PragmaValue]) -> None:
+    """Apply `settings` to a connection; a pragma that fails is logged and skipped."""
+    for pragma in PRAGMA_ORDER:
+        if pragma not in settings:
+            continue
+        value = settings[pragma]
+        if isinstance(value, str) and not value.isalnum():
+            logger.warning("Ignoring invalid value for PRAGMA %s: %r", pragma, value)
+            continue
+        try:
+            row = conn.execute(f"PRAGMA {pragma} = {value}").fetchone()
+        except Exception:
+            logger.exception("Failed to set PRAGMA %s = %s", pragma, value)
+            continue
+        if pragma == "journal_mode" and row and str(row[0]).lower() != str(value).lower():
+            # e.g. WAL is not supported on this filesystem; sqlite keeps the old mode
+            logger.warning("journal_mode=%s not applied (still %s)", value, row[0])
@@ -14,6 +14,7 @@ from hr_management_app.src.database.database import (
     _conn,
     add_contract_to_db,
     submit_pending_contract,
+    list_employees_page,
     list_pending_contracts,
     approve_pending_contract,
     reject_pending_contract,
@@ -24,20 +25,22 @@ from hr_management_app.src.database.database import (
     can_grant_role,
     delete_user,
     delete_user_with_admin_check,
-    get_all_contracts_filtered,
     get_all_users,
+    get_contract_ancestry,
+    get_contract_children,
+    get_contract_forest,
     get_employee_by_id,
     get_month_work_seconds,
     get_user_by_id,
     has_open_session,
-    init_db,
     record_check_in,
     record_check_out,
+    search_contracts_page,
     update_employee,
     update_user_role,
 )
 from hr_management_app.src.contracts.models import Contract
-from hr_management_app.src.employees.models import Employee
+from hr_management_app.src.ui_tasks import TkExecutor
 
 # optional PIL for profile pictures
 logger = logging.getLogger(__name__)
@@ -48,8 +51,6 @@ except Exception as exc:
     ImageTk = None
     logger.info("Pillow not available: image features disabled (%s)", exc)
 
-init_db()
-
 
 class EmployeeProfileWindow(tk.Toplevel):
     def __init__(self, parent, emp_id: int, actor_role: str, actor_user_id: int):
@@ -225,6 +226,9 @@ class EmployeeProfileWindow(tk.Toplevel):
 
 
 class EmployeeManagementWindow(tk.Toplevel):
+    # rows fetched per page; more pages load as the list is scrolled
+    PAGE_SIZE = 200
+
     def __init__(self, parent, actor_role: str, actor_user_id: int):
         super().__init__(parent)
         self.actor_role = actor_role
@@ -241,6 +245,11 @@ class EmployeeManagementWindow(tk.Toplevel):
         self.title("Employee Management")
         self.geometry("900x420")
         self.resizable(True, True)
+        self.background = TkExecutor(self, max_workers=2, on_busy=self._set_busy)
+        self._filters = {}
+        self._next_key = None
+        self._loading_page = False
+        self.bind("<Destroy>", self._on_destroy, add="+")
         self.create_widgets()
         self.load_employees()
         self.center_window()
@@ -285,10 +294,16 @@ class EmployeeManagementWindow(tk.Toplevel):
         for c, h in zip(cols, headings):
             self.tree.heading(c, text=h)
             self.tree.column(c, anchor="center")
-        self.tree.pack(fill="both", expand=True)
+        self.tree_scroll = ttk.Scrollbar(frm, orient="vertical", command=self.tree.yview)
+        # infinite scroll: reaching the bottom of the list loads the next page
+        self.tree.configure(yscrollcommand=self._on_tree_scrolled)
 
         btns = ttk.Frame(frm)
-        btns.pack(fill="x", pady=6)
+        btns.pack(side="bottom", fill="x", pady=6)
+        self.tree_scroll.pack(side="right", fill="y")
+        self.tree.pack(fill="both", expand=True)
+        self.page_status = ttk.Label(btns, text="")
+        self.page_status.pack(side="right", padx=8)
         ttk.Button(btns, text="Edit Selected", command=self.edit_selected).pack(
             side="left", padx=4
         )
@@ -303,41 +318,69 @@ class EmployeeManagementWindow(tk.Toplevel):
         if not can_delete("user", self.actor_role):
             self.delete_btn.config(state="disabled")
 
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.background.shutdown()
+
+    def _set_busy(self, busy: bool):
+        self.config(cursor="watch" if busy else "")
+
     def load_employees(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        # If a search term is provided, use the Employee.search wrapper
+        """(Re)load the first page; further pages follow as the user scrolls."""
         term = (getattr(self, "emp_search_var", None) and self.emp_search_var.get()) or ""
-        if term:
-            try:
-                rows = Employee.search(term)
-                for r in rows:
-                    self.tree.insert(
-                        "",
-                        "end",
-                        values=(
-                            r.get("id"),
-                            r.get("employee_number"),
-                            r.get("name"),
-                            r.get("job_title"),
-                            r.get("role"),
-                            None,
-                            None,
-                            None,
-                            r.get("user_id"),
-                        ),
-                    )
-                return
-            except Exception:
-                # fallback to full listing on error
-                pass
-        with _conn() as conn:
-            c = conn.cursor()
-            c.execute(
-                "SELECT id, employee_number, name, job_title, role, year_start, year_end, contract_type, user_id FROM employees ORDER BY employee_number"
+        self._filters = {"search": term.strip()} if term.strip() else {}
+        self._next_key = None
+        self._loading_page = True
+        # a newer search supersedes a page still loading
+        self.background.submit(
+            list_employees_page,
+            None,
+            self.PAGE_SIZE,
+            "employee_number",
+            self._filters,
+            on_done=lambda page: self._fill_employees(page, reset=True),
+            on_error=self._page_failed,
+            key="employees",
+        )
+
+    def _load_next_page(self):
+        if self._loading_page or self._next_key is None:
+            return
+        self._loading_page = True
+        self.background.submit(
+            list_employees_page,
+            self._next_key,
+            self.PAGE_SIZE,
+            "employee_number",
+            self._filters,
+            on_done=lambda page: self._fill_employees(page, reset=False),
+            on_error=self._page_failed,
+            key="employees",
+        )
+
+    def _page_failed(self, e):
+        self._loading_page = False
+        messagebox.showerror("Error", f"Failed to load employees: {e}", parent=self)
+
+    def _fill_employees(self, page, reset: bool):
+        rows, self._next_key = page
+        self._loading_page = False
+        if reset:
+            for i in self.tree.get_children():
+                self.tree.delete(i)
+        for r in rows:
+            # id, empnum, name, job, role, year_start, year_end, contract, user_id
+            self.tree.insert(
+                "", "end", values=(r[0], r[2], r[3], r[5], r[6], r[7], r[8], r[10], r[1])
             )
-            for row in c.fetchall():
-                self.tree.insert("", "end", values=row)
+        shown = len(self.tree.get_children())
+        more = " (scroll for more)" if self._next_key is not None else ""
+        self.page_status.config(text=f"{shown} employees{more}")
+
+    def _on_tree_scrolled(self, first, last):
+        self.tree_scroll.set(first, last)
+        if float(last) >= 0.9:
+            self._load_next_page()
 
     def search_employees_handler(self):
         self.load_employees()
@@ -527,6 +570,13 @@ class ManageUsersWindow(tk.Toplevel):
 
 
 class HRApp(tk.Tk):
+    # Contracts tree loads one level at a time: roots on refresh, children when
+    # a node is expanded. Set to False to rebuild the whole hierarchy instead.
+    contracts_lazy_load = True
+    _TREE_PLACEHOLDER = "lazy-placeholder"
+    # ranked search hits shown per page (their ancestors are shown too)
+    CONTRACT_SEARCH_PAGE_SIZE = 50
+
     def __init__(
         self,
         employee_id: Optional[int] = None,
@@ -544,6 +594,8 @@ class HRApp(tk.Tk):
         self.contracts_list = None
         self.employee = None
         self.profile_image = None
+        # DB work runs here so the mainloop never blocks on a query
+        self.background = TkExecutor(self, on_busy=self._set_busy)
         self.create_widgets()
         self.load_contracts()
         # sorting state: (column, asc_bool)
@@ -553,6 +605,7 @@ class HRApp(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def on_close(self):
+        self.background.shutdown()
         self.destroy()
         import sys
 
@@ -626,9 +679,9 @@ class HRApp(tk.Tk):
             entry = ttk.Entry(search_fr, textvariable=self.search_var)
             entry.pack(side="left", fill="x", expand=True)
             # explicit Search button for non-live activation
-            ttk.Button(search_fr, text="Search", command=self.load_contracts).pack(
-                side="right", padx=(4, 0)
-            )
+            ttk.Button(
+                search_fr, text="Search", command=self._on_contract_search_changed
+            ).pack(side="right", padx=(4, 0))
             # show trashed contracts toggle
             self.show_trash_var = tk.BooleanVar(value=False)
             try:
@@ -636,7 +689,7 @@ class HRApp(tk.Tk):
                     search_fr,
                     text="Show Trash",
                     variable=self.show_trash_var,
-                    command=self.load_contracts,
+                    command=self._on_contract_search_changed,
                 )
             except Exception:
                 # older ttk versions may not accept variable kw; fall back
@@ -646,16 +699,37 @@ class HRApp(tk.Tk):
             chk.pack(side="right", padx=(6, 0))
             # live filter: trace changes
             try:
-                self.search_var.trace_add("write", lambda *_: self.load_contracts())
+                self.search_var.trace_add(
+                    "write", lambda *_: self._on_contract_search_changed()
+                )
             except Exception:
                 # older tk versions
-                self.search_var.trace("w", lambda *_: self.load_contracts())
+                self.search_var.trace("w", lambda *_: self._on_contract_search_changed())
+            # search hits come a page at a time, best match first
+            pager = ttk.Frame(left_frame)
+            pager.pack(fill="x")
+            self._contract_search_page = 1
+            self._contract_search_total = 0
+            self._contract_snippets = {}
+            self.contract_search_status = ttk.Label(pager, text="")
+            self.contract_search_status.pack(side="left")
+            ttk.Button(
+                pager, text="Next", command=lambda: self._turn_contract_search_page(1)
+            ).pack(side="right")
+            ttk.Button(
+                pager, text="Prev", command=lambda: self._turn_contract_search_page(-1)
+            ).pack(side="right", padx=(0, 4))
 
             # hierarchical multi-column tree of contracts
-            cols = ("cid", "area", "incharge", "start", "end", "subsets")
+            cols = ("cid", "area", "incharge", "start", "end", "subsets", "match")
             self.contracts_tree = ttk.Treeview(
-                left_frame, columns=cols, show="headings"
+                left_frame, columns=cols, show="tree headings"
             )
+            # narrow #0 column only carries the expand/collapse indicator
+            self.contracts_tree.column("#0", width=34, stretch=False)
+            self._open_contract_ids = set()
+            self.contracts_tree.bind("<<TreeviewOpen>>", self._on_contract_tree_open)
+            self.contracts_tree.bind("<<TreeviewClose>>", self._on_contract_tree_close)
             # define headings (clickable for sorting)
             self.contracts_tree.heading(
                 "cid", text="ID", command=lambda: self._sort_contracts_by("cid")
@@ -679,6 +753,8 @@ class HRApp(tk.Tk):
                 text="# Subsets",
                 command=lambda: self._sort_contracts_by("subsets"),
             )
+            # excerpt of the contract terms around the searched words
+            self.contracts_tree.heading("match", text="Match")
             # hide cid column width
             self.contracts_tree.column("cid", width=60, anchor="center")
             self.contracts_tree.column("area", width=120, anchor="w")
@@ -686,6 +762,7 @@ class HRApp(tk.Tk):
             self.contracts_tree.column("start", width=90, anchor="center")
             self.contracts_tree.column("end", width=90, anchor="center")
             self.contracts_tree.column("subsets", width=80, anchor="center")
+            self.contracts_tree.column("match", width=220, anchor="w")
             self.contracts_tree.pack(fill="both", expand=True, pady=(5, 5))
             # allow columns to be resized/stretched
             self.contracts_tree.column("cid", stretch=False)
@@ -694,6 +771,7 @@ class HRApp(tk.Tk):
             self.contracts_tree.column("start", stretch=False)
             self.contracts_tree.column("end", stretch=False)
             self.contracts_tree.column("subsets", stretch=False)
+            self.contracts_tree.column("match", stretch=True)
 
             # double-click to view details
             self.contracts_tree.bind(
@@ -757,6 +835,8 @@ class HRApp(tk.Tk):
 
         right_frame = ttk.Frame(self, padding=10)
         right_frame.place(x=440, y=10, width=450, height=540)
+        # shown while background queries are running
+        self.busy_bar = ttk.Progressbar(right_frame, mode="indeterminate")
 
         check_frame = ttk.LabelFrame(right_frame, text="Attendance", padding=10)
         check_frame.pack(fill="x", pady=(0, 10))
@@ -929,21 +1009,44 @@ class HRApp(tk.Tk):
         self.job_label.config(text=job_title or "Job Title")
         self.update_check_state()
 
+    def _set_busy(self, busy: bool):
+        try:
+            if busy:
+                self.busy_bar.pack(side="bottom", fill="x")
+                self.busy_bar.start(15)
+            else:
+                self.busy_bar.stop()
+                self.busy_bar.pack_forget()
+            self.config(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
     def update_check_state(self):
         if not self.employee_id:
             self.check_status_lbl.config(text="No employee selected")
             self.check_btn.config(state="disabled")
             return
-        open_session = has_open_session(int(self.employee_id))
+        self.background.submit(
+            self._query_check_state,
+            int(self.employee_id),
+            on_done=lambda state: self._apply_check_state(*state),
+            key="check_state",
+        )
+
+    @staticmethod
+    def _query_check_state(employee_id: int):
+        open_session = has_open_session(employee_id)
         checked_out_today = False
         try:
             from hr_management_app.src.database.database import has_checked_out_today
 
-            checked_out_today = has_checked_out_today(int(self.employee_id))
+            checked_out_today = has_checked_out_today(employee_id)
         except Exception:
             # best-effort: if helper unavailable, don't block UX
             checked_out_today = False
+        return open_session, checked_out_today
 
+    def _apply_check_state(self, open_session: bool, checked_out_today: bool):
         if open_session:
             # user currently checked in and can check out unless already checked out today
             if checked_out_today:
@@ -1159,13 +1262,13 @@ class HRApp(tk.Tk):
             cid = int(self.contracts_tree.item(sel[0], "values")[0])
             from hr_management_app.src.database.database import (  # use soft-delete instead of hard delete
                 get_child_contracts,
-                get_subsets_count,
+                get_subset_counts,
                 soft_delete_contract,
             )
 
             # check for subsets and child contracts
             child_contracts = get_child_contracts(cid)
-            subsets_count = get_subsets_count(cid)
+            subsets_count = get_subset_counts([cid]).get(cid, 0)
             if child_contracts or subsets_count > 0:
                 details = []
                 if subsets_count:
@@ -1225,6 +1328,213 @@ class HRApp(tk.Tk):
             messagebox.showerror("Error", str(e))
 
     def load_contracts(self):
+        if self.contracts_lazy_load and getattr(self, "contracts_tree", None) is not None:
+            self._load_contracts_lazy()
+        else:
+            self._load_contracts_full()
+
+    def _on_contract_search_changed(self):
+        self._contract_search_page = 1
+        self.load_contracts()
+
+    def _turn_contract_search_page(self, step: int):
+        pages = -(-self._contract_search_total // self.CONTRACT_SEARCH_PAGE_SIZE)
+        page = min(max(1, self._contract_search_page + step), max(1, pages))
+        if page != self._contract_search_page:
+            self._contract_search_page = page
+            self.load_contracts()
+
+    def _load_contracts_lazy(self):
+        """Show root contracts only; deeper levels load in _on_contract_tree_open.
+
+        With a search term, only the current page of ranked matches and their
+        ancestors are shown, each match with a snippet of its terms. Nodes the
+        user had expanded stay expanded. The queries run on the background
+        executor; a newer refresh (e.g. the next search keystroke) supersedes one
+        still in flight.
+        """
+        include_deleted = (
+            self.show_trash_var.get() if hasattr(self, "show_trash_var") else False
+        )
+        search = self.search_var.get().strip() if hasattr(self, "search_var") else ""
+        sort_col, asc = getattr(self, "_contract_sort", (None, True))
+        self.background.submit(
+            self._query_contract_levels,
+            None,
+            include_deleted,
+            sort_col,
+            asc,
+            set(getattr(self, "_open_contract_ids", set())),
+            None,
+            search,
+            getattr(self, "_contract_search_page", 1),
+            self.CONTRACT_SEARCH_PAGE_SIZE,
+            on_done=lambda result: self._show_contract_levels(result, None, ""),
+            on_error=self._contracts_load_failed,
+            key="contracts",
+        )
+
+    def _contracts_load_failed(self, e):
+        try:
+            messagebox.showerror(
+                "Error", f"Failed to load contracts:\n{e}", parent=self
+            )
+        except Exception:
+            messagebox.showerror("Error", f"Failed to load contracts:\n{e}")
+
+    @staticmethod
+    def _query_contract_levels(
+        parent_cid,
+        include_deleted,
+        sort_col,
+        asc,
+        opened,
+        visible=None,
+        search="",
+        page=1,
+        page_size=50,
+    ):
+        """Worker side of the lazy tree: fetch the level under parent_cid and every
+        level below it that the user had expanded.
+
+        Returns (levels, visible, found) where levels maps parent id ->
+        [(row, has_children)], visible maps parent id -> ids to show and found is
+        ({match id: snippet}, total hits) for that page of search results (both
+        None when not searching).
+        """
+        found = None
+        if search:
+            try:
+                hits, total = search_contracts_page(
+                    search, include_deleted=include_deleted, page=page, page_size=page_size
+                )
+            except Exception:
+                logger.exception("Contract search failed for %r", search)
+                hits, total = [], 0
+            snippets = {int(r[0]): " ".join(str(r[12] or "").split()) for r in hits}
+            found = (snippets, total)
+            visible = {}
+            ancestry = get_contract_ancestry(list(snippets), include_deleted=include_deleted)
+            for cid, pid in ancestry.items():
+                visible.setdefault(pid, set()).add(cid)
+        levels = {}
+        stack = [parent_cid]
+        while stack:
+            pid = stack.pop()
+            kept = []
+            for row in get_contract_children(
+                pid, include_deleted=include_deleted, order_by=sort_col, descending=not asc
+            ):
+                cid = int(row[0])
+                if visible is not None:
+                    if cid not in visible.get(pid, ()):
+                        continue
+                    has_children = bool(visible.get(cid))
+                else:
+                    has_children = bool(row[13])
+                kept.append((row, has_children))
+                if has_children and cid in opened:
+                    stack.append(cid)
+            levels[pid] = kept
+        return levels, visible, found
+
+    def _show_contract_levels(self, result, parent_cid, parent_node):
+        """UI side: insert fetched levels under parent_node ("" = rebuild roots)."""
+        levels, visible, found = result
+        tree = self.contracts_tree
+        if parent_cid is None:
+            for ch in tree.get_children():
+                tree.delete(ch)
+            self._contract_visible = visible
+            self._show_contract_search_status(found)
+        elif not tree.exists(parent_node):
+            # the tree was rebuilt while this level was loading
+            return
+        else:
+            for ch in tree.get_children(parent_node):
+                tree.delete(ch)
+        self._insert_contract_levels(levels, parent_cid, parent_node)
+
+    def _show_contract_search_status(self, found):
+        if found is None:
+            self._contract_snippets, self._contract_search_total = {}, 0
+            self.contract_search_status.config(text="")
+            return
+        self._contract_snippets, self._contract_search_total = found
+        if not self._contract_search_total:
+            self.contract_search_status.config(text="No matching contracts")
+            return
+        first = (self._contract_search_page - 1) * self.CONTRACT_SEARCH_PAGE_SIZE + 1
+        last = first + len(self._contract_snippets) - 1
+        self.contract_search_status.config(
+            text=f"Matches {first}-{last} of {self._contract_search_total}"
+        )
+
+    def _insert_contract_levels(self, levels, parent_cid, parent_node):
+        tree = self.contracts_tree
+        for row, has_children in levels.get(parent_cid, []):
+            cid = int(row[0])
+            node = tree.insert(
+                parent_node,
+                "end",
+                values=(
+                    cid,
+                    row[6] or "",
+                    row[7] or "",
+                    row[4] or "",
+                    row[5] or "",
+                    row[12],
+                    self._contract_snippets.get(cid, ""),
+                ),
+            )
+            if not has_children:
+                continue
+            if cid in levels:
+                self._insert_contract_levels(levels, cid, node)
+                tree.item(node, open=True)
+            else:
+                # placeholder so Tk draws an expander; replaced on first open
+                tree.insert(node, "end", values=("",), tags=(self._TREE_PLACEHOLDER,))
+
+    def _on_contract_tree_open(self, event=None):
+        tree = self.contracts_tree
+        node = tree.focus()
+        if not node:
+            return
+        try:
+            cid = int(tree.item(node, "values")[0])
+        except Exception:
+            return
+        self._open_contract_ids.add(cid)
+        children = tree.get_children(node)
+        if len(children) == 1 and self._TREE_PLACEHOLDER in tree.item(children[0], "tags"):
+            include_deleted = (
+                self.show_trash_var.get() if hasattr(self, "show_trash_var") else False
+            )
+            sort_col, asc = getattr(self, "_contract_sort", (None, True))
+            self.background.submit(
+                self._query_contract_levels,
+                cid,
+                include_deleted,
+                sort_col,
+                asc,
+                set(self._open_contract_ids),
+                getattr(self, "_contract_visible", None),
+                on_done=lambda result: self._show_contract_levels(result, cid, node),
+                on_error=lambda e: logger.error(
+                    "Failed to load child contracts of %s: %s", cid, e
+                ),
+                key=f"contract-children-{cid}",
+            )
+
+    def _on_contract_tree_close(self, event=None):
+        node = self.contracts_tree.focus()
+        try:
+            self._open_contract_ids.discard(int(self.contracts_tree.item(node, "values")[0]))
+        except Exception:
+            pass
+
+    def _load_contracts_full(self):
         # If contracts_list is not present for this role, skip
         try:
             # clear existing tree
@@ -1232,8 +1542,9 @@ class HRApp(tk.Tk):
                 for ch in self.contracts_tree.get_children():
                     self.contracts_tree.delete(ch)
             # include deleted rows only when requested via the Show Trash checkbox
+            # (one grouped query returns every contract with its subset count)
             try:
-                rows = get_all_contracts_filtered(
+                rows = get_contract_forest(
                     include_deleted=(
                         self.show_trash_var.get()
                         if hasattr(self, "show_trash_var")
@@ -1261,6 +1572,7 @@ class HRApp(tk.Tk):
                     area = row[6]
                     incharge = row[7]
                     terms = row[8]
+                    subs_count = row[12] if len(row) >= 13 else 0
                 else:
                     cid = row[0] if len(row) > 0 else None
                     parent_id = None
@@ -1269,6 +1581,7 @@ class HRApp(tk.Tk):
                     area = None
                     incharge = None
                     terms = None
+                    subs_count = 0
                 nodes[cid] = f"{cid} | Area:{area or 'N/A'} | {start} → {end}"
                 rows_by_id[cid] = {
                     "area": area,
@@ -1277,6 +1590,7 @@ class HRApp(tk.Tk):
                     "end": end,
                     "terms": terms,
                     "parent_id": parent_id,
+                    "subsets": subs_count or 0,
                 }
                 children_map.setdefault(parent_id, []).append(cid)
 
@@ -1344,17 +1658,7 @@ class HRApp(tk.Tk):
                     incharge = info.get("incharge")
                     start = info.get("start")
                     end = info.get("end")
-                    # subset count
-                    subs_count = 0
-                    try:
-                        from hr_management_app.src.database.database import (
-                            get_subsets_for_contract,
-                        )
-
-                        subs = get_subsets_for_contract(child_id)
-                        subs_count = len(subs)
-                    except Exception:
-                        subs_count = 0
+                    subs_count = info.get("subsets", 0)
                     rows_to_insert.append(
                         (
                             child_id,
@@ -1682,10 +1986,22 @@ class HRApp(tk.Tk):
         self._load_pending(tree, focus_pending_id=focus_pending_id)
 
     def _load_pending(self, tree, focus_pending_id: Optional[int] = None):
-        for i in tree.get_children():
-            tree.delete(i)
+        self.background.submit(
+            list_pending_contracts,
+            status="pending",
+            on_done=lambda rows: self._fill_pending(tree, rows, focus_pending_id),
+            on_error=lambda e: messagebox.showerror(
+                "Error", f"Failed to load pending contracts: {e}"
+            ),
+            key=f"pending-{tree}",
+        )
+
+    def _fill_pending(self, tree, rows, focus_pending_id: Optional[int] = None):
         try:
-            rows = list_pending_contracts(status="pending")
+            if not tree.winfo_exists():
+                return
+            for i in tree.get_children():
+                tree.delete(i)
             for r in rows:
                 # expected DB row: id, contract_id, employee_id, construction_id, parent_contract_id, area, incharge, start_date, end_date, terms, file_path, submitted_by, submitted_at, status, approved_by, approved_at, rejection_reason
                 tree.insert("", "end", values=(
@@ -1711,15 +2027,23 @@ class HRApp(tk.Tk):
             messagebox.showinfo("Select", "Select one or more pending items to approve")
             return
         ids = [int(tree.item(s)["values"][0]) for s in sel]
-        try:
+        approved_by = int(self.user_id) if self.user_id is not None else None
+
+        def approve_all():
             for pid in ids:
-                approve_pending_contract(pid, approved_by=(int(self.user_id) if self.user_id is not None else None))
+                approve_pending_contract(pid, approved_by=approved_by)
+
+        def done(_):
             messagebox.showinfo("Approved", "Selected pending contracts approved")
             self._load_pending(tree)
             self.load_contracts()
-        except Exception as e:
-            logger.exception("Failed to approve pending: %s", e)
+
+        def failed(e):
+            logger.error("Failed to approve pending: %s", e, exc_info=e)
             messagebox.showerror("Error", str(e))
+            self._load_pending(tree)
+
+        self.background.submit(approve_all, on_done=done, on_error=failed)
 
     def _reject_selected_pending(self, tree):
         sel = tree.selection()
@@ -2011,13 +2335,25 @@ class HRApp(tk.Tk):
             messagebox.showerror("Error", "Month must be YYYY-MM", parent=self)
             return
         try:
-            seconds = get_month_work_seconds(int(self.employee_id), year, month)
-            hours = seconds / 3600.0
             wage = float(self.wage_var.get().strip() or 0.0)
-            salary = round(hours * wage, 2)
-            self.month_result.config(text=f"Hours: {hours:.2f}  Salary: {salary:.2f}")
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
+            return
+
+        def show(seconds):
+            hours = seconds / 3600.0
+            salary = round(hours * wage, 2)
+            self.month_result.config(text=f"Hours: {hours:.2f}  Salary: {salary:.2f}")
+
+        self.background.submit(
+            get_month_work_seconds,
+            int(self.employee_id),
+            year,
+            month,
+            on_done=show,
+            on_error=lambda e: messagebox.showerror("Error", str(e), parent=self),
+            key="calc_month",
+        )
 
     def _show_notification(self, message: str, timeout: int = 4, pending_id: Optional[int] = None):
         """Show a small transient toast notification in the app (best-effort).
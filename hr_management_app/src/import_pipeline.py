@@ -0,0 +1,538 @@
+"""Headless steps of the employee import: read, map, validate and impute.
+
+Besides spreadsheets, CSV and single .docx files, a folder or zip of .docx
+contracts/résumés can be imported: iter_docx_chunks parses the documents on a
+process pool and feeds their records into the same steps.
+
+ImportDialog runs these on a worker thread, one chunk of rows at a time, so
+the preview table can show the first rows while the rest of the file is
+still being read. Nothing in here touches Tk.
+
+Heuristic imputation uses statistics of the whole file (most common job
+title, median start year, emails already taken), so it runs once after the
+last chunk and reports the values it would fill in instead of changing the
+records itself.
+
+Mapping, validation and imputation are pure Python, so large files are
+spread over a process pool (iter_prepared_chunks): the reader hands chunks to
+N worker processes and results come back in file order. run_import adds a
+single writer thread that inserts each prepared chunk with
+bulk_import_employees; bounded queues between the stages keep a fast reader
+from running ahead of the workers or of the writer.
+"""
+
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from hr_management_app.src.database.database import (
+    bulk_import_employees,
+    get_user_emails_with_prefix,
+)
+from hr_management_app.src.parsers.file_parser import (
+    DEFAULT_CHUNK_SIZE,
+    iter_file_chunks,
+    is_docx_bundle,
+    iter_docx_sources,
+    read_docx,
+)
+from hr_management_app.src.parsers.normalizer import (
+    FUZZY_THRESHOLD,
+    get_column_mapper,
+    validate_and_clean_batch,
+)
+
+try:
+    from hr_management_app.src.ml.ner import extract_entities, extract_entities_batch
+    from hr_management_app.src.ml.ner import preload as preload_ner
+except Exception:
+    from ml.ner import extract_entities, extract_entities_batch  # type: ignore
+    from ml.ner import preload as preload_ner  # type: ignore
+
+try:
+    from hr_management_app.src.ml.imputer import EmailAllocator, infer_missing_fields
+except Exception:
+    from ml.imputer import EmailAllocator, infer_missing_fields  # type: ignore
+
+# optional ML imputer (load if model artifact exists)
+try:
+    from hr_management_app.src.ml.imputer_ml import (
+        default_model_path,
+        load_model,
+        predict_batch,
+        warm_model_cache,
+    )
+except Exception:
+    try:
+        from ml.imputer_ml import (  # type: ignore
+            default_model_path,
+            load_model,
+            predict_batch,
+            warm_model_cache,
+        )
+    except Exception:
+        default_model_path = None
+        load_model = None
+        predict_batch = None
+        warm_model_cache = None
+
+logger = logging.getLogger(__name__)
+
+# rows per preview update; small enough that inserting one chunk into the
+# Treeview does not stall the UI
+LOAD_CHUNK_SIZE = 1000
+
+
+def collect_db_stats() -> dict:
+    """Collect lightweight stats from users/employees to help imputation.
+
+    Existing emails are not loaded: "email_lookup" queries the users.email
+    index for just the names that need an email synthesized.
+    """
+    return {"email_lookup": _existing_emails}
+
+
+def _existing_emails(prefix: str) -> List[str]:
+    try:
+        return get_user_emails_with_prefix(prefix)
+    except Exception:
+        logger.debug("email lookup failed", exc_info=True)
+        return []
+
+
+def default_workers() -> int:
+    """Worker processes for the import pool: one core is left for the reader/writer."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _parse_docx_records(path: str) -> List[Dict[str, Any]]:
+    raws, text = read_docx(path)
+    if raws or not text:
+        return raws
+    # no tables or key: value lines; try entity extraction on the text
+    try:
+        ent = extract_entities(text)
+        if ent:
+            return [ent]
+    except Exception:
+        logger.debug("docx fallback failed", exc_info=True)
+    return []
+
+
+def _read_docx_file(item: Tuple[str, Any]) -> Tuple[str, List[Dict[str, Any]], str, Optional[str]]:
+    """Parse one file of a .docx bundle: (name, records, text, error message or None)."""
+    name, source = item
+    if isinstance(source, BaseException):
+        return name, [], "", f"{type(source).__name__}: {source}"
+    try:
+        records, text = read_docx(source)
+    except Exception as exc:
+        return name, [], "", f"{type(exc).__name__}: {exc}"
+    return name, records, text, None
+
+
+def _ordered_results(pool, fn, items: Iterable[Any], max_pending: int) -> Iterator[Any]:
+    """pool.submit(fn, item) for every item, yielding results in input order
+    with at most `max_pending` submitted but not yet yielded."""
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_docx_chunks(
+    path: str,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    file_errors: Optional[List[Tuple[str, str]]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Raw records of every .docx in a directory or zip archive, in chunks.
+
+    Files are parsed on `workers` processes (default default_workers(); 1
+    parses in this process) and their records come back in file-name order.
+    Documents without tables or key: value lines go through
+    extract_entities_batch once per chunk. A file that cannot be read or has
+    no records is appended to `file_errors` as (name, message) and skipped.
+    """
+    workers = default_workers() if workers is None else workers
+
+    def report(name: str, message: str) -> None:
+        logger.warning("Skipping %s: %s", name, message)
+        if file_errors is not None:
+            file_errors.append((name, message))
+
+    def finish(group) -> List[Dict[str, Any]]:
+        texts = [text for _, recs, text, err in group if err is None and not recs and text]
+        entities = iter(extract_entities_batch(texts) if texts else [])
+        out: List[Dict[str, Any]] = []
+        for name, recs, text, err in group:
+            if err is None and not recs and text:
+                ent = next(entities)
+                recs = [ent] if ent else []
+            if recs:
+                out.extend(recs)
+            else:
+                report(name, err or "no employee records found")
+        return out
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        sources = iter_docx_sources(path)
+        if pool is None:
+            results: Iterator[Any] = map(_read_docx_file, sources)
+        else:
+            results = _ordered_results(pool, _read_docx_file, sources, 4 * workers)
+        group: List[Any] = []
+        size = 0
+        for result in results:
+            group.append(result)
+            size += len(result[1]) or 1
+            if size >= chunk_size:
+                chunk = finish(group)
+                group, size = [], 0
+                if chunk:
+                    yield chunk
+        chunk = finish(group)
+        if chunk:
+            yield chunk
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_import_chunks(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    file_errors: Optional[List[Tuple[str, str]]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Raw rows of any importable `path`: spreadsheet, CSV, .docx, or a folder/zip of .docx files.
+
+    `workers` is the number of processes parsing a .docx bundle (see iter_docx_chunks).
+    """
+    if is_docx_bundle(path):
+        return iter_docx_chunks(path, chunk_size, workers, file_errors)
+    if os.path.splitext(path)[1].lower() == ".docx":
+        return iter([_parse_docx_records(path)])
+    return iter_file_chunks(path, chunk_size)
+
+
+def open_import(
+    path: str,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+    file_errors: Optional[List[Tuple[str, str]]] = None,
+    workers: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Iterator[List[Dict[str, Any]]]]:
+    """Read the first chunk of raw rows from `path`.
+
+    Returns (first_chunk, remaining_chunks). Spreadsheets, CSV files and
+    folders/zips of .docx files are streamed; a single .docx is read whole
+    and comes back as a single chunk. Files of a bundle that could not be
+    imported are appended to `file_errors` as they are reached; `workers`
+    processes parse them.
+    """
+    chunks = iter_import_chunks(path, chunk_size, file_errors, workers)
+    return next(chunks, []), chunks
+
+
+def warm_imputer_model() -> None:
+    """Start loading the ML imputer in the background so the first load/preview finds it cached."""
+    if callable(warm_model_cache):
+        warm_model_cache()
+
+
+def warm_ner_model() -> None:
+    """Start loading the spaCy model in the background; call once a .docx import is likely."""
+    preload_ner()
+
+
+def imputer_model_path() -> Optional[str]:
+    """Path of the ML imputer artifact, or None when the ML imputer is unavailable."""
+    if not (callable(default_model_path) and callable(predict_batch)):
+        return None
+    return default_model_path()
+
+
+def load_imputer_model(path: Optional[str] = None, mmap_mode: Optional[str] = None):
+    """The trained ML imputer (cached per process), or None when it is unavailable."""
+    if not (callable(load_model) and callable(predict_batch)):
+        return None
+    try:
+        return load_model(path, mmap_mode=mmap_mode)
+    except Exception:
+        logger.exception("Failed to load ML imputer model")
+        return None
+
+
+def prepare_records(
+    raws: List[Dict[str, Any]], cfg: Optional[Dict[str, Any]] = None, model=None
+) -> List[Dict[str, Any]]:
+    """Map, validate and ML-impute one chunk of raw rows.
+
+    Returns one {"raw", "mapped", "cleaned", "problems"} dict per row, in order.
+    """
+    cfg = cfg or {}
+    # headers are resolved once per header set (saved mappings first);
+    # each row is then a dict lookup. docx key/value records can differ per row.
+    mapper = None
+    mapped_rows = []
+    for r in raws:
+        if mapper is None or mapper.headers != tuple(r):
+            mapper = get_column_mapper(
+                r.keys(),
+                fuzzy_threshold=cfg.get("threshold", FUZZY_THRESHOLD),
+                overrides=cfg.get("mappings") or {},
+            )
+        mapped_rows.append(mapper.map(r))
+    records = [
+        {"raw": r, "mapped": mapped, "cleaned": cleaned, "problems": problems}
+        for r, mapped, (cleaned, problems) in zip(
+            raws, mapped_rows, validate_and_clean_batch(mapped_rows)
+        )
+    ]
+
+    if model and callable(predict_batch):
+        try:
+            predicted = predict_batch([rec["cleaned"] for rec in records], model)
+            # copy ML-predicted values back into records
+            for rec, imp in zip(records, predicted):
+                rec["cleaned"].update({k: v for k, v in imp.items() if v is not None})
+        except Exception:
+            logger.exception("ML imputation failed; falling back to heuristics")
+    return records
+
+
+def heuristic_imputations(
+    records: List[Dict[str, Any]], db_stats: Optional[Dict[str, Any]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """Values the heuristic imputer fills in, as {record index: {field: value}}.
+
+    Only fields that are still missing in the record's cleaned values are
+    included.
+    """
+    changes: Dict[int, Dict[str, Any]] = {}
+    imputed = infer_missing_fields([rec["cleaned"] for rec in records], db_stats=db_stats)
+    for idx, (rec, imp) in enumerate(zip(records, imputed)):
+        filled = {
+            k: v
+            for k, v in imp.items()
+            if rec["cleaned"].get(k) in (None, "") and v is not None
+        }
+        if filled:
+            changes[idx] = filled
+    return changes
+
+
+def _impute_chunk(records: List[Dict[str, Any]], db_stats: Optional[Dict[str, Any]]) -> None:
+    """Apply heuristic_imputations to `records` in place, using this chunk's statistics.
+
+    Filled-in values are also listed under rec["imputed"].
+    """
+    for idx, filled in heuristic_imputations(records, db_stats).items():
+        records[idx]["cleaned"].update(filled)
+        records[idx]["imputed"] = filled
+
+
+def _prepare_inline(
+    raws: List[Dict[str, Any]], cfg, model, impute: bool, db_stats
+) -> List[Dict[str, Any]]:
+    records = prepare_records(raws, cfg, model)
+    if impute:
+        _impute_chunk(records, db_stats)
+    return records
+
+
+# per-process state of pool workers, set once by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(cfg, model, model_path: Optional[str], impute: bool, db_stats) -> None:
+    if model_path:
+        # loaded from the file rather than pickled through initargs; its
+        # numpy arrays are memory-mapped and shared by the workers
+        model = load_imputer_model(model_path, mmap_mode="r")
+    _worker_state.update(cfg=cfg, model=model, impute=impute, db_stats=db_stats)
+
+
+def _prepare_in_worker(raws: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    st = _worker_state
+    return _prepare_inline(raws, st["cfg"], st["model"], st["impute"], st["db_stats"])
+
+
+def iter_prepared_chunks(
+    chunks: Iterable[List[Dict[str, Any]]],
+    cfg: Optional[Dict[str, Any]] = None,
+    model=None,
+    workers: Optional[int] = None,
+    impute: bool = False,
+    db_stats: Optional[Dict[str, Any]] = None,
+    max_pending: Optional[int] = None,
+    model_path: Optional[str] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """prepare_records for every chunk, spread over `workers` processes.
+
+    Yields the prepared chunks in input order. At most `max_pending` chunks
+    (default twice the workers) are handed out at a time, so the reader
+    blocks instead of queueing the whole file in memory. With impute=True
+    each chunk also gets heuristic imputation based on its own statistics
+    (plus `db_stats`). workers <= 1 runs everything in this process.
+    Closing the generator early cancels the chunks not yet started.
+
+    The ML model is either `model` itself (pickled to every worker) or, with
+    `model_path`, loaded by each worker with load_model(mmap_mode="r"), which
+    shares the artifact's numpy arrays between the processes (see load_model).
+    """
+    cfg = cfg or {}
+    workers = default_workers() if workers is None else workers
+    if workers <= 1:
+        if model is None and model_path:
+            model = load_imputer_model(model_path)
+        for raws in chunks:
+            yield _prepare_inline(raws, cfg, model, impute, db_stats)
+        return
+
+    max_pending = max_pending or 2 * workers
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(cfg, None if model_path else model, model_path, impute, db_stats),
+    )
+    try:
+        yield from _ordered_results(pool, _prepare_in_worker, chunks, max_pending)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _unique_imputed_emails(records: List[Dict[str, Any]], taken: EmailAllocator) -> None:
+    """Re-synthesize imputed emails that an earlier chunk already used.
+
+    Workers only see their own chunk, so two chunks can both invent
+    jane.doe@example.com; without this the second Jane would be attached to
+    the first one's account.
+    """
+    for rec in records:
+        cleaned = rec["cleaned"]
+        email = cleaned.get("email")
+        if not email:
+            continue
+        if email in taken and "email" in rec.get("imputed", {}):
+            email = taken.allocate(str(cleaned.get("name")))
+            cleaned["email"] = rec["imputed"]["email"] = email
+        else:
+            taken.add(email)
+
+
+def run_import(
+    path: str,
+    cfg: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    impute: bool = True,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """Import every row of `path` without a UI: read -> N workers -> one writer.
+
+    Rows with validation problems are skipped; the rest are inserted one
+    chunk per transaction with bulk_import_employees on a single writer
+    thread (SQLite has one writer anyway). on_progress, if given, is called
+    from the writer thread with a copy of the running totals after each chunk;
+    setting `cancel` stops reading and lets the chunks already prepared finish.
+    `path` may also be a folder or zip of .docx files (see iter_docx_chunks);
+    its documents are then parsed on the `workers` processes and the few
+    records each yields are prepared in this process, so one pool runs at a
+    time either way.
+
+    Returns {"rows", "skipped", "created_users", "created_employees",
+    "skipped_existing", "errors": [(row index, message)],
+    "file_errors": [(file name, message)]}; file_errors lists the files of a
+    .docx bundle that were skipped.
+    """
+    cancel = cancel or threading.Event()
+    summary: Dict[str, Any] = {
+        "rows": 0,
+        "skipped": 0,
+        "created_users": 0,
+        "created_employees": 0,
+        "skipped_existing": 0,
+        "errors": [],
+        "file_errors": [],
+    }
+    # prepared chunks waiting for the writer; put() blocks when it is behind
+    ready: "queue.Queue" = queue.Queue(maxsize=2)
+    failure: List[BaseException] = []
+
+    def write():
+        taken = EmailAllocator(lookup=_existing_emails)
+        while True:
+            item = ready.get()
+            if item is None:
+                return
+            if failure:
+                continue  # keep draining so the reader never blocks
+            start, records = item
+            try:
+                if impute:
+                    _unique_imputed_emails(records, taken)
+                batch = []
+                batch_rows = []
+                for i, rec in enumerate(records, start=start):
+                    if rec["problems"]:
+                        summary["skipped"] += 1
+                        continue
+                    batch.append(rec["cleaned"])
+                    batch_rows.append(i)
+                result = bulk_import_employees(batch)
+            except BaseException as exc:
+                failure.append(exc)
+                cancel.set()
+                continue
+            summary["rows"] = start + len(records)
+            summary["created_users"] += result["created_users"]
+            summary["created_employees"] += result["created_employees"]
+            summary["skipped_existing"] += result["skipped"]
+            summary["errors"].extend((batch_rows[idx], msg) for idx, msg in result["errors"])
+            if on_progress is not None:
+                try:
+                    on_progress(
+                        dict(
+                            summary,
+                            errors=list(summary["errors"]),
+                            file_errors=list(summary["file_errors"]),
+                        )
+                    )
+                except Exception:
+                    logger.exception("Import progress callback failed")
+
+    writer = threading.Thread(target=write, name="import-writer", daemon=True)
+    writer.start()
+    db_stats = collect_db_stats() if impute else None
+    prepared = iter_prepared_chunks(
+        iter_import_chunks(path, chunk_size, summary["file_errors"], workers),
+        cfg,
+        workers=1 if is_docx_bundle(path) else workers,
+        impute=impute,
+        db_stats=db_stats,
+        model_path=imputer_model_path() if impute else None,
+    )
+    start = 0
+    try:
+        for records in prepared:
+            if cancel.is_set():
+                break
+            ready.put((start, records))
+            start += len(records)
+    finally:
+        prepared.close()
+        ready.put(None)
+        writer.join()
+    if failure:
+        raise failure[0]
+    return summary
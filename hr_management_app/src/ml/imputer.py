@@ -6,6 +6,7 @@ Strategy:
 - For categorical fields (job_title, role, contract_type): use most common value.
 - For numeric fields (year_start): use median or mode depending on distribution.
 - For email: if missing but name exists, synthesize using a safe pattern (name + unique suffix) when allowed; otherwise leave None.
+  EmailAllocator keeps the addresses in use and the next suffix per name, so a batch is linear time.
 - For dob: attempt to infer year from year_start - typical career start age (e.g., 22-30) or leave None.
 
 This module is intentionally small and deterministic so it works without heavy ML libs.
@@ -13,7 +14,7 @@ This module is intentionally small and deterministic so it works without heavy M
 
 import re
 from collections import Counter
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Sequence
 
 # heuristic age at start distribution used for DOB inference
 DEFAULT_START_AGE = 24
@@ -38,14 +39,19 @@ def median_int(values: Sequence[int], default: Optional[int] = None) -> Optional
     return (vals[mid - 1] + vals[mid]) // 2
 
 
-def synthesize_email_from_name(name: str, existing_emails: List[str]) -> str:
-    """Create a safe synthesized email using name and a numeric suffix if needed."""
+def _email_base(name: str) -> str:
     # Prefer a simple first-name based local-part for synthesized emails
     tokens = re.findall(r"[a-z0-9]+", name.strip().lower())
-    if tokens:
-        base = tokens[0]
-    else:
-        base = "user"
+    return tokens[0] if tokens else "user"
+
+
+def synthesize_email_from_name(name: str, existing_emails: Collection[str]) -> str:
+    """Create a safe synthesized email using name and a numeric suffix if needed.
+
+    Every call starts the suffix search from scratch; use EmailAllocator to
+    synthesize emails for a whole batch.
+    """
+    base = _email_base(name)
     candidate = f"{base}@example.com"
     if candidate not in existing_emails:
         return candidate
@@ -58,12 +64,56 @@ def synthesize_email_from_name(name: str, existing_emails: List[str]) -> str:
         i += 1
 
 
+class EmailAllocator:
+    """Hands out the same emails as repeated synthesize_email_from_name calls, in O(1) each.
+
+    Keeps the set of addresses in use plus, per local-part base, the next
+    suffix to try. Addresses are never released, so a suffix that was taken
+    once stays taken and the search for a base resumes where it stopped.
+    `lookup(base)`, if given, returns the stored addresses starting with
+    `base` (e.g. database.get_user_emails_with_prefix) and is called the first
+    time a base is allocated, instead of loading every existing email up front.
+    """
+
+    def __init__(
+        self,
+        existing: Iterable[str] = (),
+        lookup: Optional[Callable[[str], Iterable[str]]] = None,
+    ):
+        self.taken = set(existing)
+        self._lookup = lookup
+        self._next_suffix: Dict[str, int] = {}
+
+    def __contains__(self, email: object) -> bool:
+        return email in self.taken
+
+    def add(self, email: str) -> None:
+        self.taken.add(email)
+
+    def allocate(self, name: str) -> str:
+        base = _email_base(name)
+        i = self._next_suffix.get(base)
+        if i is None:
+            if self._lookup is not None:
+                self.taken.update(self._lookup(base))
+            i = 0
+        while True:
+            cand = f"{base}{i or ''}@example.com"
+            i += 1
+            if cand not in self.taken:
+                break
+        self._next_suffix[base] = i
+        self.taken.add(cand)
+        return cand
+
+
 def infer_missing_fields(
     batch: List[Dict[str, Any]], db_stats: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """Take a batch of cleaned records and return a new list with imputed values.
 
-    db_stats: optional precomputed stats such as {"job_title_common": ..., "year_start_median": ..., "emails": [...]}
+    db_stats: optional precomputed stats such as {"job_title_common": ..., "year_start_median": ..., "emails": [...]};
+    "email_lookup" (see EmailAllocator) fetches the existing emails for a name on demand.
     """
     db_stats = db_stats or {}
     # collect existing values in this batch
@@ -88,7 +138,9 @@ def infer_missing_fields(
     )
     contract_common = db_stats.get("contract_common") or most_common(contract_vals)
     year_median = db_stats.get("year_start_median") or median_int(year_vals)
-    existing_emails = set(db_stats.get("emails", []) + emails)
+    allocator = EmailAllocator(db_stats.get("emails", []), db_stats.get("email_lookup"))
+    for e in emails:
+        allocator.add(e)
 
     out = []
     for r in batch:
@@ -109,10 +161,7 @@ def infer_missing_fields(
         if not rec.get("email") and rec.get("name"):
             name_val = rec.get("name")
             if name_val is not None:
-                rec["email"] = synthesize_email_from_name(
-                    str(name_val), list(existing_emails)
-                )
-            existing_emails.add(rec["email"])
+                rec["email"] = allocator.allocate(str(name_val))
         # dob: if missing but year_start exists, infer approximate dob by subtracting DEFAULT_START_AGE
         if not rec.get("dob") and rec.get("year_start"):
             try:
@@ -2,15 +2,22 @@
 ML-backed imputer for missing job_title and year_start.
 
 This file provides:
-- fit_imputer_from_db(conn_or_records): trains simple sklearn models (RandomForest)
-  to predict job_title (categorical) and year_start (regression) from available fields.
-- load_model(path): loads saved models (job and year models) using joblib.
+- fit_imputer_from_records(records) / fit_imputer_from_chunks(chunks): train simple sklearn
+  models (RandomForest) to predict job_title (categorical) and year_start (regression) from
+  available fields; the chunked form streams rows from a DB cursor or file reader.
+- load_model(path): loads saved models (job and year models) using joblib; loaded
+  artifacts are cached per process and reloaded only when the file changes.
 - predict_batch(records, model): predicts missing fields for a batch and returns filled records + confidences.
 
 Design choices:
 - Feature extraction is intentionally simple: name token counts, role one-hot (mapped), and simple length features.
 - Categorical job_title prediction uses a RandomForestClassifier with label encoding.
 - Year_start prediction uses RandomForestRegressor.
+- Alternatively (job_model="linear" or "nb") names and emails are feature-hashed into a
+  sparse matrix (character n-grams of the name and email local part, plus role and
+  email domain) and fed to an SGD logistic regression or complement naive Bayes for
+  job_title and a ridge regression for year_start. The hasher has no fitted state; its
+  config is saved in the artifact under "features".
 - Model artifacts are saved together in a directory with joblib.
 
 Note: This is a lightweight approach suited for medium-sized datasets (thousands of rows). For 20k+ rows
@@ -19,11 +26,14 @@ it will work better; tune hyperparameters if needed.
 
 import json
 import os
+import pickle
 import re
+import threading
+import time
 from collections import Counter
 from typing import Any
 from typing import Any as _Any
-from typing import Dict, List, Optional, Tuple, cast
+from typing import Dict, Iterable, List, Optional, Tuple, cast
 
 # Try to import sklearn and joblib; if unavailable, use a lightweight fallback
 HAS_SKLEARN = True
@@ -42,6 +52,10 @@ MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
 if not os.path.exists(MODEL_DIR):
     os.makedirs(MODEL_DIR, exist_ok=True)
 
+# loaded artifacts: {(abs path, mmap_mode): ((mtime_ns, size), model)}
+_MODEL_CACHE: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, int], Any]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
 
 def _name_tokens(name: str) -> List[str]:
     if not name:
@@ -50,138 +64,403 @@ def _name_tokens(name: str) -> List[str]:
     return [t for t in s.split() if t]
 
 
+# the only non-ASCII characters whose lower-case form contains ASCII letters
+# ("İ" -> "i̇", Kelvin sign -> "k")
+_LOWERS_TO_ASCII = ("\u0130", "\u212a")
+
+
+def _name_token_counts(names: List[str]) -> Any:
+    """len(_name_tokens(n)) for every name, counted over one byte buffer.
+
+    A token is a maximal run of characters that lower-case to ASCII [a-z0-9].
+    Every byte of a non-ASCII character in UTF-8 is >= 0x80, so classifying
+    the bytes of the UTF-8 text (A-Z counting as letters) finds exactly the
+    same tokens without lower-casing the text, unless it contains one of
+    _LOWERS_TO_ASCII. Names are joined with NUL separators so each token
+    start can be attributed to its record.
+    """
+    import numpy as _np
+
+    n = len(names)
+    # every name is followed by a NUL, so name i owns the bytes up to and
+    # including the i-th NUL
+    joined = "\0".join(names) + "\0"
+    if any(c in joined for c in _LOWERS_TO_ASCII):
+        joined = joined.lower()
+    buf = _np.frombuffer(joined.encode("utf-8", "surrogatepass"), dtype=_np.uint8)
+    ends = _np.flatnonzero(buf == 0)
+    if len(ends) != n:
+        # a name contains NUL itself: per-name path
+        return _np.fromiter((len(_name_tokens(x)) for x in names), dtype=_np.int64, count=n)
+    # uint8 arithmetic wraps, so these are range checks for [a-zA-Z] and [0-9]
+    alnum = (((buf | 0x20) - ord("a")) < 26) | ((buf - ord("0")) < 10)
+    starts = alnum.copy()
+    starts[1:] &= ~alnum[:-1]
+    bounds = _np.concatenate(([0], ends[:-1] + 1))
+    return _np.add.reduceat(starts, bounds, dtype=_np.int64)
+
+
+def _model_role_vocab(model: Dict[str, Any]) -> Tuple[List[str], int]:
+    """(role vocabulary, feature value for unseen roles) of a trained model."""
+    if "role_vocab" in model:
+        return list(model["role_vocab"]), int(model["role_unknown"])
+    # artifacts saved before the vocabulary was stored carry a LabelEncoder
+    # and encoded unseen roles as 0
+    return list(model["le_role"].classes_), 0
+
+
 def _extract_features(
-    records: List[Dict[str, Any]], le_role: Optional[Any] = None
+    records: List[Dict[str, Any]],
+    role_vocab: Optional[List[str]] = None,
+    role_unknown: Optional[int] = None,
 ) -> Tuple[Any, Dict]:
-    # simple features: name token counts, name length, role encoded
+    """Feature matrix for `records`: name token count, name length, role code.
+
+    Built column by column into a C-contiguous float32 array (the dtype the
+    forests use internally). Without a vocabulary (training) the roles seen
+    here become the vocabulary, sorted, and unseen roles get their own code
+    after the last one. Returns (X, {"role_vocab", "role_unknown"}).
+    """
+    import numpy as _np
+    import pandas as _pd
+
+    n = len(records)
+    names = [r.get("name") or "" for r in records]
     role_vals = [r.get("role") or "" for r in records]
-    all_roles = list(set(role_vals))
-    if le_role is None:
-        # If sklearn is available, import LabelEncoder locally to avoid static
-        # analyzers confusing the module-level symbol. Otherwise, create a
-        # simple dummy encoder with classes_.
-        if HAS_SKLEARN:
-            try:
-                from sklearn.preprocessing import LabelEncoder as _LabelEncoder_local
+    if role_vocab is None:
+        role_vocab = sorted(set(role_vals), key=str)
+    if role_unknown is None:
+        role_unknown = len(role_vocab)
+
+    X = _np.empty((n, 3), dtype=_np.float32)
+    if n:
+        X[:, 0] = _name_token_counts(names)
+        X[:, 1] = _np.fromiter(map(len, names), dtype=_np.int64, count=n)
+        # look up each distinct role once
+        codes, uniques = _pd.factorize(_np.array(role_vals, dtype=object))
+        lookup = _pd.Index(role_vocab).get_indexer(uniques)
+        lookup[lookup < 0] = role_unknown
+        X[:, 2] = lookup[codes]
+    return X, {"role_vocab": list(role_vocab), "role_unknown": role_unknown}
+
+
+# hashed feature config saved with linear/nb models; n_features is per text
+# block (name, email local part), cat_features for the role/domain tokens
+HASHED_FEATURES: Dict[str, Any] = {
+    "kind": "hashed",
+    "analyzer": "char_wb",
+    "ngram_range": (2, 4),
+    "n_features": 2**14,
+    "cat_features": 2**8,
+}
+
+JOB_MODELS = ("forest", "linear", "nb")
+
+_DIGITS_RE = re.compile(r"[0-9]+")
+
+
+def _hashed_features(records: List[Dict[str, Any]], config: Dict[str, Any]) -> Any:
+    """Sparse CSR feature matrix for `records` as described by a hasher `config`.
+
+    Columns are three hashed blocks side by side: character n-grams of the
+    name, character n-grams of the email local part (digits dropped, they are
+    usually just a counter), and "role=..." / "domain=..." tokens. Text blocks
+    are L2-normalised per row and every value is non-negative, so the matrix
+    also suits naive Bayes. Each distinct value is hashed once and its row
+    repeated, since names and roles repeat a lot within an import.
+    """
+    import numpy as _np
+    import pandas as _pd
+    import scipy.sparse as _sp
+    from sklearn.feature_extraction import FeatureHasher as _FeatureHasher
+    from sklearn.feature_extraction.text import HashingVectorizer as _HashingVectorizer
+
+    text = _HashingVectorizer(
+        analyzer=config["analyzer"],
+        ngram_range=tuple(config["ngram_range"]),
+        n_features=int(config["n_features"]),
+        alternate_sign=False,
+        dtype=_np.float32,
+    )
+    cat = _FeatureHasher(
+        n_features=int(config["cat_features"]),
+        input_type="string",
+        alternate_sign=False,
+        dtype=_np.float32,
+    )
+    names, locals_, cats = [], [], []
+    for r in records:
+        local, _, domain = str(r.get("email") or "").lower().partition("@")
+        names.append(str(r.get("name") or ""))
+        locals_.append(_DIGITS_RE.sub("", local))
+        cats.append("role=" + str(r.get("role") or "").lower() + "\0domain=" + domain)
+
+    def block(values, transform):
+        codes, uniques = _pd.factorize(_np.array(values, dtype=object))
+        return transform(list(uniques))[codes]
+
+    return _sp.hstack(
+        [
+            block(names, text.transform),
+            block(locals_, text.transform),
+            block(cats, lambda vals: cat.transform(v.split("\0") for v in vals)),
+        ],
+        format="csr",
+    )
 
-                le_role = _LabelEncoder_local()
-                try:
-                    le_role.fit(all_roles)
-                except Exception:
-                    # fallback to setting classes_ directly
-                    try:
-                        le_role.classes_ = list(all_roles)
-                    except Exception:
-                        pass
-            except Exception:
-                # treat as unavailable below
-                le_role = None
-        if le_role is None:
-
-            class _DummyLE:
-                def __init__(self, classes):
-                    self.classes_ = list(classes)
-
-            le_role = _DummyLE(all_roles)
-    # Safely encode roles: LabelEncoder.transform will raise on unseen labels,
-    # so build a mapping from known classes to indices and fall back to 0.
-    try:
-        classes = list(le_role.classes_)
-    except Exception:
-        classes = list(set(role_vals))
-        try:
-            le_role.classes_ = classes
-        except Exception:
-            pass
 
-    mapping = {c: i for i, c in enumerate(classes)}
+def _model_features(model: Dict[str, Any], records: List[Dict[str, Any]]) -> Any:
+    """Feature matrix of `records` in the layout `model` was trained on."""
+    features = model.get("features")
+    if features and features.get("kind") == "hashed":
+        return _hashed_features(records, features)
+    X, _ = _extract_features(records, *_model_role_vocab(model))
+    return X
 
-    X = []
-    meta = {"le_role": le_role}
-    for idx, r in enumerate(records):
-        name = r.get("name") or ""
-        toks = _name_tokens(name)
-        tok_count = len(toks)
-        name_len = len(name)
-        rv = role_vals[idx]
-        role_val = mapping.get(rv, 0)
-        X.append([tok_count, name_len, role_val])
 
+def fit_imputer_from_records(
+    records: List[Dict[str, Any]],
+    save_to: Optional[str] = None,
+    job_model: str = "forest",
+    **options: Any,
+) -> Dict[str, Any]:
+    """Train models from provided records. Returns a dict with models and label encoders.
+
+    job_model picks the sklearn estimators: "forest" (RandomForests on the
+    dense features), "linear" (SGD logistic regression) or "nb" (complement
+    naive Bayes), the last two on hashed features with a ridge regression
+    for year_start. Other options are those of fit_imputer_from_chunks.
+    """
+    return fit_imputer_from_chunks([records], save_to, job_model, **options)
+
+
+def fit_imputer_from_chunks(
+    chunks: Iterable[List[Dict[str, Any]]],
+    save_to: Optional[str] = None,
+    job_model: str = "forest",
+    n_jobs: Optional[int] = -1,
+    max_samples: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    max_rows: Optional[int] = None,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    """Train the imputer from an iterable of record chunks (e.g. a DB cursor or XLSX reader).
+
+    Each chunk is reduced to its feature rows and label codes as it arrives,
+    so the records themselves never need to be in memory at once. max_rows
+    caps the training set with a subsample stratified by job title.
+    n_jobs, max_samples and max_depth are passed to the forests (n_jobs also
+    to the SGD classifier); the saved estimators are reset to n_jobs=None so
+    predicting does not start threads inside import workers. Training time,
+    row counts and the pickled estimator size are stored under "metadata".
+    """
+    if job_model not in JOB_MODELS:
+        raise ValueError(f"job_model must be one of {JOB_MODELS}, got {job_model!r}")
+    if not HAS_SKLEARN:
+        return _fit_fallback((r for chunk in chunks for r in chunk), save_to)
     try:
+        import joblib as _joblib
         import numpy as _np
-
-        return _np.array(X), meta
+        from sklearn.ensemble import RandomForestClassifier as _RFC
+        from sklearn.ensemble import RandomForestRegressor as _RFR
+        from sklearn.linear_model import Ridge as _Ridge
+        from sklearn.linear_model import SGDClassifier as _SGDClassifier
+        from sklearn.naive_bayes import ComplementNB as _ComplementNB
     except Exception:
-        return X, meta
+        raise RuntimeError("SKLearn environment expected but missing")
+
+    started = time.perf_counter()
+    data = _training_set(chunks, job_model)
+    job, year = data["job"], data["year"]
+    keep = _stratified_subsample(job, max_rows, random_state)
+    if keep is not None:
+        job, year = job[keep], year[keep]
+    job_rows = _np.flatnonzero(job >= 0)
+    year_rows = _np.flatnonzero(year >= 0)
+    if not len(job_rows):
+        raise ValueError("No job_title records found for training")
+    if keep is not None:
+        job_rows, year_rows = keep[job_rows], keep[year_rows]
+    X = data["X"]
+
+    if job_model == "forest":
+        forest = {"n_jobs": n_jobs, "max_samples": max_samples, "max_depth": max_depth}
+        clf = _RFC(n_estimators=100, random_state=random_state, **forest)
+        reg = _RFR(n_estimators=100, random_state=random_state, **forest)
+    else:
+        if job_model == "nb":
+            clf = _ComplementNB()
+        else:
+            clf = _SGDClassifier(loss="log_loss", random_state=random_state, n_jobs=n_jobs)
+        # lsqr handles the sparse matrix (with intercept) several times faster than the default
+        reg = _Ridge(alpha=1.0, solver="lsqr")
+    clf.fit(X[job_rows], data["job"][job_rows])
+    reg.fit(X[year_rows], data["year"][year_rows])
+    for est in (clf, reg):
+        if "n_jobs" in est.get_params():
+            est.set_params(n_jobs=None)
+
+    model: Dict[str, Any] = {
+        "type": "sklearn",
+        "job_model": job_model,
+        "clf": clf,
+        "reg": reg,
+        "le_job": data["le_job"],
+    }
+    if job_model == "forest":
+        model["role_vocab"] = data["role_vocab"]
+        model["role_unknown"] = data["role_unknown"]
+    else:
+        model["features"] = data["features"]
+    model["metadata"] = {
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "train_seconds": round(time.perf_counter() - started, 3),
+        "rows": int(len(data["job"])),
+        "job_rows": int(len(job_rows)),
+        "year_rows": int(len(year_rows)),
+        "n_jobs": n_jobs,
+        "max_samples": max_samples,
+        "max_depth": max_depth,
+        "max_rows": max_rows,
+        "model_bytes": _pickled_size((clf, reg, data["le_job"])),
+    }
 
+    if save_to is None:
+        save_to = os.path.join(MODEL_DIR, "imputer_model.joblib")
+    _joblib.dump(model, save_to)
+    _cache_model(save_to, model)
+    return model
 
-def fit_imputer_from_records(
-    records: List[Dict[str, Any]], save_to: Optional[str] = None
-) -> Dict[str, Any]:
-    """Train models from provided records. Returns a dict with models and label encoders."""
-    # If sklearn available, train RandomForest models
-    if HAS_SKLEARN:
-        # prepare classification dataset for job_title
-        job_records = [r for r in records if r.get("job_title")]
-        if not job_records:
-            raise ValueError("No job_title records found for training")
-
-        # do local imports to keep static analyzers happy
-        try:
-            import joblib as _joblib
-            import numpy as _np
-            from sklearn.ensemble import RandomForestClassifier as _RFC
-            from sklearn.ensemble import RandomForestRegressor as _RFR
-            from sklearn.preprocessing import LabelEncoder as _LabelEncoder
-        except Exception:
-            raise RuntimeError("SKLearn environment expected but missing")
-
-        X_job, meta = _extract_features(job_records)
-        # r.get may be typed as Any|None; cast to str because we filtered job_records
-        y_job = [cast(str, r.get("job_title")) for r in job_records]
-        le_job = _LabelEncoder()
-        y_enc = le_job.fit_transform(y_job)
-
-        clf = _RFC(n_estimators=100, random_state=42)
-        clf.fit(X_job, y_enc)
-
-        # prepare regression for year_start
-        year_records = [r for r in records if r.get("year_start")]
-        X_year, meta_y = _extract_features(year_records, le_role=meta["le_role"])
-        # Ensure year values are present and valid before casting
-        # Filter out missing values before building numpy array
-        y_year = _np.array(
-            [
-                int(cast(int, r.get("year_start")))
-                for r in year_records
-                if r.get("year_start") is not None
-            ]
+
+def _training_set(chunks: Iterable[List[Dict[str, Any]]], job_model: str) -> Dict[str, Any]:
+    """Feature matrix and label codes for every record in `chunks`.
+
+    job is the LabelEncoder code of each row's job title and year its
+    year_start, both -1 where missing. Roles and job titles get codes in
+    order of appearance while streaming and are renumbered to sorted order
+    at the end, which gives the same encoding as featurizing all records at once.
+    """
+    import numpy as _np
+    import scipy.sparse as _sp
+    from sklearn.preprocessing import LabelEncoder as _LabelEncoder
+
+    hashed = job_model != "forest"
+    features = dict(HASHED_FEATURES)
+    parts: List[Any] = []
+    job_parts: List[Any] = []
+    year_parts: List[Any] = []
+    role_ids: Dict[Any, int] = {}
+    job_ids: Dict[Any, int] = {}
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if hashed:
+            parts.append(_hashed_features(chunk, features))
+        else:
+            for r in chunk:
+                role_ids.setdefault(r.get("role") or "", len(role_ids))
+            X, _ = _extract_features(chunk, list(role_ids), len(role_ids))
+            parts.append(X)
+        job_parts.append(
+            _np.fromiter(
+                (
+                    job_ids.setdefault(r.get("job_title"), len(job_ids)) if r.get("job_title") else -1
+                    for r in chunk
+                ),
+                dtype=_np.int64,
+                count=len(chunk),
+            )
         )
-        reg = _RFR(n_estimators=100, random_state=42)
-        reg.fit(X_year, y_year)
-
-        model = {
-            "type": "sklearn",
-            "clf": clf,
-            "reg": reg,
-            "le_job": le_job,
-            "le_role": meta["le_role"],
-        }
-
-        if save_to is None:
-            save_to = os.path.join(MODEL_DIR, "imputer_model.joblib")
-        _joblib.dump(model, save_to)
-        return model
+        year_parts.append(
+            _np.fromiter(
+                (
+                    int(cast(int, r.get("year_start"))) if r.get("year_start") else -1
+                    for r in chunk
+                ),
+                dtype=_np.int64,
+                count=len(chunk),
+            )
+        )
+
+    le_job = _LabelEncoder()
+    job = _np.concatenate(job_parts) if job_parts else _np.empty(0, dtype=_np.int64)
+    if job_ids:
+        le_job.fit(list(job_ids))
+        remap = le_job.transform(list(job_ids))
+        job[job >= 0] = remap[job[job >= 0]]
+    out: Dict[str, Any] = {
+        "job": job,
+        "year": _np.concatenate(year_parts) if year_parts else _np.empty(0, dtype=_np.int64),
+        "le_job": le_job,
+    }
+    if hashed:
+        out["features"] = features
+        out["X"] = _sp.vstack(parts, format="csr") if parts else None
+        return out
+    role_vocab = sorted(role_ids, key=str)
+    position = {role: i for i, role in enumerate(role_vocab)}
+    remap = _np.array([position[role] for role in role_ids], dtype=_np.float32)
+    X = _np.concatenate(parts) if parts else _np.empty((0, 3), dtype=_np.float32)
+    X[:, 2] = remap[X[:, 2].astype(_np.int64)]
+    out.update(X=X, role_vocab=role_vocab, role_unknown=len(role_vocab))
+    return out
 
+
+def _stratified_subsample(labels: Any, max_rows: Optional[int], seed: int) -> Any:
+    """Sorted row indices of a subsample of at most ~max_rows, or None for all rows.
+
+    Every label (-1, a missing job title, included) keeps the same fraction
+    of its rows, and at least one.
+    """
+    import numpy as _np
+
+    n = len(labels)
+    if not max_rows or n <= max_rows:
+        return None
+    rng = _np.random.default_rng(seed)
+    order = _np.argsort(labels, kind="stable")
+    _, starts, counts = _np.unique(labels[order], return_index=True, return_counts=True)
+    frac = max_rows / n
+    keep = [
+        rng.choice(order[start : start + count], size=max(1, round(count * frac)), replace=False)
+        for start, count in zip(starts, counts)
+    ]
+    return _np.sort(_np.concatenate(keep))
+
+
+class _ByteCounter:
+    """Write-only file object that only counts bytes."""
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, data: Any) -> int:
+        # protocol 5 hands large arrays over as PickleBuffers
+        n = memoryview(data).nbytes
+        self.size += n
+        return n
+
+
+def _pickled_size(obj: Any) -> int:
+    counter = _ByteCounter()
+    pickle.dump(obj, counter, protocol=pickle.HIGHEST_PROTOCOL)
+    return counter.size
+
+
+def _fit_fallback(records: Iterable[Dict[str, Any]], save_to: Optional[str]) -> Dict[str, Any]:
+    """Frequency/median model used when sklearn is not installed."""
     # Fallback: build simple frequency-based model and medians
     # job_title by role frequency, and year_start median per job_title
     job_by_role = {}
     job_counts = Counter()
     years_by_job = {}
+    global_years = []
     for r in records:
         job = r.get("job_title")
         role = r.get("role") or ""
         ys = r.get("year_start")
+        if ys:
+            global_years.append(int(ys))
         if job:
             job_counts[job] += 1
             job_by_role.setdefault(role, Counter())[job] += 1
@@ -192,9 +471,6 @@ def fit_imputer_from_records(
     year_median_by_job = {
         j: int(sorted(v)[len(v) // 2]) for j, v in years_by_job.items()
     }
-    global_years = [
-        int(cast(int, r.get("year_start"))) for r in records if r.get("year_start")
-    ]
     global_year_median = (
         int(sorted(global_years)[len(global_years) // 2]) if global_years else None
     )
@@ -210,24 +486,97 @@ def fit_imputer_from_records(
         save_to = os.path.join(MODEL_DIR, "imputer_model.json")
     with open(save_to, "w", encoding="utf-8") as fh:
         json.dump(model, fh)
+    _cache_model(save_to, model)
     return model
 
 
-def load_model(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    # try sklearn artifact
-    if HAS_SKLEARN:
+def default_model_path() -> str:
+    """The artifact load_model reads when no path is given."""
+    name = "imputer_model.joblib" if HAS_SKLEARN else "imputer_model.json"
+    return os.path.join(MODEL_DIR, name)
+
+
+def _artifact_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cache_model(path: str, model: Any) -> None:
+    """Replace any cached copy of `path` with the model that was just saved there."""
+    path = os.path.abspath(path)
+    sig = _artifact_signature(path)
+    with _MODEL_CACHE_LOCK:
+        for key in [k for k in _MODEL_CACHE if k[0] == path]:
+            del _MODEL_CACHE[key]
+        if sig is not None:
+            _MODEL_CACHE[(path, None)] = (sig, model)
+
+
+def invalidate_model_cache(path: Optional[str] = None) -> None:
+    """Forget cached models (all of them, or the ones loaded from `path`)."""
+    with _MODEL_CACHE_LOCK:
         if path is None:
-            path = os.path.join(MODEL_DIR, "imputer_model.joblib")
-        if not os.path.exists(path):
-            return None
-        return joblib.load(path)
-    # fallback: load JSON model
+            _MODEL_CACHE.clear()
+            return
+        path = os.path.abspath(path)
+        for key in [k for k in _MODEL_CACHE if k[0] == path]:
+            del _MODEL_CACHE[key]
+
+
+def load_model(
+    path: Optional[str] = None, mmap_mode: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Load the imputer artifact, reusing the copy already loaded in this process.
+
+    The cache is keyed by path and checked against the file's mtime and size,
+    so retraining (or copying in a new artifact) is picked up on the next call.
+    mmap_mode (e.g. "r") is passed to joblib.load: numpy arrays in the
+    artifact (the coefficients of the linear / naive Bayes job models, the
+    label encoders) are then memory-mapped from the file, so processes loading
+    the same artifact share them through the page cache instead of each
+    holding a copy. sklearn copies a forest's tree nodes out of the file on
+    load, so those stay per process. The returned model is shared; callers
+    must not modify it.
+    """
     if path is None:
-        path = os.path.join(MODEL_DIR, "imputer_model.json")
-    if not os.path.exists(path):
-        return None
-    with open(path, "r", encoding="utf-8") as fh:
-        return json.load(fh)
+        path = default_model_path()
+    path = os.path.abspath(path)
+    key = (path, mmap_mode)
+    with _MODEL_CACHE_LOCK:
+        sig = _artifact_signature(path)
+        if sig is None:
+            _MODEL_CACHE.pop(key, None)
+            return None
+        cached = _MODEL_CACHE.get(key)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        # loaded under the lock so concurrent callers wait for one load
+        if HAS_SKLEARN:
+            model = joblib.load(path, mmap_mode=mmap_mode)
+        else:
+            # fallback: JSON model
+            with open(path, "r", encoding="utf-8") as fh:
+                model = json.load(fh)
+        _MODEL_CACHE[key] = (sig, model)
+        return model
+
+
+def warm_model_cache(path: Optional[str] = None) -> threading.Thread:
+    """Load the artifact (and sklearn) on a daemon thread so the first preview is fast."""
+
+    def warm():
+        try:
+            load_model(path)
+        except Exception:
+            # the real load will report the problem
+            pass
+
+    t = threading.Thread(target=warm, name="imputer-warmup", daemon=True)
+    t.start()
+    return t
 
 
 def predict_batch(
@@ -239,9 +588,8 @@ def predict_batch(
         clf = model["clf"]
         reg = model["reg"]
         le_job = model["le_job"]
-        le_role = model["le_role"]
 
-        X, _ = _extract_features(records, le_role=le_role)
+        X = _model_features(model, records)
         # predict job where missing
         probs = clf.predict_proba(X)
         # numpy required for array ops; import locally so static checker knows it's present
@@ -1,46 +1,74 @@
 """
 Lightweight NER wrapper used by the import pipeline.
 
-This module attempts to load spaCy and a language model. If spaCy is not
+This module attempts to load spaCy and a language model the first time text
+is extracted (or on a background thread via preload()). If spaCy is not
 available, it provides a conservative rule-based fallback so the rest of the
-app can function without ML dependencies.
+app can function without ML dependencies. extract_entities_batch runs many
+texts through the model at once.
 """
 
+import importlib.util
 import logging
 import re
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
-SPACY_AVAILABLE = False
-_nlp = None
-
-try:
-    import spacy  # type: ignore
+SPACY_MODEL = "en_core_web_sm"
+# components of the stock English pipelines that named-entity recognition
+# does not use; they are not loaded at all
+_UNUSED_PIPES = ("tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer")
 
-    # do not auto-download models here; user can install with `python -m spacy download en_core_web_sm`
-    try:
-        _nlp = spacy.load("en_core_web_sm")
-        SPACY_AVAILABLE = True
-    except Exception:
-        # model not installed
-        logger.info(
-            "spaCy installed but model 'en_core_web_sm' not available; ML extraction disabled"
-        )
-        SPACY_AVAILABLE = False
-except Exception:
-    SPACY_AVAILABLE = False
+# spaCy itself is only imported when the model is first needed; this only
+# checks that it is installed. Set to False if the model fails to load.
+SPACY_AVAILABLE = importlib.util.find_spec("spacy") is not None
+_nlp = None
+_NLP_LOCK = threading.Lock()
 
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_YEAR_RE = re.compile(r"(19\d{2}|20\d{2})")
 
-def extract_entities_spacy(text: str) -> Dict[str, Any]:
-    """Extract a best-effort mapping from free text using spaCy NER.
 
-    Returns a dict with possible keys: name, email, dob, job_title, role, year_start, year_end, contract_type
-    """
+def get_nlp() -> Optional[Any]:
+    """The spaCy pipeline used for extraction, loaded on first use (None without spaCy/model)."""
+    global _nlp, SPACY_AVAILABLE
+    if _nlp is not None or not SPACY_AVAILABLE:
+        return _nlp
+    with _NLP_LOCK:
+        if _nlp is not None or not SPACY_AVAILABLE:
+            return _nlp
+        try:
+            import spacy  # type: ignore
+
+            # do not auto-download models here; user can install with `python -m spacy download en_core_web_sm`
+            nlp = spacy.load(SPACY_MODEL, exclude=list(_UNUSED_PIPES))
+            # the small English model's ner has its own embedding layer; the
+            # shared tok2vec only fed the components excluded above
+            if "tok2vec" in nlp.pipe_names:
+                listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", None)
+                if listeners is not None and "ner" not in listeners:
+                    nlp.disable_pipe("tok2vec")
+            _nlp = nlp
+        except Exception:
+            # model not installed
+            logger.info(
+                "spaCy installed but model 'en_core_web_sm' not available; ML extraction disabled"
+            )
+            SPACY_AVAILABLE = False
+    return _nlp
+
+
+def preload() -> threading.Thread:
+    """Load the spaCy model on a daemon thread so the first extraction does not wait for it."""
+    t = threading.Thread(target=get_nlp, name="ner-preload", daemon=True)
+    t.start()
+    return t
+
+
+def _entities_from_doc(doc: Any, text: str) -> Dict[str, Any]:
     out = {}
-    if not SPACY_AVAILABLE or _nlp is None:
-        return out
-    doc = _nlp(text)
     # collect common entities
     names = [ent.text for ent in doc.ents if ent.label_ in ("PERSON",)]
     orgs = [ent.text for ent in doc.ents if ent.label_ in ("ORG", "NORP")]
@@ -55,23 +83,34 @@ def extract_entities_spacy(text: str) -> Dict[str, Any]:
         out["dob"] = dates[0]
 
     # email regex
-    m = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", text)
+    m = _EMAIL_RE.search(text)
     if m:
         out["email"] = m.group(0)
 
     # year heuristics
-    y = re.search(r"(19\d{2}|20\d{2})", text)
+    y = _YEAR_RE.search(text)
     if y:
         out.setdefault("year_start", int(y.group(0)))
 
     return out
 
 
+def extract_entities_spacy(text: str) -> Dict[str, Any]:
+    """Extract a best-effort mapping from free text using spaCy NER.
+
+    Returns a dict with possible keys: name, email, dob, job_title, role, year_start, year_end, contract_type
+    """
+    nlp = get_nlp()
+    if nlp is None:
+        return {}
+    return _entities_from_doc(nlp(text), text)
+
+
 def extract_entities_fallback(text: str) -> Dict[str, Any]:
     """Conservative rule-based fallback for extracting a few fields from text."""
     out: Dict[str, Any] = {}
     # email
-    m = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", text)
+    m = _EMAIL_RE.search(text)
     if m:
         out["email"] = m.group(0)
     # name: look for lines like 'Name: John Doe'
@@ -87,7 +126,7 @@ def extract_entities_fallback(text: str) -> Dict[str, Any]:
 
 def extract_entities(text: str) -> Dict[str, Any]:
     """Public API: try spaCy, else fallback."""
-    if SPACY_AVAILABLE:
+    if get_nlp() is not None:
         try:
             return extract_entities_spacy(text)
         except Exception as e:
@@ -95,3 +134,23 @@ def extract_entities(text: str) -> Dict[str, Any]:
             return extract_entities_fallback(text)
     else:
         return extract_entities_fallback(text)
+
+
+def extract_entities_batch(
+    texts: Iterable[str], batch_size: int = 32, n_process: int = 1
+) -> List[Dict[str, Any]]:
+    """extract_entities for many texts, one result per text in the same order.
+
+    With spaCy the texts are streamed through nlp.pipe, which batches them
+    through the model (and with n_process > 1 spreads them over worker
+    processes) instead of running the whole pipeline once per text.
+    """
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is not None:
+        try:
+            docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+            return [_entities_from_doc(doc, text) for doc, text in zip(docs, texts)]
+        except Exception as e:
+            logger.exception("spaCy batch extraction failed: %s", e)
+    return [extract_entities_fallback(t) for t in texts]
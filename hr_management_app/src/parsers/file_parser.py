@@ -1,45 +1,137 @@
-from typing import Any, Dict, List
+"""Readers for the employee import files.
 
-import pandas as pd
+XLSX and CSV files are streamed: iter_excel_chunks / iter_csv_chunks yield
+lists of at most `chunk_size` row dicts, so a large file is never held in
+memory as a whole. parse_excel / parse_csv collect those chunks into one list
+for callers that want every row at once.
+
+A directory or .zip of .docx files (contracts, résumés) is read through
+iter_docx_sources / read_docx, which opens each document once for both its
+tables and its text.
+
+Row dicts map the stripped header text to the stripped cell text; empty cells
+are "" (the same values pandas' read_*(dtype=str).fillna("") produced).
+"""
+
+import csv
+import datetime
+import io
+import os
+import zipfile
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def _headers(row: Iterable[Any]) -> List[str]:
+    """Header cells as column names; blanks become "Unnamed: i", repeats "name.1" (like pandas)."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(row):
+        name = _cell_text(value) or f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _chunked_records(headers: List[str], rows: Iterable[Iterable[Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Turn value rows into lists of at most chunk_size dicts, skipping blank rows."""
+    chunk: List[Dict[str, Any]] = []
+    width = len(headers)
+    for row in rows:
+        values = [_cell_text(v) for v in islice(row, width)]
+        if not any(values):
+            continue
+        values.extend([""] * (width - len(values)))
+        chunk.append(dict(zip(headers, values)))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_excel_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, sheet: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Stream the first (or named) worksheet of an .xlsx file in chunks of row dicts.
+
+    Uses openpyxl's read-only mode, which parses the sheet XML as it goes.
+    Legacy .xls files are read through pandas (whole sheet) and chunked after.
+    """
+    if os.path.splitext(path)[1].lower() == ".xls":
+        import pandas as pd
+
+        df = pd.read_excel(path, dtype=str, sheet_name=sheet or 0)
+        yield from _chunked_records(_headers(df.columns), df.itertuples(index=False, name=None), chunk_size)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield from _chunked_records(_headers(header), rows, chunk_size)
+    finally:
+        wb.close()
+
+
+def iter_csv_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Stream a CSV file (UTF-8, optional BOM) in chunks of row dicts."""
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from _chunked_records(_headers(header), reader, chunk_size)
+
+
+def iter_file_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """iter_excel_chunks for .xlsx/.xls files, iter_csv_chunks for anything else."""
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm", ".xls"):
+        return iter_excel_chunks(path, chunk_size)
+    return iter_csv_chunks(path, chunk_size)
 
 
 def parse_excel(path: str) -> List[Dict[str, Any]]:
     """Read an Excel file and return list of row dicts (columns as-is)."""
-    xls = pd.read_excel(path, dtype=str)
-    records = []
-    for _, row in xls.fillna("").iterrows():
-        records.append(
-            {
-                str(k).strip(): (v.strip() if isinstance(v, str) else v)
-                for k, v in row.items()
-            }
-        )
-    return records
+    return [rec for chunk in iter_excel_chunks(path) for rec in chunk]
 
 
 def parse_csv(path: str) -> List[Dict[str, Any]]:
-    df = pd.read_csv(path, dtype=str)
-    records = []
-    for _, row in df.fillna("").iterrows():
-        records.append(
-            {
-                str(k).strip(): (v.strip() if isinstance(v, str) else v)
-                for k, v in row.items()
-            }
-        )
-    return records
+    return [rec for chunk in iter_csv_chunks(path) for rec in chunk]
 
 
-def parse_docx(path: str) -> List[Dict[str, Any]]:
-    """Very small docx parser: extract any tables and return rows; fallback to paragraphs.
-    Returns list of dicts where keys are column headers when a table is found.
-    """
+def _docx_document(source: Any) -> Any:
     try:
         import docx
     except Exception:
         raise RuntimeError("python-docx is required to parse .docx files")
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return docx.Document(source)
+
 
-    doc = docx.Document(path)
+def _docx_records(doc: Any) -> List[Dict[str, Any]]:
     records = []
     for table in doc.tables:
         # first row header
@@ -66,3 +158,68 @@ def parse_docx(path: str) -> List[Dict[str, Any]]:
     if current:
         records.append(current)
     return records
+
+
+def parse_docx(path: str) -> List[Dict[str, Any]]:
+    """Very small docx parser: extract any tables and return rows; fallback to paragraphs.
+    Returns list of dicts where keys are column headers when a table is found.
+    """
+    return _docx_records(_docx_document(path))
+
+
+def read_docx(source: Any) -> Tuple[List[Dict[str, Any]], str]:
+    """parse_docx plus the document's text, from a single open of the file.
+
+    `source` is a path, a file object or the bytes of a .docx. The text
+    (non-empty paragraphs joined by newlines) is only filled in when no
+    records were found, for entity extraction on free-form documents.
+    """
+    doc = _docx_document(source)
+    records = _docx_records(doc)
+    if records:
+        return records, ""
+    text = "\n".join(p.text for p in doc.paragraphs if p.text and p.text.strip())
+    return records, text
+
+
+def is_docx_bundle(path: str) -> bool:
+    """True for a directory or .zip archive to be imported as a set of .docx files."""
+    return os.path.isdir(path) or os.path.splitext(path)[1].lower() == ".zip"
+
+
+def _is_docx_name(name: str) -> bool:
+    base = os.path.basename(name)
+    # "~$" files are Word's lock files for documents that are open
+    return base.lower().endswith(".docx") and not base.startswith("~$")
+
+
+def iter_docx_sources(path: str) -> Iterator[Tuple[str, Any]]:
+    """(name, source) for every .docx in a directory tree or zip archive, sorted by name.
+
+    For a directory the source is the file path; for a zip it is the member's
+    bytes, or the exception raised reading it (a damaged member should not
+    stop the rest of the archive from being read).
+    """
+    if os.path.isdir(path):
+        found = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for f in files:
+                if _is_docx_name(f):
+                    full = os.path.join(root, f)
+                    found.append((os.path.relpath(full, path), full))
+        yield from sorted(found)
+        return
+
+    with zipfile.ZipFile(path) as zf:
+        members = sorted(
+            (i for i in zf.infolist() if not i.is_dir() and _is_docx_name(i.filename)
+             and not i.filename.startswith("__MACOSX/")),
+            key=lambda i: i.filename,
+        )
+        for info in members:
+            try:
+                data: Any = zf.read(info)
+            except Exception as exc:
+                data = exc
+            yield info.filename, data
@@ -1,5 +1,6 @@
 import re
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from dateutil import parser as dateparser
 
@@ -33,63 +34,121 @@ def _normalize_key(k: str) -> str:
     return k
 
 
+def _alias_tables() -> Tuple[Dict[str, str], List[str], Dict[str, str]]:
+    """(exact lookup, fuzzy choices, choice -> canonical) built from FIELD_ALIASES."""
+    exact: Dict[str, str] = {}
+    choices: List[str] = []
+    key_map: Dict[str, str] = {}
+    for canonical, aliases in FIELD_ALIASES.items():
+        # first canonical listing a name wins, like the original in-order scan
+        exact.setdefault(canonical, canonical)
+        choices.append(canonical)
+        key_map[canonical] = canonical
+        for a in aliases:
+            exact.setdefault(a, canonical)
+            choices.append(a)
+            key_map[a] = canonical
+    return exact, choices, key_map
+
+
+_EXACT, _CHOICES, _CHOICE_MAP = _alias_tables()
+
+
+def _match_key(nk: str, fuzzy_threshold: Optional[int]) -> Tuple[Optional[str], Optional[int]]:
+    """Canonical field for a normalized header and the fuzzy score (None for exact matches)."""
+    mapped = _EXACT.get(nk)
+    if mapped is not None:
+        return mapped, None
+    if fuzzy_threshold is None or fuzzy_threshold < 0:
+        return None, None
+    # try rapidfuzz first (if available)
+    if RAPIDFUZZ_AVAILABLE:
+        try:
+            fn = getattr(rf_process, "extractOne", None)
+            if callable(fn):
+                res = fn(nk, _CHOICES)
+                # rapidfuzz may return None or a sequence like (match, score, _)
+                if res and isinstance(res, (list, tuple)) and len(res) >= 2:
+                    try:
+                        sc = int(round(float(res[1])))
+                    except Exception:
+                        sc = None
+                    if sc is not None and sc >= fuzzy_threshold:
+                        mapped = _CHOICE_MAP.get(res[0])
+                        if mapped is not None:
+                            return mapped, sc
+        except Exception:
+            pass
+    # fallback to stdlib difflib for small typos or when rapidfuzz isn't available
+    best = None
+    best_score = -1
+    for choice in _CHOICES:
+        sc = int(round(difflib.SequenceMatcher(None, nk, choice).ratio() * 100))
+        if sc > best_score:
+            best_score = sc
+            best = choice
+    if best is not None and best_score >= fuzzy_threshold:
+        return _CHOICE_MAP.get(best), best_score
+    return None, None
+
+
+class ColumnMapper:
+    """Header -> canonical field mapping, resolved once for a whole file.
+
+    Every row of a file has the same headers, so the alias / fuzzy matching is
+    done here for the header row and map() is then one dict lookup per column.
+    `overrides` are saved header -> field choices (mapping_store "mappings");
+    they win over alias and fuzzy matching. Build instances through
+    get_column_mapper(), which caches them by header signature.
+    """
+
+    def __init__(
+        self,
+        headers: Iterable[Any],
+        fuzzy_threshold: Optional[int] = FUZZY_THRESHOLD,
+        overrides: Optional[Dict[str, str]] = None,
+    ) -> None:
+        overrides = overrides or {}
+        self.headers = tuple(headers)
+        self.fuzzy_threshold = fuzzy_threshold
+        # original header -> (canonical, score); score is None for exact / saved matches
+        self.debug: Dict[str, Tuple[Optional[str], Optional[int]]] = {}
+        pairs = []
+        for h in self.headers:
+            saved = overrides.get(str(h))
+            if saved in FIELD_ALIASES:
+                mapped, score = saved, None
+            else:
+                mapped, score = _match_key(_normalize_key(str(h)), fuzzy_threshold)
+            self.debug[str(h)] = (mapped, score)
+            if mapped:
+                pairs.append((h, mapped))
+        self._pairs = tuple(pairs)
+
+    def map(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Canonical-field dict for one row; when two headers map to one field the later wins."""
+        return {field: row[h] for h, field in self._pairs if h in row}
+
+
+@lru_cache(maxsize=128)
+def _cached_mapper(headers: Tuple[Any, ...], fuzzy_threshold: Optional[int], overrides: Tuple[Tuple[str, str], ...]) -> ColumnMapper:
+    return ColumnMapper(headers, fuzzy_threshold, dict(overrides))
+
+
+def get_column_mapper(
+    headers: Iterable[Any],
+    fuzzy_threshold: Optional[int] = FUZZY_THRESHOLD,
+    overrides: Optional[Dict[str, str]] = None,
+) -> ColumnMapper:
+    """ColumnMapper for these headers, shared across rows and imports with the same header signature."""
+    return _cached_mapper(tuple(headers), fuzzy_threshold, tuple(sorted((overrides or {}).items())))
+
+
 def map_columns(
     row: Dict[str, Any], fuzzy_threshold: int = FUZZY_THRESHOLD
 ) -> Dict[str, Any]:
     """Map input row keys to canonical field names. fuzzy_threshold controls minimum score for fuzzy matches."""
-    out = {}
-    for k, v in row.items():
-        nk = _normalize_key(str(k))
-        mapped = None
-        # exact match first
-        for canonical, aliases in FIELD_ALIASES.items():
-            if nk == canonical or nk in aliases:
-                mapped = canonical
-                break
-        # fuzzy match fallback: build choices/key_map first
-        if mapped is None and fuzzy_threshold is not None and fuzzy_threshold >= 0:
-            choices = []
-            key_map = {}
-            for canonical, aliases in FIELD_ALIASES.items():
-                choices.append(canonical)
-                key_map[canonical] = canonical
-                for a in aliases:
-                    choices.append(a)
-                    key_map[a] = canonical
-            # try rapidfuzz first (if available)
-            if RAPIDFUZZ_AVAILABLE:
-                try:
-                    fn = getattr(rf_process, "extractOne", None)
-                    if callable(fn):
-                        res = fn(nk, choices)
-                        # rapidfuzz may return None or a sequence like (match, score, _)
-                        if res and isinstance(res, (list, tuple)) and len(res) >= 2:
-                            score = res[1]
-                            try:
-                                sc_int = int(round(float(score)))
-                            except Exception:
-                                sc_int = None
-                            if sc_int is not None and sc_int >= fuzzy_threshold:
-                                match = res[0]
-                                mapped = key_map.get(match)
-                except Exception:
-                    mapped = None
-            # fallback to stdlib difflib for small typos or when rapidfuzz isn't available
-            if mapped is None:
-                best = None
-                best_score = -1
-                for choice in choices:
-                    score = int(
-                        round(difflib.SequenceMatcher(None, nk, choice).ratio() * 100)
-                    )
-                    if score > best_score:
-                        best_score = score
-                        best = choice
-                if best is not None and best_score >= fuzzy_threshold:
-                    mapped = key_map.get(best)
-        if mapped:
-            out[mapped] = v
-    return out
+    return get_column_mapper(row.keys(), fuzzy_threshold).map(row)
 
 
 def map_columns_debug(
@@ -98,64 +157,34 @@ def map_columns_debug(
     """Like map_columns but also return a debug map of original_key -> (canonical, score).
     Score is an int 0-100 when fuzzy matching was used, or None for exact matches.
     """
-    out = {}
-    debug = {}
-    for k, v in row.items():
-        nk = _normalize_key(str(k))
-        mapped = None
-        score = None
-        # exact match first
-        for canonical, aliases in FIELD_ALIASES.items():
-            if nk == canonical or nk in aliases:
-                mapped = canonical
-                score = None
-                break
-        # fuzzy match fallback: build choices/key_map first
-        if mapped is None and fuzzy_threshold is not None and fuzzy_threshold >= 0:
-            choices = []
-            key_map = {}
-            for canonical, aliases in FIELD_ALIASES.items():
-                choices.append(canonical)
-                key_map[canonical] = canonical
-                for a in aliases:
-                    choices.append(a)
-                    key_map[a] = canonical
-            if RAPIDFUZZ_AVAILABLE:
-                try:
-                    fn = getattr(rf_process, "extractOne", None)
-                    if callable(fn):
-                        res = fn(nk, choices)
-                        if res and isinstance(res, (list, tuple)) and len(res) >= 2:
-                            try:
-                                sc = int(round(float(res[1])))
-                            except Exception:
-                                sc = None
-                            if sc is not None and sc >= fuzzy_threshold:
-                                match = res[0]
-                                mapped = key_map.get(match)
-                                score = sc
-                except Exception:
-                    mapped = None
-            # difflib fallback when rapidfuzz not present or score low
-            if mapped is None:
-                best = None
-                best_score = -1
-                for choice in choices:
-                    sc = int(
-                        round(difflib.SequenceMatcher(None, nk, choice).ratio() * 100)
-                    )
-                    if sc > best_score:
-                        best_score = sc
-                        best = choice
-                if best is not None and best_score >= fuzzy_threshold:
-                    mapped = key_map.get(best)
-                    score = best_score
-        if mapped:
-            out[mapped] = v
-            debug[str(k)] = (mapped, score)
-        else:
-            debug[str(k)] = (None, None)
-    return out, debug
+    mapper = get_column_mapper(row.keys(), fuzzy_threshold)
+    return mapper.map(row), dict(mapper.debug)
+
+
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+# date spellings parsed in bulk: (full-match pattern, strptime format, prefix length).
+# Each is read the same way dateutil reads it (month before day); anything else,
+# or anything pandas cannot represent, goes through the memoized dateutil path.
+_FAST_DATE_FORMATS = (
+    # ISO, optionally with the midnight time spreadsheet date cells carry
+    (r"\d{4}-\d{2}-\d{2}(?: 00:00:00)?", "%Y-%m-%d", 10),
+    (r"\d{1,2}/\d{1,2}/\d{4}", "%m/%d/%Y", None),
+)
+# below this many dates the pandas round trip costs more than it saves
+_VECTORIZE_MIN = 256
+
+
+@lru_cache(maxsize=8192)
+def _parse_dob(text: str) -> Optional[str]:
+    """ISO date for a free-form date string, None when dateutil cannot parse it.
+
+    Memoized: import files repeat the same handful of date spellings a lot.
+    """
+    try:
+        d = dateparser.parse(text, dayfirst=False)
+        return d.date().isoformat()
+    except Exception:
+        return None
 
 
 def validate_and_clean(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
@@ -173,7 +202,7 @@ def validate_and_clean(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str
     email = record.get("email")
     if email:
         email = str(email).strip()
-        if re.match(r"[^@\s]+@[^@\s]+\.[^@\s]+", email):
+        if _EMAIL_RE.match(email):
             out["email"] = email
         else:
             problems.append("Invalid email")
@@ -183,12 +212,9 @@ def validate_and_clean(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str
     # dob
     dob = record.get("dob")
     if dob:
-        try:
-            d = dateparser.parse(str(dob), dayfirst=False)
-            out["dob"] = d.date().isoformat()
-        except Exception:
+        out["dob"] = _parse_dob(str(dob))
+        if out["dob"] is None:
             problems.append("Invalid dob")
-            out["dob"] = None
     else:
         out["dob"] = None
 
@@ -215,3 +241,114 @@ def validate_and_clean(record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str
     out["contract_type"] = record.get("contract_type") or None
 
     return out, problems
+
+
+def _batch_dobs(values: List[Any]) -> List[Optional[str]]:
+    """Column version of the dob step: common date spellings in bulk, the rest memoized."""
+    out: List[Optional[str]] = [None] * len(values)
+    filled = [i for i, v in enumerate(values) if v]
+    if len(filled) < _VECTORIZE_MIN:
+        for i in filled:
+            out[i] = _parse_dob(str(values[i]))
+        return out
+    import pandas as pd
+
+    col = pd.Series([str(values[i]) for i in filled], index=filled, dtype=object)
+    pending = pd.Series(True, index=filled)
+    for pattern, fmt, width in _FAST_DATE_FORMATS:
+        hit = pending & col.str.fullmatch(pattern)
+        if not hit.any():
+            continue
+        text = col[hit] if width is None else col[hit].str.slice(0, width)
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        iso = parsed.dt.strftime("%Y-%m-%d")
+        # keep only well-formed results (pandas drops the zero padding of years < 1000)
+        iso = iso[iso == text] if width is not None else iso[iso.str.len() == 10]
+        for i, ts in iso.items():
+            out[i] = ts
+        pending[iso.index] = False
+    for i in pending[pending].index.tolist():
+        out[i] = _parse_dob(col[i])
+    return out
+
+
+def _batch_years(values: List[Any]) -> List[Tuple[Optional[int], bool]]:
+    """Column version of the year step: (value, ok) per row.
+
+    A year column has a few dozen distinct values, so each one is coerced once
+    and the result reused for every row carrying it.
+    """
+    # keyed by type too: 2005 and 2005.0 are equal keys but coerce differently
+    seen: Dict[Tuple[type, Any], Tuple[Optional[int], bool]] = {}
+    out: List[Tuple[Optional[int], bool]] = []
+    append = out.append
+    for v in values:
+        if not v:
+            append((None, True))
+            continue
+        key = (type(v), v)
+        try:
+            append(seen[key])
+            continue
+        except (KeyError, TypeError):
+            pass
+        try:
+            res: Tuple[Optional[int], bool] = (int(str(v).strip()), True)
+        except Exception:
+            res = (None, False)
+        try:
+            seen[key] = res
+        except TypeError:
+            pass
+        append(res)
+    return out
+
+
+def validate_and_clean_batch(records: Sequence[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """validate_and_clean for a whole chunk of mapped records, column by column.
+
+    Emails use the precompiled pattern, ISO and M/D/YYYY dates are parsed in
+    bulk with pandas (other spellings through the memoized dateutil path), and
+    each distinct year value is coerced once.
+    Returns the same (cleaned, problems) pairs, in order, as calling
+    validate_and_clean on each record.
+    """
+    records = list(records)
+    dobs = _batch_dobs([r.get("dob") for r in records])
+    starts = _batch_years([r.get("year_start") for r in records])
+    ends = _batch_years([r.get("year_end") for r in records])
+    results = []
+    append = results.append
+    for rec, dob, (year_start, start_ok), (year_end, end_ok) in zip(records, dobs, starts, ends):
+        get = rec.get
+        problems = []
+        out = {}
+        name = get("name")
+        if name:
+            out["name"] = str(name).strip()
+        else:
+            problems.append("Missing name")
+        email = get("email")
+        if email:
+            email = str(email).strip()
+            if _EMAIL_RE.match(email):
+                out["email"] = email
+            else:
+                problems.append("Invalid email")
+        else:
+            out["email"] = None
+        out["dob"] = dob
+        if dob is None and get("dob"):
+            problems.append("Invalid dob")
+        out["job_title"] = get("job_title") or get("job") or None
+        role = get("role")
+        out["role"] = role.strip() if role else "engineer"
+        out["year_start"] = year_start
+        if not start_ok:
+            problems.append("Invalid year_start")
+        out["year_end"] = year_end
+        if not end_ok:
+            problems.append("Invalid year_end")
+        out["contract_type"] = get("contract_type") or None
+        append((out, problems))
+    return results
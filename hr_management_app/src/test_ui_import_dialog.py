@@ -66,6 +66,8 @@ def test_importdialog_load_and_import(tmp_path, monkeypatch):
     try:
         dlg.path_var.set(str(csv_path))
         dlg._load()
+        # parsing and validation run on the dialog's worker; wait for them
+        assert dlg.background.drain(timeout=30)
 
         # expect one record loaded and valid
         assert len(dlg.records) == 1
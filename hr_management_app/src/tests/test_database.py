@@ -7,13 +7,18 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from hr_management_app.src.database.database import (
+    bulk_import_employees,
     create_employee,
+    create_reset_token,
     create_user,
     get_employee_by_user,
     get_month_work_seconds,
     get_user_by_email,
     record_check_in,
     record_check_out,
+    reset_password_with_token,
+    user_must_reset,
+    verify_user,
 )
 
 
@@ -85,3 +90,36 @@ def test_create_employee_invalid_year():
     except ValueError:
         raised = True
     assert raised
+
+
+def test_bulk_import_employees():
+    existing = create_user("bulk_existing@example.com", "pw", role="engineer")
+    create_employee(existing, "Already Here", None, "Dev", "engineer", 2020, None, "contract")
+    records = [
+        {"email": "Bulk_A@example.com", "name": "A", "role": "engineer", "year_start": "2019"},
+        {"email": "bulk_b@example.com", "name": "B", "role": "driver", "year_start": 2021.0},
+        {"email": "bulk_existing@example.com", "name": "Dup of existing"},
+        {"email": "bulk_a@example.com", "name": "Dup within batch"},
+        {"email": None, "name": "No account"},
+        {"email": "bulk_bad@example.com", "name": "Bad role", "role": "pilot"},
+        {"email": "bulk_old@example.com", "name": "Bad year", "year_start": 1900},
+    ]
+    result = bulk_import_employees(records)
+    assert result["created_users"] == 2
+    assert result["created_employees"] == 3
+    assert result["skipped"] == 2
+    assert [i for i, _ in result["errors"]] == [5, 6]
+    # rejected records do not leave accounts behind
+    assert get_user_by_email("bulk_bad@example.com") is None
+
+    a = get_employee_by_user(get_user_by_email("bulk_a@example.com")[0])
+    b = get_employee_by_user(get_user_by_email("bulk_b@example.com")[0])
+    assert (a[3], a[7]) == ("A", 2019) and b[2] == a[2] + 1
+
+    # imported accounts have no password until it is reset
+    assert user_must_reset("bulk_a@example.com")
+    assert not verify_user("bulk_a@example.com", "")
+    token = create_reset_token("bulk_a@example.com")
+    assert reset_password_with_token(token, "new-pass")
+    assert verify_user("bulk_a@example.com", "new-pass")
+    assert not user_must_reset("bulk_a@example.com")
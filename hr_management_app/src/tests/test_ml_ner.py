@@ -9,3 +9,17 @@ def test_ner_fallback_extracts_email_and_name():
     out = extract_entities(text)
     assert out.get("email") == "bob.builder@example.com"
     assert "name" in out and out["name"].lower().startswith("bob")
+
+
+def test_ner_batch_matches_single_calls():
+    try:
+        from hr_management_app.src.ml.ner import extract_entities_batch
+    except Exception:
+        from ml.ner import extract_entities_batch  # type: ignore
+
+    texts = [
+        "Name: Bob Builder\nEmail: bob.builder@example.com\nDate of birth: 1980-01-01",
+        "",
+        "Contact ann@example.org, started 2015",
+    ]
+    assert extract_entities_batch(iter(texts), batch_size=2) == [extract_entities(t) for t in texts]
@@ -19,3 +19,40 @@ def test_map_and_validate():
     assert cleaned["role"] == "engineer"
     assert cleaned["year_start"] == 2010
     assert problems == []
+
+
+def test_column_mapper_resolves_headers_once():
+    from hr_management_app.src.parsers.normalizer import ColumnMapper, get_column_mapper
+
+    headers = ["Full_Name", "E-mail Adress", "Positon", "Notes", "Code"]
+    mapper = get_column_mapper(headers, overrides={"Code": "year_start"})
+    assert isinstance(mapper, ColumnMapper)
+    # same header signature -> same compiled mapper, across rows and imports
+    assert get_column_mapper(list(headers), overrides={"Code": "year_start"}) is mapper
+    assert mapper.debug["Notes"] == (None, None)
+    assert mapper.debug["Code"] == ("year_start", None)
+    row = dict(zip(headers, ["Ann Lee", "ann@example.com", "Welder", "n/a", "2012"]))
+    assert mapper.map(row) == {
+        "name": "Ann Lee",
+        "email": "ann@example.com",
+        "job_title": "Welder",
+        "year_start": "2012",
+    }
+    # map_columns goes through the same cached mapping
+    assert map_columns({"Positon": "Welder"}) == {"job_title": "Welder"}
+
+
+def test_validate_and_clean_batch_matches_per_row():
+    from hr_management_app.src.parsers.normalizer import validate_and_clean_batch
+
+    samples = [
+        {"name": "Ann", "email": "ann@example.com", "dob": "1990-02-03", "year_start": "2010"},
+        {"name": "Bo", "dob": "1990-02-30", "year_start": 2011, "year_end": "soon"},
+        {"name": "", "email": "not-an-email", "dob": "3/4/1990", "role": " hr "},
+        {"name": "Cy", "dob": "13/04/1990", "year_start": 2005.0, "job": "Welder"},
+        {"name": "Di", "dob": "4 March 1990 00:00:00", "year_end": True, "contract_type": ""},
+        {"name": "Ed", "dob": "0000-01-01", "year_start": " 2001 "},
+    ]
+    # enough rows to take the bulk (pandas) date path as well as the small one
+    for records in (samples, samples * 100):
+        assert validate_and_clean_batch(records) == [validate_and_clean(r) for r in records]
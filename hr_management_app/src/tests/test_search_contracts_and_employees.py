@@ -58,3 +58,113 @@ def test_employee_search_basic():
         assert any(r[2] == 1002 for r in res2)
     finally:
         teardown_test_db(path)
+
+
+def test_list_employees_page_keyset():
+    with _conn() as conn:
+        c = conn.cursor()
+        rows = [(None if i % 7 == 0 else 2000 + i, f"Emp {i % 4}", "Engineer" if i % 2 else "Driver", "engineer") for i in range(45)]
+        c.executemany("INSERT INTO employees (employee_number, name, job_title, role) VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+
+    for order in ("employee_number", "name", "id"):
+        seen, key, pages = [], None, 0
+        while True:
+            page, key = database.list_employees_page(key, page_size=10, order_by=order)
+            assert len(page) <= 10
+            seen.extend(page)
+            pages += 1
+            if key is None:
+                break
+        assert pages == 5
+        # every employee exactly once, in the requested order (NULLs first, ties by id)
+        assert len({r[0] for r in seen}) == 45
+        col = {"employee_number": 2, "name": 3, "id": 0}[order]
+        sort_keys = [(r[col] is not None, r[col] if r[col] is not None else 0, r[0]) for r in seen]
+        assert sort_keys == sorted(sort_keys)
+
+    drivers, key = database.list_employees_page(page_size=100, filters={"job_title": "Driver"})
+    assert key is None and len(drivers) == 23
+    found, _ = database.list_employees_page(filters={"search": "2005"})
+    assert [r[2] for r in found] == [2005]
+
+
+def test_employee_search_fts_prefix_and_ranking():
+    with _conn() as conn:
+        c = conn.cursor()
+        c.executemany(
+            "INSERT INTO employees (employee_number, name, job_title, role) VALUES (?, ?, ?, ?)",
+            [
+                (3001, "Alice Smith", "Engineer", "engineer"),
+                (3002, "Alicia Smithers", "Smith", "engineer"),
+                (3003, "Bob Stone", "Driver", "driver"),
+            ],
+        )
+        conn.commit()
+        assert c.execute("SELECT name FROM sqlite_master WHERE name='employees_fts'").fetchone()
+
+    # every word is a prefix; words are ANDed
+    assert {r[3] for r in database.search_employees("ali smi")} == {"Alice Smith", "Alicia Smithers"}
+    # "smith" matches name and job title of the second row, so it ranks first
+    assert database.search_employees("smith")[0][3] == "Alicia Smithers"
+    # FTS syntax typed by the user is treated as plain text
+    assert database.search_employees('bob" OR "x') == []
+    # the index follows updates
+    with _conn() as conn:
+        conn.execute("UPDATE employees SET name = 'Robert Stone' WHERE employee_number = 3003")
+        conn.commit()
+    assert database.search_employees("bob") == []
+    assert [r[2] for r in database.search_employees("rob")] == [3003]
+    page, _ = database.list_employees_page(filters={"search": "ali", "role": "engineer"})
+    assert [r[2] for r in page] == [3001, 3002]
+
+
+def test_employee_search_like_fallback_without_fts(monkeypatch):
+    with _conn() as conn:
+        conn.execute("INSERT INTO employees (employee_number, name, job_title, role) VALUES (4001, 'Carol King', 'Clerk', 'clerk')")
+        conn.commit()
+    # behave like a SQLite build without FTS5
+    monkeypatch.setattr(database, "_has_employees_fts", lambda c: False)
+    # substring semantics of the LIKE path
+    assert [r[2] for r in database.search_employees("aro")] == [4001]
+    page, _ = database.list_employees_page(filters={"search": "ing"})
+    assert [r[2] for r in page] == [4001]
+
+
+def test_contract_search_page_ranked_with_snippets():
+    with _conn() as conn:
+        c = conn.cursor()
+        c.executemany(
+            "INSERT INTO contracts (id, construction_id, area, terms) VALUES (?, ?, ?, ?)",
+            [
+                (10, 77, "North", "Roof repair on the warehouse, roofing felt supplied by client"),
+                (11, 78, "South", "Window cleaning; roof access only"),
+                (12, 10, "Roofton", "Painting"),
+            ]
+            + [(100 + i, 900 + i, "East", f"Roof tiles batch {i}") for i in range(30)],
+        )
+        conn.commit()
+
+    rows, total = database.search_contracts_page("roof", page_size=10)
+    assert total == 33 and len(rows) == 10
+    # bm25: the double mention and the short "Roofton" area rank above the 30 bulk rows
+    assert {r[0] for r in rows[:2]} == {10, 12}
+    snippets = {r[0]: r[12] for r in rows}
+    assert snippets[10] == "[Roof] repair on the warehouse, [roofing] felt supplied by client"
+    rest, _ = database.search_contracts_page("roof", page=4, page_size=10)
+    assert len(rest) == 3
+    all_ids = [r[0] for p in range(1, 5) for r in database.search_contracts_page("roof", page=p, page_size=10)[0]]
+    assert len(set(all_ids)) == 33
+
+    # numeric terms: exact id / construction_id hits first, without snippet
+    rows, total = database.search_contracts_page("10")
+    assert rows[0][0] in (10, 12) and rows[0][12] is None
+    assert {r[0] for r in rows[:2]} == {10, 12}
+
+    # FTS syntax and punctuation are plain text, not a LIKE fallback
+    assert [r[0] for r in database.search_contracts('"roof" (window* -')] == [11]
+    assert database.search_contracts_page("---") == ([], 0)
+    # soft-deleted rows are excluded unless asked for
+    database.soft_delete_contract(11)
+    assert 11 not in [r[0] for r in database.search_contracts("window")]
+    assert [r[0] for r in database.search_contracts("window", include_deleted=True)] == [11]
@@ -5,29 +5,32 @@ dialogs used by the main GUI. This is intentionally small and easy to
 unit-test.
 """
 
+import itertools
 import logging
 import os
-import secrets
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-from hr_management_app.src.parsers.file_parser import parse_csv, parse_docx, parse_excel
-from hr_management_app.src.parsers.mapping_store import load_config, save_config
-from hr_management_app.src.parsers.normalizer import (
-    FUZZY_THRESHOLD,
-    map_columns,
-    validate_and_clean,
+from hr_management_app.src.import_pipeline import (
+    LOAD_CHUNK_SIZE,
+    collect_db_stats,
+    default_workers,
+    heuristic_imputations,
+    imputer_model_path,
+    iter_prepared_chunks,
+    open_import,
+    warm_imputer_model,
+    warm_ner_model,
 )
-
-try:
-    from hr_management_app.src.ml.ner import extract_entities
-except Exception:
-    from ml.ner import extract_entities  # type: ignore
+from hr_management_app.src.parsers.file_parser import is_docx_bundle
+from hr_management_app.src.parsers.mapping_store import load_config, save_config
+from hr_management_app.src.parsers.normalizer import FUZZY_THRESHOLD, validate_and_clean
+from hr_management_app.src.ui_tasks import TkExecutor
 
 from hr_management_app.src.database.database import (
-    create_employee,
-    create_user,
-    get_user_by_email,
+    bulk_import_employees,
+    new_import_session_id,
+    record_imputation_audits,
 )
 
 try:
@@ -35,7 +38,6 @@ try:
 except Exception:
     from ml.imputer import infer_missing_fields  # type: ignore
 
-from hr_management_app.src.database.database import get_all_users
 
 # optional ML imputer (load if model artifact exists)
 try:
@@ -50,25 +52,32 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
-def _collect_db_stats() -> dict:
-    """Collect lightweight stats from users/employees to help imputation."""
-    stats = {}
-    try:
-        users = get_all_users()
-        emails = [u[1] for u in users if u and u[1]]
-        stats["emails"] = emails
-    except Exception:
-        stats["emails"] = []
-    return stats
+_collect_db_stats = collect_db_stats
 
 
-def _safe_int(val):
+def _load_events(first, rest, cfg, pool: bool = True):
+    """Worker side of ImportDialog._load: yields ("rows", records) per chunk,
+    then ("imputed", {index: {field: value}}) from the heuristic imputer."""
+    # files bigger than one chunk are mapped/validated on the process pool
+    # (pool=False: a .docx bundle, whose parsing has its own pool)
+    workers = default_workers() if pool and len(first) >= LOAD_CHUNK_SIZE else 1
+    records = []
+    prepared = iter_prepared_chunks(
+        (raws for raws in itertools.chain([first], rest) if raws),
+        cfg,
+        workers=workers,
+        model_path=imputer_model_path(),
+    )
+    try:
+        for chunk in prepared:
+            records.extend(chunk)
+            yield ("rows", chunk)
+    finally:
+        prepared.close()
     try:
-        if val is None or val == "":
-            return None
-        return int(val)
+        yield ("imputed", heuristic_imputations(records, _collect_db_stats()))
     except Exception:
-        return None
+        logger.exception("Imputation failed; continuing without imputation")
 
 
 class ImportDialog(tk.Toplevel):
@@ -85,7 +94,18 @@ class ImportDialog(tk.Toplevel):
 
         self.path_var = tk.StringVar()
         self.records = []
+        # (file, message) for documents of a folder/zip import that were skipped
+        self._file_errors = []
+        self._docx_bundle = False
+        # groups the imputation audit rows of the current load
+        self.import_session_id = new_import_session_id()
+        self._loading = False
+        # parsing, validation and imputation run here, off the Tk thread
+        self.background = TkExecutor(self, max_workers=1)
+        # unpickling the model (and importing sklearn) takes seconds; start now
+        warm_imputer_model()
         self._build()
+        self.bind("<Destroy>", self._on_destroy)
 
     def _build(self):
         frm = ttk.Frame(self, padding=8)
@@ -99,7 +119,15 @@ class ImportDialog(tk.Toplevel):
         ttk.Button(top, text="Browse...", command=self._choose).pack(
             side="left", padx=6
         )
-        ttk.Button(top, text="Load", command=self._load).pack(side="left")
+        ttk.Button(top, text="Folder...", command=self._choose_folder).pack(
+            side="left", padx=(0, 6)
+        )
+        self.load_btn = ttk.Button(top, text="Load", command=self._load)
+        self.load_btn.pack(side="left")
+        self.cancel_btn = ttk.Button(
+            top, text="Cancel", command=self._cancel_load, state="disabled"
+        )
+        self.cancel_btn.pack(side="left", padx=(6, 0))
 
         cols = (
             "#",
@@ -120,8 +148,12 @@ class ImportDialog(tk.Toplevel):
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<Double-1>", self._on_edit_row)
 
-        self.status = ttk.Label(frm, text="No file loaded.")
-        self.status.pack(fill="x", pady=(6, 0))
+        status_row = ttk.Frame(frm)
+        status_row.pack(fill="x", pady=(6, 0))
+        self.status = ttk.Label(status_row, text="No file loaded.")
+        self.status.pack(side="left", fill="x", expand=True)
+        self.progress = ttk.Progressbar(status_row, mode="indeterminate", length=160)
+        self.progress.pack(side="right")
 
         btns = ttk.Frame(frm)
         btns.pack(fill="x", pady=6)
@@ -149,52 +181,53 @@ class ImportDialog(tk.Toplevel):
                 ("CSV", "*.csv"),
                 ("Excel", "*.xlsx;*.xls"),
                 ("Word", "*.docx"),
+                ("Zip of Word documents", "*.zip"),
                 ("All", "*.*"),
             ],
             parent=self,
         )
         if p:
             self.path_var.set(p)
+            if p.lower().endswith((".docx", ".zip")):
+                # entity extraction for free-text documents needs the spaCy model
+                warm_ner_model()
+
+    def _choose_folder(self):
+        p = filedialog.askdirectory(title="Select a folder of .docx files", parent=self)
+        if p:
+            self.path_var.set(p)
+            warm_ner_model()
 
     def _load(self):
         path = self.path_var.get().strip()
         if not path or not os.path.exists(path):
             messagebox.showerror(
-                "File missing", "Please select a valid file.", parent=self
+                "File missing", "Please select a valid file or folder.", parent=self
             )
             return
 
-        ext = os.path.splitext(path)[1].lower()
-        try:
-            if ext == ".csv":
-                raws = parse_csv(path)
-            elif ext in (".xlsx", ".xls"):
-                raws = parse_excel(path)
-            elif ext == ".docx":
-                raws = parse_docx(path)
-                if not raws:
-                    try:
-                        import docx as _docx
-
-                        doc = _docx.Document(path)
-                        text = "\n".join(
-                            p.text for p in doc.paragraphs if p.text and p.text.strip()
-                        )
-                        if text:
-                            ent = extract_entities(text)
-                            if ent:
-                                raws = [ent]
-                    except Exception:
-                        logger.debug("docx fallback failed", exc_info=True)
-            else:
-                raws = parse_csv(path)
-        except Exception as e:
-            logger.exception("Failed to parse file: %s", e)
-            messagebox.showerror(
-                "Parse error", f"Failed to parse file: {e}", parent=self
-            )
-            return
+        self.records = []
+        self._file_errors = []
+        self._docx_bundle = is_docx_bundle(path)
+        self.import_session_id = new_import_session_id()
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        self._set_loading(True)
+        self.status.config(text="Reading file...")
+        # the first chunk is read off the UI thread too (workbooks can be slow
+        # to open); the mapping preview is shown once it arrives
+        self.background.submit(
+            open_import,
+            path,
+            LOAD_CHUNK_SIZE,
+            self._file_errors,
+            on_done=self._on_first_chunk,
+            on_error=self._on_load_failed,
+            key="load",
+        )
 
+    def _on_first_chunk(self, opened):
+        raws, rest = opened
         cfg = load_config() or {}
 
         # mapping preview (optional helper)
@@ -227,79 +260,113 @@ class ImportDialog(tk.Toplevel):
                             cfg["mappings"][k] = v[0]
                     cfg["threshold"] = dlg.threshold
                     save_config(cfg)
-                    for rec in raws:
-                        for orig, pair in mapping.items():
-                            mapped_field = pair[0] if pair else None
-                            if mapped_field and orig in rec:
-                                rec[mapped_field] = rec.pop(orig)
 
-        self.records = []
-        cleaned_batch = []
-        for r in raws:
-            mapped = map_columns(
-                r, fuzzy_threshold=cfg.get("threshold", FUZZY_THRESHOLD)
+        self.background.stream(
+            _load_events,
+            raws,
+            rest,
+            cfg,
+            not self._docx_bundle,
+            on_item=self._on_load_event,
+            on_done=self._on_load_finished,
+            on_error=self._on_load_failed,
+            key="load",
+        )
+
+    def _on_load_event(self, event):
+        kind, payload = event
+        if kind == "rows":
+            start = len(self.records)
+            self.records.extend(payload)
+            for idx in range(start, len(self.records)):
+                self.tree.insert(
+                    "", "end", iid=str(idx + 1), values=self._row_values(idx)
+                )
+            self.status.config(
+                text=f"Loaded {len(self.records)} records so far (still reading)..."
             )
-            cleaned, problems = validate_and_clean(mapped)
-            cleaned_batch.append(cleaned)
-            self.records.append(
-                {"raw": r, "mapped": mapped, "cleaned": cleaned, "problems": problems}
+        elif kind == "imputed":
+            # heuristic values only fill fields that are still missing (the user
+            # may have edited rows while the file was loading)
+            for idx, filled in payload.items():
+                cleaned = self.records[idx]["cleaned"]
+                for k, v in filled.items():
+                    if cleaned.get(k) in (None, ""):
+                        cleaned[k] = v
+                self.tree.item(str(idx + 1), values=self._row_values(idx))
+
+    def _on_load_finished(self, _events):
+        self._set_loading(False)
+        self.status.config(
+            text=f"Loaded {len(self.records)} records. Review and click Import Selected or Import All."
+        )
+        if self._file_errors:
+            skipped = len(self._file_errors)
+            self.status.config(
+                text=f"Loaded {len(self.records)} records; {skipped} file(s) skipped."
+            )
+            lines = [f"{name}: {msg}" for name, msg in self._file_errors[:20]]
+            if skipped > 20:
+                lines.append(f"... and {skipped - 20} more")
+            messagebox.showwarning(
+                "Some files were skipped", "\n".join(lines), parent=self
             )
 
-        # first try ML imputation if model present
-        try:
-            if callable(load_model) and callable(predict_batch):
-                model = load_model()
-                if model:
-                    cleaned_batch = predict_batch(cleaned_batch, model)
-                    # copy ML-predicted values back into records
-                    for rec, imp in zip(self.records, cleaned_batch):
-                        rec["cleaned"].update(
-                            {k: v for k, v in imp.items() if v is not None}
-                        )
-        except Exception:
-            logger.exception("ML imputation failed; falling back to heuristics")
+    def _on_load_failed(self, e):
+        self._set_loading(False)
+        logger.error("Failed to parse file: %s", e, exc_info=e)
+        self.status.config(text=f"Loading failed after {len(self.records)} records.")
+        messagebox.showerror("Parse error", f"Failed to parse file: {e}", parent=self)
 
-        # perform lightweight heuristic imputation for any remaining missing fields
-        try:
-            db_stats = _collect_db_stats()
-            imputed = infer_missing_fields(
-                [rec["cleaned"] for rec in self.records], db_stats=db_stats
-            )
-            # copy imputed values back into records (only override fields that were missing)
-            for rec, imp in zip(self.records, imputed):
-                for k, v in imp.items():
-                    if rec["cleaned"].get(k) in (None, "") and v is not None:
-                        rec["cleaned"][k] = v
-        except Exception:
-            logger.exception("Imputation failed; continuing without imputation")
+    def _cancel_load(self):
+        if not self._loading:
+            return
+        self.background.cancel("load")
+        self._set_loading(False)
+        self.status.config(
+            text=f"Loading cancelled; {len(self.records)} records loaded."
+        )
 
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for idx, rec in enumerate(self.records, start=1):
-            c = rec["cleaned"]
-            problems = ", ".join(rec["problems"]) if rec["problems"] else ""
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    idx,
-                    c.get("name"),
-                    c.get("email"),
-                    c.get("dob"),
-                    c.get("job_title"),
-                    c.get("role"),
-                    c.get("year_start"),
-                    c.get("year_end"),
-                    c.get("contract_type"),
-                    problems,
-                ),
+    def _set_loading(self, loading: bool):
+        self._loading = loading
+        self.load_btn.config(state="disabled" if loading else "normal")
+        self.cancel_btn.config(state="normal" if loading else "disabled")
+        if loading:
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+
+    def _still_loading(self) -> bool:
+        if self._loading:
+            messagebox.showinfo(
+                "Loading", "Wait for the file to finish loading, or cancel it.", parent=self
             )
+        return self._loading
 
-        self.status.config(
-            text=f"Loaded {len(self.records)} records. Review and click Import Selected or Import All."
+    def _row_values(self, idx):
+        rec = self.records[idx]
+        c = rec["cleaned"]
+        problems = ", ".join(rec["problems"]) if rec["problems"] else ""
+        return (
+            idx + 1,
+            c.get("name"),
+            c.get("email"),
+            c.get("dob"),
+            c.get("job_title"),
+            c.get("role"),
+            c.get("year_start"),
+            c.get("year_end"),
+            c.get("contract_type"),
+            problems,
         )
 
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.background.shutdown()
+
     def import_selected(self):
+        if self._still_loading():
+            return
         sel = self.tree.selection()
         if not sel:
             messagebox.showinfo(
@@ -320,39 +387,19 @@ class ImportDialog(tk.Toplevel):
         if idx < 0 or idx >= len(self.records):
             return
         EditRowDialog(self, idx, self.records[idx])
-        rec = self.records[idx]
-        c = rec["cleaned"]
-        problems = ", ".join(rec["problems"]) if rec["problems"] else ""
-        for item in self.tree.get_children():
-            vals = self.tree.item(item)["values"]
-            try:
-                if int(vals[0]) - 1 == idx:
-                    self.tree.item(
-                        item,
-                        values=(
-                            idx + 1,
-                            c.get("name"),
-                            c.get("email"),
-                            c.get("dob"),
-                            c.get("job_title"),
-                            c.get("role"),
-                            c.get("year_start"),
-                            c.get("year_end"),
-                            c.get("contract_type"),
-                            problems,
-                        ),
-                    )
-                    break
-            except Exception:
-                continue
+        self.tree.item(str(idx + 1), values=self._row_values(idx))
 
     def import_all(self):
+        if self._still_loading():
+            return
         if not self.records:
             messagebox.showinfo("No data", "Load a file first.", parent=self)
             return
         self._do_import(list(range(len(self.records))))
 
     def preview_imputations(self):
+        if self._still_loading():
+            return
         if not self.records:
             messagebox.showinfo("No data", "Load a file first.", parent=self)
             return
@@ -422,142 +469,66 @@ class ImportDialog(tk.Toplevel):
         # apply accepted field-level proposals (dlg.accepted_map -> {row_idx: {field: value}})
         accepted_map = getattr(dlg, "accepted_map", None)
         if accepted_map:
+            audits = []
+            changed = []
             for idx, fields in accepted_map.items():
                 if idx < 0 or idx >= len(self.records):
                     continue
+                # determine source: check proposal meta for confidences
+                src = "preview"
+                meta = proposals[idx].get("meta", {}) if idx < len(proposals) else {}
+                if meta.get("job_conf") is not None:
+                    src = f"ml_conf_{meta.get('job_conf'):.2f}"
+                elif meta.get("heur_conf"):
+                    src = "heuristic"
+                cleaned = self.records[idx]["cleaned"]
                 for field, val in fields.items():
-                    try:
-                        # only apply if missing or empty
-                        if (
-                            self.records[idx]["cleaned"].get(field) in (None, "")
-                            and val is not None
-                            and val != ""
-                        ):
-                            old = self.records[idx]["cleaned"].get(field)
-                            self.records[idx]["cleaned"][field] = val
-                            # record audit (best-effort; don't fail import on audit error)
-                            try:
-                                from hr_management_app.src.database.database import (
-                                    record_imputation_audit,
-                                )
-
-                                # determine source: check proposal meta for confidences
-                                src = "preview"
-                                meta = (
-                                    proposals[idx].get("meta", {})
-                                    if idx < len(proposals)
-                                    else {}
-                                )
-                                if meta.get("job_conf") is not None:
-                                    src = f"ml_conf_{meta.get('job_conf'):.2f}"
-                                elif meta.get("heur_conf"):
-                                    src = "heuristic"
-                                record_imputation_audit(
-                                    row_index=idx,
-                                    field=field,
-                                    old_value=str(old) if old is not None else None,
-                                    new_value=str(val),
-                                    source=src,
-                                )
-                            except Exception:
-                                logger.exception(
-                                    "Failed to record imputation audit for row %s field %s",
-                                    idx,
-                                    field,
-                                )
-                    except Exception:
-                        continue
-            # refresh tree view
-            for item in self.tree.get_children():
-                vals = self.tree.item(item)["values"]
-                try:
-                    idx = int(vals[0]) - 1
-                except Exception:
-                    continue
-                rec = self.records[idx]
-                c = rec["cleaned"]
-                problems = ", ".join(rec["problems"]) if rec["problems"] else ""
-                self.tree.item(
-                    item,
-                    values=(
-                        idx + 1,
-                        c.get("name"),
-                        c.get("email"),
-                        c.get("dob"),
-                        c.get("job_title"),
-                        c.get("role"),
-                        c.get("year_start"),
-                        c.get("year_end"),
-                        c.get("contract_type"),
-                        problems,
-                    ),
-                )
+                    # only apply if missing or empty
+                    if cleaned.get(field) in (None, "") and val is not None and val != "":
+                        old = cleaned.get(field)
+                        cleaned[field] = val
+                        audits.append(
+                            {
+                                "row_index": idx,
+                                "field": field,
+                                "old_value": str(old) if old is not None else None,
+                                "new_value": str(val),
+                                "source": src,
+                            }
+                        )
+                        changed.append(idx)
+            # one transaction for the whole accepted set (best-effort; the
+            # import does not depend on it)
+            if audits:
+                record_imputation_audits(audits, import_session_id=self.import_session_id)
+            # refresh the rows that changed
+            for idx in sorted(set(changed)):
+                if self.tree.exists(str(idx + 1)):
+                    self.tree.item(str(idx + 1), values=self._row_values(idx))
 
     def _do_import(self, indices):
-        created = 0
         skipped = 0
         errors = []
-
-        # create users where needed
+        batch = []
+        batch_rows = []
         for i in indices:
             rec = self.records[i]
-            cleaned = rec.get("cleaned") or {}
-            problems = rec.get("problems") or []
-            if problems:
+            if rec.get("problems"):
                 skipped += 1
                 continue
-            email = cleaned.get("email")
-            try:
-                if email:
-                    existing = get_user_by_email(email)
-                    if existing:
-                        pass
-                    else:
-                        pwd = secrets.token_urlsafe(8)
-                        create_user(email, pwd)
-            except Exception as e:
-                logger.exception("User create failed: %s", e)
-                errors.append(str(e))
-
-        # create employee rows
-        for i in indices:
-            rec = self.records[i]
-            cleaned = rec.get("cleaned") or {}
-            problems = rec.get("problems") or []
-            if problems:
-                continue
-            try:
-                email = cleaned.get("email")
-                user = get_user_by_email(email) if email else None
-                # use None for missing users so the employees.user_id column stores NULL
-                # rather than 0 which would violate the UNIQUE constraint when repeated
-                uid = user[0] if user else None
-                ys = _safe_int(cleaned.get("year_start"))
-                ye = _safe_int(cleaned.get("year_end"))
-                # if a user exists and already has an employee, skip to avoid duplicate
-                if uid is not None:
-                    from hr_management_app.src.database.database import (
-                        get_employee_by_user,
-                    )
-
-                    if get_employee_by_user(uid):
-                        skipped += 1
-                        continue
-                create_employee(
-                    user_id=uid,
-                    name=str(cleaned.get("name") or ""),
-                    dob=str(cleaned.get("dob") or ""),
-                    job_title=str(cleaned.get("job_title") or ""),
-                    role=str(cleaned.get("role") or ""),
-                    year_start=ys,
-                    profile_pic=None,
-                    contract_type=str(cleaned.get("contract_type") or ""),
-                    year_end=ye,
-                )
-                created += 1
-            except Exception as e:
-                logger.exception("Employee create failed: %s", e)
-                errors.append(str(e))
+            batch.append(rec.get("cleaned") or {})
+            batch_rows.append(i)
+
+        created = 0
+        try:
+            # one transaction: no per-row connections or password hashing
+            result = bulk_import_employees(batch)
+            created = result["created_employees"]
+            skipped += result["skipped"]
+            errors.extend(f"Row {batch_rows[idx] + 1}: {msg}" for idx, msg in result["errors"])
+        except Exception as e:
+            logger.exception("Bulk import failed: %s", e)
+            errors.append(str(e))
 
         summary = f"Imported: {created}\nSkipped (validation): {skipped}\nErrors: {len(errors)}"
         if errors:
@@ -586,8 +557,9 @@ class ImportDialog(tk.Toplevel):
 
     def export_audit_csv(self):
         try:
+            from hr_management_app.src.database.audit_export import export_audit
             from hr_management_app.src.database.database import (
-                export_imputation_audit_csv,
+                IMPUTATION_AUDIT_CSV_COLUMNS,
             )
         except Exception:
             messagebox.showerror(
@@ -595,24 +567,53 @@ class ImportDialog(tk.Toplevel):
             )
             return
         p = filedialog.asksaveasfilename(
-            title="Export imputation audit to CSV",
+            title="Export imputation audit",
             defaultextension=".csv",
-            filetypes=[("CSV", "*.csv")],
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("CSV (gzip)", "*.csv.gz"),
+                ("JSON Lines", "*.jsonl"),
+                ("JSON Lines (gzip)", "*.jsonl.gz"),
+            ],
             parent=self,
         )
         if not p:
             return
-        try:
-            n = export_imputation_audit_csv(p)
+        session = None
+        if self.records and messagebox.askyesno(
+            "Export",
+            "Export only the audit rows of the current import?\n"
+            "(No exports the whole audit table.)",
+            parent=self,
+        ):
+            session = self.import_session_id
+        self.status.config(text="Exporting audit...")
+
+        def _done(n):
+            self.status.config(text=f"Exported {n} audit rows")
             messagebox.showinfo(
                 "Export", f"Exported {n} audit rows to {p}", parent=self
             )
-        except Exception as e:
-            logger.exception("Failed to export audit CSV: %s", e)
+
+        def _failed(e):
+            logger.error("Failed to export audit: %s", e, exc_info=e)
+            self.status.config(text="Audit export failed")
             messagebox.showerror(
-                "Export failed", f"Failed to export audit CSV: {e}", parent=self
+                "Export failed", f"Failed to export audit: {e}", parent=self
             )
 
+        # streamed off the UI thread; large audit tables take a while
+        self.background.submit(
+            export_audit,
+            p,
+            ["imputation_audit"],
+            import_session_id=session,
+            columns=IMPUTATION_AUDIT_CSV_COLUMNS,
+            on_done=_done,
+            on_error=_failed,
+            key="export",
+        )
+
     def center_window(self):
         self.update_idletasks()
         w = self.winfo_width() or 880
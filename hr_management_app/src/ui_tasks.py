@@ -0,0 +1,244 @@
+"""Run blocking work (DB queries) off the Tk thread.
+
+Tk widgets must only be touched from the thread running the mainloop, so
+worker threads never call back into Tk directly: they put their result on a
+queue that the UI thread drains with ``after()`` and then invokes the
+``on_done`` / ``on_error`` callbacks there.
+
+Usage::
+
+    self.background = TkExecutor(self, on_busy=self._set_busy)
+    self.background.submit(list_pending_contracts, on_done=self._fill, key="pending")
+
+Submitting with a ``key`` supersedes the previous task with the same key: its
+result is dropped (and it does not run at all if it had not started yet), so a
+new search replaces an in-flight one.
+
+Long jobs that produce results as they go (e.g. reading an import file chunk
+by chunk) use ``stream()``: every item the generator yields is handed to
+``on_item`` on the Tk thread, and cancelling stops the generator at its next
+``yield``.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SKIPPED = object()
+# time one poll may spend delivering results before yielding back to Tk
+_POLL_BUDGET = 0.05
+
+
+class _Item:
+    """One value yielded by a streamed task (as opposed to its final result)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class BackgroundTask:
+    """Handle for a submitted call; cancel() drops its result."""
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class TkExecutor:
+    """Small thread pool whose results are delivered on the Tk thread."""
+
+    def __init__(
+        self,
+        root,
+        max_workers: int = 4,
+        poll_ms: int = 25,
+        on_busy: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tk-bg")
+        self._results: "queue.Queue" = queue.Queue()
+        self._latest: Dict[str, BackgroundTask] = {}
+        self._pending = 0
+        self._polling = False
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        key: Optional[str] = None,
+        **kwargs,
+    ) -> BackgroundTask:
+        """Run fn(*args, **kwargs) on a worker. Must be called from the Tk thread."""
+        task = self._new_task(key)
+        if not task.cancelled:
+            self._start(task, lambda: fn(*args, **kwargs), on_done, on_error)
+        return task
+
+    def stream(
+        self,
+        fn: Callable[..., Iterable[Any]],
+        *args,
+        on_item: Callable[[Any], None],
+        on_done: Optional[Callable[[int], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        key: Optional[str] = None,
+        **kwargs,
+    ) -> BackgroundTask:
+        """Iterate fn(*args, **kwargs) on a worker, delivering each item to on_item.
+
+        Items arrive on the Tk thread in order; on_done then receives the
+        number of items produced. Must be called from the Tk thread.
+        """
+        task = self._new_task(key)
+        if task.cancelled:
+            return task
+
+        def produce() -> int:
+            items = fn(*args, **kwargs)
+            count = 0
+            try:
+                for item in items:
+                    if task.cancelled:
+                        break
+                    self._results.put((task, _Item(item), None, on_item, None))
+                    count += 1
+            finally:
+                # let the generator release its file handles / cursors
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()
+            return count
+
+        self._start(task, produce, on_done, on_error)
+        return task
+
+    def _new_task(self, key: Optional[str]) -> BackgroundTask:
+        task = BackgroundTask(key)
+        if self._closed:
+            task.cancel()
+            return task
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = task
+        return task
+
+    def _start(self, task, call, on_done, on_error) -> None:
+        def run():
+            if task.cancelled:
+                self._results.put((task, _SKIPPED, None, on_done, on_error))
+                return
+            try:
+                result = call()
+            except BaseException as exc:  # delivered to on_error on the UI thread
+                self._results.put((task, None, exc, on_done, on_error))
+                return
+            self._results.put((task, result, None, on_done, on_error))
+
+        self._pending += 1
+        if self._pending == 1:
+            self._notify_busy(True)
+        self._pool.submit(run)
+        self._schedule_poll()
+
+    def cancel(self, key: str) -> None:
+        """Cancel the latest task submitted with `key`, if any."""
+        task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def _schedule_poll(self) -> None:
+        if self._polling or self._closed:
+            return
+        self._polling = True
+        try:
+            self.root.after(self.poll_ms, self._poll)
+        except Exception:
+            # root destroyed; nothing left to deliver to
+            self._polling = False
+
+    def _poll(self) -> None:
+        self._polling = False
+        deadline = time.monotonic() + _POLL_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                task, result, exc, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(result, _Item):
+                if not (task.cancelled or self._closed):
+                    try:
+                        on_done(result.value)
+                    except Exception:
+                        logger.exception("Background task callback failed")
+                continue
+            self._pending -= 1
+            if task.key is not None and self._latest.get(task.key) is task:
+                del self._latest[task.key]
+            if result is _SKIPPED or task.cancelled or self._closed:
+                continue
+            try:
+                if exc is not None:
+                    if on_error is not None:
+                        on_error(exc)
+                    else:
+                        logger.error("Background task failed", exc_info=exc)
+                elif on_done is not None:
+                    on_done(result)
+            except Exception:
+                logger.exception("Background task callback failed")
+        if self._pending > 0:
+            self._schedule_poll()
+        else:
+            self._notify_busy(False)
+
+    def _notify_busy(self, busy: bool) -> None:
+        if self.on_busy is None or self._closed:
+            return
+        try:
+            self.on_busy(busy)
+        except Exception:
+            logger.debug("busy indicator update failed", exc_info=True)
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Pump Tk events until every submitted task was delivered (tests, shutdown).
+
+        Returns False if tasks are still pending after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while self._pending > 0 and time.monotonic() < deadline:
+            self.root.update()
+            time.sleep(self.poll_ms / 1000.0 / 5)
+        return self._pending == 0
+
+    def shutdown(self) -> None:
+        """Drop pending results and stop the workers without waiting for them."""
+        self._closed = True
+        for task in list(self._latest.values()):
+            task.cancel()
+        self._latest.clear()
+        self._pool.shutdown(wait=False)
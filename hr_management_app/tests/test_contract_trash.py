@@ -100,6 +100,84 @@ class ContractTrashTests(unittest.TestCase):
         ids = [r[0] for r in all_rows]
         self.assertNotIn(parent_id, ids)
 
+    def _create_tree(self):
+        """root -> child -> grandchild, plus an unrelated sibling root; each with a subset."""
+        ids = [self._create_sample_contract() for _ in range(4)]
+        root, child, grandchild, other = ids
+        with database._conn() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE contracts SET parent_contract_id = ? WHERE id = ?", (root, child))
+            cur.execute("UPDATE contracts SET parent_contract_id = ? WHERE id = ?", (child, grandchild))
+            conn.commit()
+        subsets = {cid: database.create_contract_subset(cid, f"phase {cid}") for cid in ids}
+        with database._conn() as conn:
+            conn.executemany(
+                "INSERT INTO subset_status_history (subset_id, old_status, new_status) VALUES (?, 'starting', 'in_progress')",
+                [(sid,) for sid in subsets.values()],
+            )
+            conn.commit()
+        return ids, subsets
+
+    def test_subtree_soft_delete_restore_and_hard_delete(self):
+        (root, child, grandchild, other), subsets = self._create_tree()
+
+        database.soft_delete_contract(root)
+        trashed = {int(r[0]) for r in database.list_trashed_contracts()}
+        self.assertEqual(trashed, {root, child, grandchild})
+
+        database.restore_contract(root)
+        self.assertEqual(database.list_trashed_contracts(), [])
+
+        database.delete_contract_and_descendants(root)
+        remaining = {int(r[0]) for r in database.get_all_contracts_filtered(include_deleted=True)}
+        self.assertEqual(remaining, {other})
+        with database._conn() as conn:
+            sub_ids = {r[0] for r in conn.execute("SELECT id FROM contract_subsets")}
+            hist_ids = {r[0] for r in conn.execute("SELECT subset_id FROM subset_status_history")}
+        self.assertEqual(sub_ids, {subsets[other]})
+        self.assertEqual(hist_ids, {subsets[other]})
+
+    def test_contract_forest_includes_subset_counts(self):
+        (root, child, grandchild, other), subsets = self._create_tree()
+        database.create_contract_subset(root, "second phase")
+        database.soft_delete_contract(other)
+
+        forest = {int(r[0]): r for r in database.get_contract_forest()}
+        self.assertEqual(set(forest), {root, child, grandchild})
+        self.assertEqual(forest[root][3], None)
+        self.assertEqual(forest[grandchild][3], child)
+        self.assertEqual(forest[root][-1], 2)
+        self.assertEqual(forest[child][-1], 1)
+        self.assertIn(other, {int(r[0]) for r in database.get_contract_forest(include_deleted=True)})
+
+        counts = database.get_subset_counts([root, child, other, 999999])
+        self.assertEqual(counts, {root: 2, child: 1, other: 1, 999999: 0})
+
+    def test_contract_children_one_level_at_a_time(self):
+        (root, child, grandchild, other), _ = self._create_tree()
+        with database._conn() as conn:
+            conn.execute("UPDATE contracts SET area = 'B' WHERE id = ?", (root,))
+            conn.execute("UPDATE contracts SET area = 'A' WHERE id = ?", (other,))
+            conn.commit()
+
+        roots = database.get_contract_children(None)
+        self.assertEqual([r[0] for r in roots], [root, other])
+        self.assertEqual([r[-1] for r in roots], [1, 0])  # has_children
+        by_area = database.get_contract_children(None, order_by="area")
+        self.assertEqual([r[0] for r in by_area], [other, root])
+        self.assertEqual([r[0] for r in database.get_contract_children(child)], [grandchild])
+
+        database.soft_delete_contract(grandchild)
+        self.assertEqual(database.get_contract_children(child), [])
+        self.assertEqual(database.get_contract_children(root)[0][-1], 0)
+
+    def test_contract_ancestry_keeps_matches_reachable(self):
+        (root, child, grandchild, other), _ = self._create_tree()
+        expected = {root: None, child: root, grandchild: child}
+        self.assertEqual(database.get_contract_ancestry([grandchild]), expected)
+        self.assertEqual(database.get_contract_ancestry([grandchild, child]), expected)
+        self.assertEqual(database.get_contract_ancestry([]), {})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import importlib
+import os
+import sqlite3
+import tempfile
+import unittest
+
+database = importlib.import_module("hr_management_app.src.database.database")
+migrations = importlib.import_module("hr_management_app.src.database.migrations")
+
+
+class SchemaMigrationTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.dbpath = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.remove(self.dbpath)
+        self._prev_env = os.environ.get("HR_MANAGEMENT_TEST_DB")
+        os.environ["HR_MANAGEMENT_TEST_DB"] = self.dbpath
+
+    def tearDown(self):
+        database.close_all_connections()
+        try:
+            os.remove(self.dbpath)
+        except Exception:
+            pass
+        if self._prev_env is None:
+            os.environ.pop("HR_MANAGEMENT_TEST_DB", None)
+        else:
+            os.environ["HR_MANAGEMENT_TEST_DB"] = self._prev_env
+
+    def _version(self):
+        conn = sqlite3.connect(self.dbpath)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_new_db_is_created_at_latest_version(self):
+        self.assertEqual(database.get_all_users(), [])
+        self.assertEqual(self._version(), migrations.LATEST_VERSION)
+
+    def test_legacy_db_is_upgraded_in_place(self):
+        conn = sqlite3.connect(self.dbpath)
+        conn.execute(
+            "CREATE TABLE contracts (id INTEGER PRIMARY KEY, employee_id INTEGER, start_date TEXT, end_date TEXT, terms TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO contracts (id, employee_id, terms) VALUES (1, 42, 'legacy')"
+        )
+        conn.commit()
+        conn.close()
+
+        database.init_db()
+
+        self.assertEqual(self._version(), migrations.LATEST_VERSION)
+        conn = sqlite3.connect(self.dbpath)
+        try:
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(contracts)")]
+            for col in ("construction_id", "parent_contract_id", "deleted", "deleted_at"):
+                self.assertIn(col, cols)
+            row = conn.execute(
+                "SELECT construction_id, deleted FROM contracts WHERE id = 1"
+            ).fetchone()
+            self.assertEqual(row, (42, 0))
+        finally:
+            conn.close()
+
+    def test_current_db_is_not_migrated_again(self):
+        database.init_db()
+        calls = []
+        original = migrations.MIGRATIONS
+        migrations.MIGRATIONS = [(n, lambda c, n=n: calls.append(n)) for n, _ in original]
+        try:
+            database.close_all_connections()
+            database.init_db()
+            database.get_all_users()
+        finally:
+            migrations.MIGRATIONS = original
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import importlib
+import os
+import tempfile
+import unittest
+
+database = importlib.import_module("hr_management_app.src.database.database")
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.dbpath = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self._prev_env = os.environ.get("HR_MANAGEMENT_TEST_DB")
+        os.environ["HR_MANAGEMENT_TEST_DB"] = self.dbpath
+        database.init_db()
+
+    def tearDown(self):
+        database.close_all_connections()
+        try:
+            os.remove(self.dbpath)
+        except Exception:
+            pass
+        if self._prev_env is None:
+            os.environ.pop("HR_MANAGEMENT_TEST_DB", None)
+        else:
+            os.environ["HR_MANAGEMENT_TEST_DB"] = self._prev_env
+
+    def _stats(self):
+        return database.get_pool_stats()[self.dbpath]
+
+    def test_connections_are_reused(self):
+        before = self._stats()["created"]
+        for _ in range(20):
+            database.get_all_users()
+        stats = self._stats()
+        self.assertEqual(stats["created"], before)
+        self.assertGreaterEqual(stats["reused"], 20)
+        self.assertEqual(stats["in_use"], 0)
+
+    def test_nested_blocks_get_distinct_connections(self):
+        with database._conn() as outer:
+            with database._conn() as inner:
+                self.assertIsNot(outer, inner)
+                self.assertEqual(self._stats()["in_use"], 2)
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        with database._conn() as conn:
+            conn.execute(
+                "INSERT INTO users (email, password_hash, salt) VALUES (?, ?, ?)",
+                ("pool_rollback@example.com", "h", "s"),
+            )
+        self.assertIsNone(database.get_user_by_email("pool_rollback@example.com"))
+
+    def test_replaced_db_file_is_not_served_from_pool(self):
+        database.get_all_users()
+        database.close_all_connections()
+        os.remove(self.dbpath)
+        # a fresh file at the same path must get its schema created again
+        database.init_db()
+        uid = database.create_user("pool_fresh@example.com", "pw")
+        self.assertTrue(uid)
+        # replace the file while a connection is idle in the pool
+        os.remove(self.dbpath)
+        self.assertEqual(database.get_all_users(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import importlib
+import os
+import tempfile
+import threading
+import unittest
+
+database = importlib.import_module("hr_management_app.src.database.database")
+pragmas = importlib.import_module("hr_management_app.src.database.pragmas")
+
+
+class PragmaProfileTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dbpath = os.path.join(self.tmpdir, "pragmas.db")
+        self._prev_env = os.environ.get("HR_MANAGEMENT_TEST_DB")
+        self._prev_profile = database.DB_PROFILE
+        os.environ["HR_MANAGEMENT_TEST_DB"] = self.dbpath
+
+    def tearDown(self):
+        database.DB_PROFILE = self._prev_profile
+        os.environ.pop("HR_MANAGEMENT_DB_BUSY_TIMEOUT", None)
+        database.close_all_connections()
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+        if self._prev_env is None:
+            os.environ.pop("HR_MANAGEMENT_TEST_DB", None)
+        else:
+            os.environ["HR_MANAGEMENT_TEST_DB"] = self._prev_env
+
+    def _pragma(self, name):
+        with database._conn() as conn:
+            return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_default_profile_waits_on_locks(self):
+        database.DB_PROFILE = "default"
+        self.assertEqual(self._pragma("busy_timeout"), 5000)
+        self.assertEqual(self._pragma("temp_store"), 2)  # MEMORY
+        self.assertNotEqual(str(self._pragma("journal_mode")).lower(), "wal")
+
+    def test_single_writer_profile_uses_wal(self):
+        database.DB_PROFILE = "multi_reader_single_writer"
+        os.environ["HR_MANAGEMENT_DB_BUSY_TIMEOUT"] = "1234"
+        self.assertEqual(str(self._pragma("journal_mode")).lower(), "wal")
+        self.assertEqual(self._pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self._pragma("busy_timeout"), 1234)
+        # writes still work through the serialized write path
+        self.assertIsNotNone(database.record_check_in(1))
+        self.assertIsNotNone(database.record_check_out(1))
+
+    def test_concurrent_check_ins_insert_one_row(self):
+        database.DB_PROFILE = "default"  # no in-process write lock; BEGIN IMMEDIATE only
+        start = threading.Barrier(4)
+        results = []
+
+        def check_in():
+            start.wait()
+            results.append(database.record_check_in(7))
+
+        threads = [threading.Thread(target=check_in) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sum(r is not None for r in results), 1)
+        with database._conn() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM attendance WHERE employee_id = 7").fetchone()[0]
+        self.assertEqual(rows, 1)
+
+    def test_unknown_profile_falls_back_to_default(self):
+        self.assertEqual(
+            pragmas.resolve_profile("no-such-profile"), pragmas.resolve_profile("default")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import csv
+import importlib
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from hr_management_app.src.database import database as db
+from hr_management_app.src import import_pipeline
+from hr_management_app.src.import_pipeline import (
+    heuristic_imputations,
+    iter_docx_chunks,
+    iter_prepared_chunks,
+    open_import,
+    prepare_records,
+    run_import,
+)
+from hr_management_app.src.parsers.file_parser import iter_file_chunks
+
+
+class ImportPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "people.csv")
+        with open(self.path, "w", newline="", encoding="utf-8") as fh:
+            w = csv.writer(fh)
+            w.writerow(["Full Name", "E-mail", "Job Title", "Year Start"])
+            for i in range(5):
+                w.writerow([f"Person {i}", f"p{i}@example.com", "Welder", "2010"])
+            w.writerow(["Nobody Known", "", "", ""])
+
+    def tearDown(self):
+        db.close_all_connections()
+        shutil.rmtree(self.tmpdir)
+
+    def _docx_folder(self):
+        import docx
+
+        folder = os.path.join(self.tmpdir, "docs")
+        os.makedirs(os.path.join(folder, "b"))
+        table_doc = docx.Document()
+        table = table_doc.add_table(rows=3, cols=2)
+        for row, vals in zip(table.rows, [("Name", "Email"), ("Ann Lee", "ann@example.com"),
+                                          ("Bo Kim", "bo@example.com")]):
+            for cell, v in zip(row.cells, vals):
+                cell.text = v
+        table_doc.save(os.path.join(folder, "a_staff.docx"))
+        kv_doc = docx.Document()
+        kv_doc.add_paragraph("Name: Cy Young")
+        kv_doc.add_paragraph("Email: cy@example.com")
+        kv_doc.save(os.path.join(folder, "b", "resume.docx"))
+        with open(os.path.join(folder, "broken.docx"), "wb") as fh:
+            fh.write(b"not a zip")
+        with open(os.path.join(folder, "~$a_staff.docx"), "wb") as fh:
+            fh.write(b"lock")
+        docx.Document().save(os.path.join(folder, "empty.docx"))
+        return folder
+
+    def test_chunks_are_mapped_and_validated_in_order(self):
+        first, rest = open_import(self.path, chunk_size=4)
+        self.assertEqual(len(first), 4)
+        records = prepare_records(first, {})
+        for raws in rest:
+            records.extend(prepare_records(raws, {}))
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[0]["cleaned"]["name"], "Person 0")
+        self.assertEqual(records[0]["mapped"]["email"], "p0@example.com")
+        self.assertEqual(records[4]["raw"]["Full Name"], "Person 4")
+        self.assertEqual(records[0]["problems"], [])
+
+    def test_heuristics_only_report_missing_fields(self):
+        first, rest = open_import(self.path)
+        self.assertEqual(list(rest), [])
+        records = prepare_records(first, {})
+        changes = heuristic_imputations(records, {"emails": []})
+        # fields a row already has are never reported
+        self.assertEqual(set(changes[0]), {"dob"})
+        # the empty row gets file-wide values
+        self.assertEqual(changes[5]["job_title"], "Welder")
+        self.assertEqual(changes[5]["year_start"], 2010)
+        self.assertTrue(changes[5]["email"].endswith("@example.com"))
+        self.assertNotIn("name", changes[5])
+        # the records themselves are not modified
+        self.assertIsNone(records[5]["cleaned"]["job_title"])
+
+    def test_process_pool_matches_inline_order(self):
+        inline = list(iter_prepared_chunks(iter_file_chunks(self.path, 2), workers=1))
+        pooled = list(
+            iter_prepared_chunks(iter_file_chunks(self.path, 2), workers=2, max_pending=1)
+        )
+        self.assertEqual(len(pooled), 3)
+        self.assertEqual(pooled, inline)
+
+    def test_pool_workers_load_the_model_memory_mapped(self):
+        imputer_ml = importlib.import_module("hr_management_app.src.ml.imputer_ml")
+        if not imputer_ml.HAS_SKLEARN:
+            self.skipTest("sklearn not installed")
+        import numpy as np
+
+        records = [
+            {"name": f"Ann Welder{i}", "email": f"ann{i}@example.com", "role": "shop",
+             "job_title": ("Welder", "Clerk")[i % 2], "year_start": 2010 + i % 3}
+            for i in range(20)
+        ]
+        model_path = os.path.join(self.tmpdir, "model.joblib")
+        imputer_ml.fit_imputer_from_records(records, save_to=model_path, job_model="linear")
+        try:
+            import_pipeline._init_worker({}, None, model_path, False, None)
+            self.assertIsInstance(import_pipeline._worker_state["model"]["clf"].coef_, np.memmap)
+        finally:
+            import_pipeline._worker_state.clear()
+        inline = list(
+            iter_prepared_chunks(
+                iter_file_chunks(self.path, 2), model=imputer_ml.load_model(model_path), workers=1
+            )
+        )
+        pooled = list(
+            iter_prepared_chunks(iter_file_chunks(self.path, 2), workers=2, model_path=model_path)
+        )
+        self.assertEqual(pooled, inline)
+        imputer_ml.invalidate_model_cache(model_path)
+
+    def test_docx_folder_and_zip_are_parsed_per_file(self):
+        folder = self._docx_folder()
+        errors = []
+        chunks = list(iter_docx_chunks(folder, chunk_size=2, workers=1, file_errors=errors))
+        self.assertEqual(
+            [[r.get("Name") for r in chunk] for chunk in chunks], [["Ann Lee", "Bo Kim"], ["Cy Young"]]
+        )
+        self.assertEqual([name for name, _ in errors], ["broken.docx", "empty.docx"])
+        self.assertIn("no employee records", errors[1][1])
+
+        archive = os.path.join(self.tmpdir, "docs.zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            for root, _, files in os.walk(folder):
+                for f in files:
+                    full = os.path.join(root, f)
+                    zf.write(full, os.path.relpath(full, folder).replace(os.sep, "/"))
+        zip_errors = []
+        pooled = list(iter_docx_chunks(archive, chunk_size=2, workers=2, file_errors=zip_errors))
+        self.assertEqual(pooled, chunks)
+        self.assertEqual([name for name, _ in zip_errors], ["broken.docx", "empty.docx"])
+
+    def test_run_import_writes_all_chunks(self):
+        prev = os.environ.get("HR_MANAGEMENT_TEST_DB")
+        os.environ["HR_MANAGEMENT_TEST_DB"] = os.path.join(self.tmpdir, "import.db")
+        try:
+            # the same email-less person in two chunks: both chunks impute one address
+            with open(self.path, "a", newline="", encoding="utf-8") as fh:
+                csv.writer(fh).writerow(["Nobody Known", "", "", ""])
+            progress = []
+            summary = run_import(
+                self.path, workers=2, chunk_size=6, on_progress=progress.append
+            )
+            self.assertEqual(summary["rows"], 7)
+            self.assertEqual(summary["created_employees"], 7)
+            self.assertEqual(summary["errors"], [])
+            self.assertEqual([p["rows"] for p in progress], [6, 7])
+            emails = {u[1] for u in db.get_all_users()}
+            self.assertEqual(len(emails), 7)
+            self.assertEqual(summary["file_errors"], [])
+
+            # workers=1 parses and prepares the documents without any pool
+            with mock.patch.object(import_pipeline, "default_workers", return_value=4), \
+                    mock.patch.object(import_pipeline, "ProcessPoolExecutor") as pool:
+                summary = run_import(self._docx_folder(), workers=1)
+            pool.assert_not_called()
+            self.assertEqual(summary["created_employees"], 3)
+            self.assertEqual(len(summary["file_errors"]), 2)
+        finally:
+            db.close_all_connections()
+            if prev is None:
+                os.environ.pop("HR_MANAGEMENT_TEST_DB", None)
+            else:
+                os.environ["HR_MANAGEMENT_TEST_DB"] = prev
+
+
+if __name__ == "__main__":
+    unittest.main()
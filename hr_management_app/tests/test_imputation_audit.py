@@ -1,7 +1,11 @@
+import csv
+import gzip
+import json
 import os
 import unittest
 
 from hr_management_app.src.database import database as db
+from hr_management_app.src.database.audit_export import export_audit
 
 
 class ImputationAuditTests(unittest.TestCase):
@@ -45,9 +49,69 @@ class ImputationAuditTests(unittest.TestCase):
         # verify CSV contains our marker
         with open(self.test_csv, "r", encoding="utf-8") as fh:
             data = fh.read()
+        self.assertTrue(data.startswith(",".join(db.IMPUTATION_AUDIT_CSV_COLUMNS)))
         self.assertIn("unit_test", data)
         self.assertIn("__UNIT_TEST_JOB__", data)
 
+    def test_bulk_rows_share_a_session(self):
+        session = db.new_import_session_id()
+        rows = [
+            {"row_index": 999999, "field": f, "old_value": None, "new_value": v}
+            for f, v in (("job_title", "Welder"), ("year_start", "2010"), ("email", "x@example.com"))
+        ]
+        rows[2]["source"] = "heuristic_unit"
+        n = db.record_imputation_audits(rows, import_session_id=session, source="unit_test")
+        self.assertEqual(n, 3)
+        self.assertEqual(db.record_imputation_audits([], import_session_id=session), 0)
+        with db._conn() as conn:
+            got = conn.execute(
+                "SELECT field, source, applied_at FROM imputation_audit WHERE import_session_id = ? ORDER BY id",
+                (session,),
+            ).fetchall()
+            conn.execute("DELETE FROM imputation_audit WHERE import_session_id = ?", (session,))
+            conn.commit()
+        self.assertEqual(
+            [(f, s) for f, s, _ in got],
+            [("job_title", "unit_test"), ("year_start", "unit_test"), ("email", "heuristic_unit")],
+        )
+        self.assertEqual(len({a for _, _, a in got}), 1)
+
+    def test_filtered_streaming_export_formats(self):
+        session = db.new_import_session_id()
+        rows = [
+            {"row_index": 999999, "field": "job_title", "old_value": None, "new_value": f"Job {i}"}
+            for i in range(7)
+        ]
+        db.record_imputation_audits(rows, import_session_id=session, source="unit_test")
+        out = self.test_csv + ".jsonl.gz"
+        try:
+            n = export_audit(out, import_session_id=session, chunk_size=3)
+            self.assertEqual(n, 7)
+            with gzip.open(out, "rt", encoding="utf-8") as fh:
+                got = [json.loads(line) for line in fh]
+            self.assertEqual([g["new_value"] for g in got], [f"Job {i}" for i in range(7)])
+            self.assertNotIn("table", got[0])
+            self.assertGreaterEqual(export_audit(out, ["imputation_audit", "role_audit"]), 7)
+            with gzip.open(out, "rt", encoding="utf-8") as fh:
+                self.assertEqual(json.loads(fh.readline())["table"], "imputation_audit")
+
+            self.assertEqual(export_audit(out, import_session_id=session, since="9999"), 0)
+            with self.assertRaises(ValueError):
+                export_audit(out, ["role_audit"], source="unit_test")
+
+            n = export_audit(self.test_csv, ["imputation_audit", "role_audit"], since="9999")
+            self.assertEqual(n, 0)
+            with open(self.test_csv, newline="", encoding="utf-8") as fh:
+                header = next(csv.reader(fh))
+            self.assertEqual(header[:2], ["table", "id"])
+            self.assertIn("changed_user_id", header)
+        finally:
+            if os.path.exists(out):
+                os.remove(out)
+            with db._conn() as conn:
+                conn.execute("DELETE FROM imputation_audit WHERE import_session_id = ?", (session,))
+                conn.commit()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from hr_management_app.src.database import database as db
+from hr_management_app.src.import_pipeline import collect_db_stats
+from hr_management_app.src.ml.imputer import (
+    EmailAllocator,
+    infer_missing_fields,
+    synthesize_email_from_name,
+)
+
+
+class EmailAllocatorTests(unittest.TestCase):
+    def test_matches_repeated_synthesis(self):
+        names = ["Alex Kim", "alex", "Sam", "", "Alex-B", "Alex1", "sam o'neil"] * 5
+        existing = ["alex@example.com", "alex2@example.com", "alex11@example.com"]
+        taken = set(existing)
+        expected = []
+        for n in names:
+            expected.append(synthesize_email_from_name(n, taken))
+            taken.add(expected[-1])
+        allocator = EmailAllocator(existing)
+        self.assertEqual([allocator.allocate(n) for n in names], expected)
+
+    def test_lookup_is_called_once_per_base(self):
+        calls = []
+
+        def lookup(base):
+            calls.append(base)
+            return ["alex@example.com", "alexandra@example.com"] if base == "alex" else []
+
+        allocator = EmailAllocator(lookup=lookup)
+        got = [allocator.allocate(n) for n in ["Alex", "Alex", "Bo", "alex"]]
+        self.assertEqual(
+            got, ["alex1@example.com", "alex2@example.com", "bo@example.com", "alex3@example.com"]
+        )
+        self.assertEqual(calls, ["alex", "bo"])
+
+    def test_batch_uses_existing_users(self):
+        tmpdir = tempfile.mkdtemp()
+        prev = os.environ.get("HR_MANAGEMENT_TEST_DB")
+        os.environ["HR_MANAGEMENT_TEST_DB"] = os.path.join(tmpdir, "emails.db")
+        try:
+            db.init_db()
+            for email in ("jo@example.com", "jo1@example.com", "joan@example.com"):
+                db.create_user(email, "Password1!", "employee")
+            self.assertEqual(
+                sorted(db.get_user_emails_with_prefix("jo")),
+                ["jo1@example.com", "jo@example.com", "joan@example.com"],
+            )
+            self.assertEqual(db.get_user_emails_with_prefix("joa"), ["joan@example.com"])
+            batch = [{"name": "Jo Ann"}, {"name": "Jo"}, {"name": "Joan", "email": "jo3@example.com"}]
+            out = infer_missing_fields(batch, db_stats=collect_db_stats())
+            self.assertEqual(
+                [r["email"] for r in out],
+                ["jo2@example.com", "jo4@example.com", "jo3@example.com"],
+            )
+        finally:
+            db.close_all_connections()
+            if prev is None:
+                os.environ.pop("HR_MANAGEMENT_TEST_DB", None)
+            else:
+                os.environ["HR_MANAGEMENT_TEST_DB"] = prev
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
+import importlib
+import os
+import tempfile
 import unittest
 
 from hr_management_app.src.ml.imputer_ml import fit_imputer_from_records, predict_batch
 
+imputer_ml = importlib.import_module("hr_management_app.src.ml.imputer_ml")
+
 
 class MLImputerTests(unittest.TestCase):
     def test_fit_and_predict_fallback(self):
@@ -50,6 +55,143 @@ class MLImputerTests(unittest.TestCase):
                 # fallback dict: emulate prediction
                 self.assertTrue("job_by_role" in model or "job_most_common" in model)
 
+    def test_model_cache_follows_the_artifact(self):
+        records = [
+            {"name": "Alice Smith", "role": "engineer", "job_title": "Engineer", "year_start": 2010},
+            {"name": "Bob Jones", "role": "engineer", "job_title": "Engineer", "year_start": 2012},
+            {"name": "Carol", "role": "manager", "job_title": "Manager", "year_start": 2015},
+        ]
+        tmpdir = tempfile.mkdtemp()
+        ext = ".joblib" if imputer_ml.HAS_SKLEARN else ".json"
+        path = os.path.join(tmpdir, "model" + ext)
+        try:
+            trained = fit_imputer_from_records(records, save_to=path)
+            # saving a new artifact primes the cache with the trained model
+            self.assertIs(imputer_ml.load_model(path), trained)
+            imputer_ml.invalidate_model_cache(path)
+            loaded = imputer_ml.load_model(path)
+            self.assertIsNot(loaded, trained)
+            # repeated loads do not deserialize again
+            self.assertIs(imputer_ml.load_model(path), loaded)
+            # a changed file on disk is reloaded
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertIsNot(imputer_ml.load_model(path), loaded)
+            os.remove(path)
+            self.assertIsNone(imputer_ml.load_model(path))
+        finally:
+            imputer_ml.invalidate_model_cache(path)
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+    def test_feature_matrix_columns(self):
+        names = ["Ann Lee", "", None, "José  da-Silva 3", "\u212aelvin \u0130pek", "x\x00y"]
+        records = [{"name": n, "role": r} for n, r in zip(names, ["b", "a", "", "zz", "a", "b"])]
+        X, meta = imputer_ml._extract_features(records[:3])
+        # training: sorted vocabulary, unseen roles get the slot after it
+        self.assertEqual(meta, {"role_vocab": ["", "a", "b"], "role_unknown": 3})
+        X, _ = imputer_ml._extract_features(records, meta["role_vocab"], meta["role_unknown"])
+        self.assertEqual(X.dtype.name, "float32")
+        self.assertTrue(X.flags["C_CONTIGUOUS"])
+        self.assertEqual(
+            X[:, 0].tolist(), [len(imputer_ml._name_tokens(n or "")) for n in names]
+        )
+        self.assertEqual(X[:, 1].tolist(), [len(n or "") for n in names])
+        self.assertEqual(X[:, 2].tolist(), [2, 1, 0, 3, 1, 2])
+
+    def test_hashed_models_round_trip(self):
+        if not imputer_ml.HAS_SKLEARN:
+            self.skipTest("sklearn not installed")
+        records = [
+            {"name": f"Ann Welder{i}", "email": f"ann.w{i}@forge.example", "role": "shop",
+             "job_title": "Welder", "year_start": 2010 + i % 3}
+            for i in range(20)
+        ] + [
+            {"name": f"Bob Clerk{i}", "email": f"bob.c{i}@office.example", "role": "admin",
+             "job_title": "Clerk", "year_start": 2018 + i % 3}
+            for i in range(20)
+        ]
+        X = imputer_ml._hashed_features(records[:3], imputer_ml.HASHED_FEATURES)
+        cfg = imputer_ml.HASHED_FEATURES
+        self.assertEqual(X.format, "csr")
+        self.assertEqual(X.shape, (3, 2 * cfg["n_features"] + cfg["cat_features"]))
+        # the email local parts differ only in their counter, which is dropped
+        local = slice(cfg["n_features"], 2 * cfg["n_features"])
+        self.assertEqual((X[0, local] != X[1, local]).nnz, 0)
+        self.assertGreater(X[0, local].nnz, 0)
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for job_model in ("linear", "nb"):
+                path = os.path.join(tmpdir, job_model + ".joblib")
+                fit_imputer_from_records(records, save_to=path, job_model=job_model)
+                imputer_ml.invalidate_model_cache(path)
+                model = imputer_ml.load_model(path)
+                self.assertEqual(model["features"], cfg)
+                out = predict_batch(
+                    [{"name": "Ann Welder", "email": "ann.w@forge.example", "role": "shop"},
+                     {"name": "Bob Clerk", "email": "bob.c@office.example", "role": "admin"}],
+                    model,
+                )
+                self.assertEqual([r["job_title"] for r in out], ["Welder", "Clerk"], job_model)
+                self.assertTrue(2005 <= out[0]["year_start"] < out[1]["year_start"] <= 2025)
+            with self.assertRaises(ValueError):
+                fit_imputer_from_records(records, save_to=path, job_model="svm")
+        finally:
+            imputer_ml.invalidate_model_cache()
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+    def test_chunked_training_matches_one_batch(self):
+        if not imputer_ml.HAS_SKLEARN:
+            self.skipTest("sklearn not installed")
+        roles = ["ops", "admin", "", "dev"]
+        jobs = ["Welder", "Clerk", None, "Analyst", "Clerk"]
+        records = [
+            {"name": "N" * (i % 7) + " x", "role": roles[i % 4], "job_title": jobs[i % 5],
+             "year_start": 2000 + i % 9 if i % 6 else None}
+            for i in range(60)
+        ]
+        X, meta = imputer_ml._extract_features(records)
+        chunks = [records[i : i + 7] for i in range(0, len(records), 7)]
+        data = imputer_ml._training_set(iter(chunks), "forest")
+        self.assertEqual(data["role_vocab"], meta["role_vocab"])
+        self.assertEqual(data["X"].tolist(), X.tolist())
+        self.assertEqual(list(data["le_job"].classes_), ["Analyst", "Clerk", "Welder"])
+        self.assertEqual(
+            data["le_job"].inverse_transform(data["job"][data["job"] >= 0]).tolist(),
+            [r["job_title"] for r in records if r["job_title"]],
+        )
+        self.assertEqual((data["year"] >= 0).sum(), 50)
+
+        # every job title (and the missing one) keeps its share of the rows
+        labels = data["job"]
+        keep = imputer_ml._stratified_subsample(labels, 30, seed=1)
+        self.assertEqual(len(keep), 30)
+        self.assertEqual(sorted(set(keep.tolist())), keep.tolist())
+        for code in set(labels.tolist()):
+            self.assertEqual((labels[keep] == code).sum(), (labels == code).sum() // 2)
+        self.assertIsNone(imputer_ml._stratified_subsample(labels, 100, seed=1))
+
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "model.joblib")
+        try:
+            model = imputer_ml.fit_imputer_from_chunks(
+                iter(chunks), save_to=path, max_depth=3, max_samples=0.5, max_rows=30
+            )
+            meta = model["metadata"]
+            self.assertEqual((meta["rows"], meta["job_rows"], meta["max_depth"]), (60, 24, 3))
+            self.assertGreater(meta["model_bytes"], 0)
+            self.assertIsNone(model["clf"].n_jobs)
+            self.assertLessEqual(model["clf"].estimators_[0].get_depth(), 3)
+        finally:
+            imputer_ml.invalidate_model_cache()
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,13 @@
 import os
+import tempfile
 import unittest
 
-from hr_management_app.src.parsers.file_parser import parse_csv
+from hr_management_app.src.parsers.file_parser import (
+    iter_csv_chunks,
+    iter_excel_chunks,
+    parse_csv,
+    parse_excel,
+)
 
 
 class ParserCsvTests(unittest.TestCase):
@@ -17,6 +23,51 @@ class ParserCsvTests(unittest.TestCase):
             if os.path.exists(p):
                 os.remove(p)
 
+    def test_csv_chunks_are_bounded_and_complete(self):
+        fd, p = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write("\ufeff Name ,Email,,Name\n")
+            for i in range(25):
+                fh.write(f" Emp {i} ,e{i}@example.com\n")
+            fh.write(",,,\n")
+        try:
+            chunks = list(iter_csv_chunks(p, chunk_size=10))
+            self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+            self.assertEqual(
+                chunks[0][0],
+                {"Name": "Emp 0", "Email": "e0@example.com", "Unnamed: 2": "", "Name.1": ""},
+            )
+        finally:
+            os.remove(p)
+
+
+class ParserExcelTests(unittest.TestCase):
+    def test_excel_rows_are_text_like_the_pandas_reader(self):
+        from datetime import datetime
+
+        from openpyxl import Workbook
+
+        fd, p = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Name", "Year Start", "Date of Birth", "Score"])
+        ws.append(["  Alice ", 2015, datetime(1990, 5, 1), 3.5])
+        ws.append([None, None, None, None])
+        ws.append(["Bob", 2016.0, None, None])
+        wb.save(p)
+        try:
+            self.assertEqual([len(c) for c in iter_excel_chunks(p, chunk_size=1)], [1, 1])
+            self.assertEqual(
+                parse_excel(p),
+                [
+                    {"Name": "Alice", "Year Start": "2015", "Date of Birth": "1990-05-01 00:00:00", "Score": "3.5"},
+                    {"Name": "Bob", "Year Start": "2016", "Date of Birth": "", "Score": ""},
+                ],
+            )
+        finally:
+            os.remove(p)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -54,9 +54,11 @@ def test_pending_contract_window_selects_focused_id(tmp_path):
         # Open the pending contracts window focused on our pending id
         app.open_pending_contracts(focus_pending_id=int(pid))
 
-        # Let Tk create the Toplevel and populate the Treeview
+        # Let Tk create the Toplevel and populate the Treeview (rows are loaded
+        # on the background executor and delivered via after())
         app.update_idletasks()
         app.update()
+        assert app.background.drain(timeout=10)
 
         # Find the Pending Contracts Toplevel by title
         pending_win = None
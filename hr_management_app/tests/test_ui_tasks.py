@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+
+from hr_management_app.src.ui_tasks import TkExecutor
+
+
+class FakeRoot:
+    """Stands in for a Tk root: after() callbacks run on update(), like the mainloop."""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self._callbacks = []
+
+    def after(self, ms, fn):
+        self._callbacks.append(fn)
+
+    def update(self):
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn()
+
+
+class TkExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.busy = []
+        self.executor = TkExecutor(self.root, max_workers=2, poll_ms=1, on_busy=self.busy.append)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_results_are_delivered_on_the_ui_thread(self):
+        seen = []
+        self.executor.submit(
+            lambda x: (x * 2, threading.current_thread()),
+            21,
+            on_done=lambda r: seen.append((r, threading.current_thread())),
+        )
+        self.assertTrue(self.executor.drain(timeout=5))
+        (value, worker), ui_thread = seen[0]
+        self.assertEqual(value, 42)
+        self.assertIsNot(worker, self.root.thread)
+        self.assertIs(ui_thread, self.root.thread)
+        self.assertEqual(self.busy, [True, False])
+
+    def test_errors_go_to_on_error(self):
+        errors = []
+
+        def boom():
+            raise ValueError("bad query")
+
+        self.executor.submit(boom, on_done=lambda r: self.fail("unexpected"), on_error=errors.append)
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_newer_task_with_same_key_supersedes_older(self):
+        release = threading.Event()
+        seen = []
+
+        def slow(tag):
+            release.wait(5)
+            return tag
+
+        self.executor.submit(slow, "first", on_done=seen.append, key="search")
+        self.executor.submit(slow, "second", on_done=seen.append, key="search")
+        release.set()
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual(seen, ["second"])
+        self.assertFalse(self.executor.busy)
+
+    def test_cancel_drops_result(self):
+        seen = []
+        task = self.executor.submit(time.sleep, 0.05, on_done=seen.append, key="k")
+        self.executor.cancel("k")
+        self.assertTrue(task.cancelled)
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual(seen, [])
+
+    def test_stream_delivers_items_in_order_then_count(self):
+        items, done = [], []
+        self.executor.stream(
+            lambda n: (i * i for i in range(n)),
+            5,
+            on_item=lambda v: items.append((v, threading.current_thread())),
+            on_done=done.append,
+        )
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual([v for v, _ in items], [0, 1, 4, 9, 16])
+        self.assertTrue(all(t is self.root.thread for _, t in items))
+        self.assertEqual(done, [5])
+        self.assertEqual(self.busy, [True, False])
+
+    def test_cancel_stops_stream_and_closes_generator(self):
+        first = threading.Event()
+        release = threading.Event()
+        closed = []
+        items = []
+
+        def produce():
+            try:
+                for i in range(1000):
+                    yield i
+                    first.set()
+                    release.wait(5)
+            finally:
+                closed.append(True)
+
+        self.executor.stream(produce, on_item=items.append, key="load")
+        self.assertTrue(first.wait(5))
+        self.executor.cancel("load")
+        release.set()
+        self.assertTrue(self.executor.drain(timeout=5))
+        self.assertEqual(items, [])
+        self.assertEqual(closed, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
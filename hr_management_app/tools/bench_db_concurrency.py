@@ -0,0 +1,151 @@
+"""Benchmark: concurrent check-ins from several processes against one DB file.
+
+For every pragma profile (see src/database/pragmas.py) a fresh DB is created
+and seeded with attendance history, then:
+
+- writer processes each run check-in + check-out cycles for their own employees
+  (record_check_in / record_check_out, i.e. the real write helpers)
+- reader processes run attendance report queries in a loop meanwhile
+
+Reported per profile: completed cycles, "database is locked" errors, and p50 /
+p99 / max latency of a check-in + check-out cycle.
+
+Run: python hr_management_app/tools/bench_db_concurrency.py [writers] [cycles] [readers]
+"""
+
+import multiprocessing as mp
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+PROFILES = ("default", "wal", "multi_reader_single_writer")
+HISTORY_ROWS = 50000
+REPORT_SQL = (
+    "SELECT employee_id, COUNT(*), MIN(check_in), MAX(check_out) "
+    "FROM attendance GROUP BY employee_id"
+)
+
+
+def _use(db_path: str, profile: str):
+    os.environ["HR_MANAGEMENT_TEST_DB"] = db_path
+    os.environ["HR_MANAGEMENT_DB_PROFILE"] = profile
+    from hr_management_app.src.database import database as db
+
+    return db
+
+
+def _seed(db_path: str, profile: str) -> None:
+    db = _use(db_path, profile)
+    with db._conn() as conn:
+        conn.executemany(
+            "INSERT INTO attendance (employee_id, check_in, check_out) VALUES (?, ?, ?)",
+            (
+                (i % 500, "2024-01-01T08:00:00+00:00", "2024-01-01T17:00:00+00:00")
+                for i in range(HISTORY_ROWS)
+            ),
+        )
+        conn.commit()
+    db.close_all_connections()
+
+
+def _writer(db_path, profile, first_emp, cycles, start, out):
+    db = _use(db_path, profile)
+    latencies, errors = [], 0
+    start.wait()
+    for i in range(cycles):
+        emp = first_emp + i
+        t0 = time.perf_counter()
+        try:
+            db.record_check_in(emp)
+            db.record_check_out(emp)
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc) and "busy" not in str(exc):
+                raise
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+    out.put((latencies, errors))
+
+
+def _reader(db_path, profile, start, stop):
+    db = _use(db_path, profile)
+    start.wait()
+    while not stop.is_set():
+        try:
+            with db._conn() as conn:
+                conn.execute(REPORT_SQL).fetchall()
+        except sqlite3.OperationalError:
+            pass
+
+
+def run_profile(profile: str, writers: int, cycles: int, readers: int) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix="hr_conc_")
+    db_path = os.path.join(tmpdir, "bench.db")
+    ctx = mp.get_context("spawn")
+    try:
+        seeder = ctx.Process(target=_seed, args=(db_path, profile))
+        seeder.start()
+        seeder.join()
+        start, stop, out = ctx.Event(), ctx.Event(), ctx.Queue()
+        procs = [
+            ctx.Process(
+                target=_writer,
+                args=(db_path, profile, 10000 + w * cycles, cycles, start, out),
+            )
+            for w in range(writers)
+        ]
+        procs += [
+            ctx.Process(target=_reader, args=(db_path, profile, start, stop))
+            for _ in range(readers)
+        ]
+        for p in procs:
+            p.start()
+        time.sleep(1.0)  # let every process finish importing
+        t0 = time.perf_counter()
+        start.set()
+        latencies, errors = [], 0
+        for _ in range(writers):
+            lat, err = out.get()
+            latencies.extend(lat)
+            errors += err
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        for p in procs:
+            p.join()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    return {
+        "profile": profile,
+        "ok": len(ms),
+        "locked": errors,
+        "p50": statistics.median(ms) if ms else 0.0,
+        "p99": ms[min(len(ms) - 1, int(len(ms) * 0.99))] if ms else 0.0,
+        "max": ms[-1] if ms else 0.0,
+        "rate": len(ms) / elapsed if elapsed else 0.0,
+    }
+
+
+def main(writers: int = 6, cycles: int = 200, readers: int = 2) -> None:
+    print(f"writers: {writers} x {cycles} check-in/out cycles, readers: {readers}")
+    for profile in PROFILES:
+        r = run_profile(profile, writers, cycles, readers)
+        print(
+            f"{r['profile']:<28} ok {r['ok']:5d}  locked {r['locked']:4d}  "
+            f"p50 {r['p50']:7.1f} ms  p99 {r['p99']:7.1f} ms  max {r['max']:7.1f} ms  "
+            f"{r['rate']:7.0f} cycles/s"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,94 @@
+"""Benchmark: per-call sqlite connects vs the pooled `_conn()`.
+
+Builds a throwaway DB with 20,000 employees and measures how many
+`get_employee_by_id`-style lookups per second each strategy sustains:
+
+- legacy: open a new connection, probe sqlite_master, query, close (the old `_conn()`)
+- pooled: the current `database._conn()` backed by the connection pool
+
+Run: python hr_management_app/tools/bench_db_connections.py [iterations]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+NUM_EMPLOYEES = 20000
+SQL = "SELECT id, user_id, employee_number, name, dob, job_title, role, year_start, year_end, profile_pic, contract_type FROM employees WHERE id = ?"
+
+
+def _seed(db):
+    with db._conn() as conn:
+        c = conn.cursor()
+        c.executemany(
+            "INSERT INTO employees (employee_number, name, job_title, role, year_start) VALUES (?, ?, ?, ?, ?)",
+            (
+                (1000 + i, f"Employee {i}", "Engineer", "engineer", 2000 + i % 25)
+                for i in range(NUM_EMPLOYEES)
+            ),
+        )
+        conn.commit()
+
+
+def bench_legacy(path, ids):
+    t0 = time.perf_counter()
+    for emp_id in ids:
+        conn = sqlite3.connect(path)
+        try:
+            c = conn.cursor()
+            c.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='users'"
+            )
+            c.fetchone()
+            c.execute(SQL, (emp_id,))
+            c.fetchone()
+        finally:
+            conn.close()
+    return time.perf_counter() - t0
+
+
+def bench_pooled(db, ids):
+    t0 = time.perf_counter()
+    for emp_id in ids:
+        with db._conn() as conn:
+            c = conn.cursor()
+            c.execute(SQL, (emp_id,))
+            c.fetchone()
+    return time.perf_counter() - t0
+
+
+def main(iterations: int = 20000) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="hr_bench_")
+    path = os.path.join(tmpdir, "bench.db")
+    os.environ["HR_MANAGEMENT_TEST_DB"] = path
+    from hr_management_app.src.database import database as db
+
+    db.init_db()
+    _seed(db)
+    rnd = random.Random(42)
+    ids = [rnd.randint(1, NUM_EMPLOYEES) for _ in range(iterations)]
+
+    legacy = bench_legacy(path, ids)
+    pooled = bench_pooled(db, ids)
+    print(f"employees: {NUM_EMPLOYEES}, lookups: {iterations}")
+    print(f"legacy connect-per-call: {iterations / legacy:10.0f} ops/s ({legacy:.2f}s)")
+    print(f"pooled _conn():          {iterations / pooled:10.0f} ops/s ({pooled:.2f}s)")
+    print(f"speedup: {legacy / pooled:.1f}x")
+    print("pool stats:", db.get_pool_stats().get(path))
+    db.close_all_connections()
+    try:
+        os.remove(path)
+        os.rmdir(tmpdir)
+    except Exception:
+        pass
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
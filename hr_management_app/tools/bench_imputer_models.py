@@ -0,0 +1,72 @@
+"""Benchmark: imputer job_title models (forest vs hashed linear / naive Bayes).
+
+Trains each job_model of imputer_ml.fit_imputer_from_records on the first 80%
+of the 20k dummy import file (rows with a job title), then reports training
+time, artifact size, holdout top-1 accuracy, how many holdout rows clear the
+0.45 confidence threshold predict_batch uses (and their accuracy), and the
+time predict_batch takes on the holdout repeated up to N records
+(default 200,000). Artifacts are written to a temporary directory.
+
+Run: python hr_management_app/tools/bench_imputer_models.py [records]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DUMMY = os.path.join(ROOT, "hr_management_app", "data", "dummy_import_20k.xlsx")
+
+
+def main(n: int = 200_000) -> None:
+    from hr_management_app.src.parsers.file_parser import parse_excel
+
+    imputer_ml = importlib.import_module("hr_management_app.src.ml.imputer_ml")
+    if not imputer_ml.HAS_SKLEARN:
+        print("sklearn/joblib not installed")
+        return
+    rows = [r for r in parse_excel(DUMMY) if r.get("job_title")]
+    cut = len(rows) * 4 // 5
+    train, holdout = rows[:cut], rows[cut:]
+    truth = [r["job_title"] for r in holdout]
+    blank = [dict(r, job_title=None) for r in holdout]
+    big = (blank * (n // len(blank) + 1))[:n]
+    print(f"train: {len(train)}  holdout: {len(holdout)}  predict batch: {n}")
+    print(
+        f"{'model':<7} {'fit s':>7} {'size KB':>8} {'top-1':>6} "
+        f"{'filled':>7} {'acc@fill':>8} {'predict s':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for job_model in imputer_ml.JOB_MODELS:
+            path = os.path.join(tmp, job_model + ".joblib")
+            t0 = time.perf_counter()
+            model = imputer_ml.fit_imputer_from_records(train, save_to=path, job_model=job_model)
+            fit_s = time.perf_counter() - t0
+
+            X = imputer_ml._model_features(model, blank)
+            top1 = model["le_job"].inverse_transform(model["clf"].predict(X))
+            acc = sum(p == t for p, t in zip(top1, truth)) / len(truth)
+            filled = [
+                (r["job_title"], t)
+                for r, t in zip(imputer_ml.predict_batch(blank, model), truth)
+                if r.get("job_title")
+            ]
+            acc_fill = sum(p == t for p, t in filled) / len(filled) if filled else 0.0
+
+            t0 = time.perf_counter()
+            imputer_ml.predict_batch(big, model)
+            predict_s = time.perf_counter() - t0
+            print(
+                f"{job_model:<7} {fit_s:7.2f} {os.path.getsize(path) / 1024:8.0f} {acc:6.1%} "
+                f"{len(filled) / len(blank):7.1%} {acc_fill:8.1%} {predict_s:9.2f}"
+            )
+            imputer_ml.invalidate_model_cache(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,75 @@
+"""Benchmark: per-row validate_and_clean vs validate_and_clean_batch.
+
+Maps the rows of the 20k dummy import file once, then validates them with
+both functions and reports rows/s (best of several runs, date memo cleared
+before each). The dummy file has no dob column, so a second pass adds one
+with a mix of ISO, M/D/YYYY and free-form dates, which is where per-row
+validation spends its time.
+
+Run: python hr_management_app/tools/bench_validate.py [path] [repeat]
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_INPUT = os.path.join(ROOT, "hr_management_app", "data", "dummy_import_20k.xlsx")
+
+
+def _with_dob(rows, seed: int = 7):
+    rnd = random.Random(seed)
+    months = ["Jan", "Mar", "Jun", "Oct", "Dec"]
+    out = []
+    for r in rows:
+        y, m, d = rnd.randint(1950, 2004), rnd.randint(1, 12), rnd.randint(1, 28)
+        dob = rnd.choice(
+            [f"{y:04d}-{m:02d}-{d:02d}", f"{m}/{d}/{y}", f"{d} {rnd.choice(months)} {y}"]
+        )
+        out.append(dict(r, dob=dob))
+    return out
+
+
+def _best(fn, repeat: int) -> float:
+    from hr_management_app.src.parsers.normalizer import _parse_dob
+
+    times = []
+    for _ in range(repeat):
+        _parse_dob.cache_clear()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(path: str = DEFAULT_INPUT, repeat: int = 5) -> None:
+    from hr_management_app.src.parsers.file_parser import parse_excel
+    from hr_management_app.src.parsers.normalizer import (
+        get_column_mapper,
+        validate_and_clean,
+        validate_and_clean_batch,
+    )
+
+    raw = parse_excel(path)
+    mapper = get_column_mapper(raw[0].keys())
+    rows = [mapper.map(r) for r in raw]
+    print(f"rows: {len(rows)} ({os.path.basename(path)})")
+    for label, data in (("as file", rows), ("with dob", _with_dob(rows))):
+        assert validate_and_clean_batch(data) == [validate_and_clean(r) for r in data]
+        for name, fn in (
+            ("per-row", lambda: [validate_and_clean(r) for r in data]),
+            ("batch", lambda: validate_and_clean_batch(data)),
+        ):
+            elapsed = _best(fn, repeat)
+            print(f"{label:<9} {name:<8} {elapsed * 1000:8.1f} ms  {len(data) / elapsed:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INPUT,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
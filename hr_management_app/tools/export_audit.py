@@ -0,0 +1,72 @@
+"""Export audit tables (imputation_audit, role_audit, subset_status_history).
+
+Rows are streamed from the DB in chunks, so any table size exports in
+constant memory. The format follows the file name (.csv, .jsonl, plus .gz
+for gzip) unless --format / --gzip are given.
+
+Examples (run from the repository root):
+
+    python hr_management_app/tools/export_audit.py audit.csv
+    python hr_management_app/tools/export_audit.py roles.jsonl.gz --table role_audit
+    python hr_management_app/tools/export_audit.py all.csv --table imputation_audit \\
+        --table role_audit --table subset_status_history --since 2025-01-01 --actor 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from hr_management_app.src.database.audit_export import (  # noqa: E402
+    AUDIT_TABLES,
+    EXPORT_CHUNK_SIZE,
+    FORMATS,
+    export_audit,
+)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("path", help="output file (.csv, .jsonl, optionally .gz)")
+    ap.add_argument(
+        "--table",
+        action="append",
+        choices=list(AUDIT_TABLES),
+        help="table to export; repeat for several (default: imputation_audit)",
+    )
+    ap.add_argument("--since", help="ISO timestamp/date, inclusive")
+    ap.add_argument("--until", help="ISO timestamp/date, exclusive")
+    ap.add_argument("--source", help="imputation_audit source, e.g. import_preview")
+    ap.add_argument("--actor", type=int, help="actor user id")
+    ap.add_argument("--session", help="imputation_audit import_session_id")
+    ap.add_argument("--format", choices=FORMATS, help="default: from the file name")
+    ap.add_argument("--gzip", action="store_true", default=None, help="default: when the name ends in .gz")
+    ap.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        n = export_audit(
+            args.path,
+            args.table or ["imputation_audit"],
+            fmt=args.format,
+            compress=args.gzip,
+            since=args.since,
+            until=args.until,
+            source=args.source,
+            actor_user_id=args.actor,
+            import_session_id=args.session,
+            chunk_size=args.chunk_size,
+        )
+    except ValueError as exc:
+        ap.error(str(exc))
+    print(f"Exported {n} rows to {args.path} in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,33 @@
-"""Headless importer: load an XLSX file and run the same pipeline used by the UI import.
+"""Headless importer: stream an XLSX (or CSV) file through the same pipeline used by the UI import.
 
-Usage: adjust INPUT_PATH constant or pass via environment/PYTHONPATH and run.
+Rows are read one chunk at a time; mapping, validation and imputation run on a
+pool of worker processes and a single writer inserts each chunk in one
+transaction, so memory use does not grow with the size of the file.
+
+Usage: python run_import_xlsx.py [path.xlsx] [--workers N] [--chunk-size N] [--no-impute]
+(path defaults to the 2000-row fixture; workers to one less than the CPU count;
+a folder or .zip of .docx files is imported document by document)
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
 
-# ensure project src is on path
+# ensure the repository root (for the hr_management_app package) and project src are on path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 try:
-    from hr_management_app.src.database.database import (
-        create_employee,
-        create_user,
-        get_user_by_email,
-    )
-    from hr_management_app.src.parsers.file_parser import parse_excel
-    from hr_management_app.src.parsers.normalizer import map_columns, validate_and_clean
+    from hr_management_app.src.import_pipeline import default_workers, run_import
+    from hr_management_app.src.parsers.file_parser import DEFAULT_CHUNK_SIZE
+    from hr_management_app.src.parsers.mapping_store import load_config
 except Exception:
-    from hr_management_app.src.database.database import (  # type: ignore
-        create_employee,
-        create_user,
-        get_user_by_email,
-    )
-    from parsers.file_parser import parse_excel  # type: ignore
-    from parsers.normalizer import map_columns, validate_and_clean  # type: ignore
+    from import_pipeline import default_workers, run_import  # type: ignore
+    from parsers.file_parser import DEFAULT_CHUNK_SIZE  # type: ignore
+    from parsers.mapping_store import load_config  # type: ignore
 
-INPUT = (
+DEFAULT_INPUT = (
     Path(__file__).resolve().parents[1]
     / "src"
     / "tests"
@@ -34,65 +35,58 @@ INPUT = (
     / "dummy_employees_2000.xlsx"
 )
 
-if not INPUT.exists():
-    print(f"Input file not found: {INPUT}")
-    raise SystemExit(2)
 
-print(f"Loading {INPUT}")
-rows = parse_excel(str(INPUT))
-print(f"Read {len(rows)} rows from XLSX")
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("path", nargs="?", default=str(DEFAULT_INPUT))
+    ap.add_argument("--workers", type=int, default=default_workers())
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    ap.add_argument("--no-impute", action="store_true", help="skip ML/heuristic imputation")
+    args = ap.parse_args(argv)
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Input file not found: {path}")
+        return 2
 
-created_users = 0
-created_employees = 0
-skipped = 0
-errors = []
+    print(f"Loading {path} ({args.workers} workers)")
+    t0 = time.perf_counter()
 
-for idx, r in enumerate(rows, start=1):
-    try:
-        mapped = map_columns(r)
-        cleaned, problems = validate_and_clean(mapped)
-        if problems:
-            skipped += 1
-            continue
-        email = cleaned.get("email")
-        if email:
-            existing = get_user_by_email(email)
-            if not existing:
-                pwd = "tmp-pass"
-                create_user(email, pwd)
-                created_users += 1
-            user = get_user_by_email(email)
-            uid = user[0] if user else None
-        else:
-            uid = None
-        ys = cleaned.get("year_start")
-        ye = cleaned.get("year_end")
-        create_employee(
-            user_id=uid or 0,
-            name=cleaned.get("name") or "",
-            dob=cleaned.get("dob"),
-            job_title=cleaned.get("job_title"),
-            role=cleaned.get("role"),
-            year_start=ys,
-            profile_pic=None,
-            contract_type=cleaned.get("contract_type"),
-            year_end=ye,
+    def progress(s):
+        print(
+            f"Processed {s['rows']} rows: created_employees={s['created_employees']}, "
+            f"skipped={s['skipped']}, errors={len(s['errors'])}"
         )
-        created_employees += 1
-    except Exception as e:
-        errors.append(str(e))
-        if idx % 100 == 0:
-            print(
-                f"Processed {idx} rows: created_users={created_users}, created_employees={created_employees}, skipped={skipped}, errors={len(errors)}"
-            )
 
-print("--- Import summary ---")
-print(f"Total rows: {len(rows)}")
-print(f"Created users: {created_users}")
-print(f"Created employees: {created_employees}")
-print(f"Skipped (validation errors): {skipped}")
-print(f"Errors: {len(errors)}")
-if errors:
-    print("Sample errors:")
-    for e in errors[:10]:
-        print("-", e)
+    summary = run_import(
+        str(path),
+        cfg=load_config() or {},
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        impute=not args.no_impute,
+        on_progress=progress,
+    )
+    elapsed = time.perf_counter() - t0
+
+    errors = summary["errors"]
+    print("--- Import summary ---")
+    print(f"Total rows: {summary['rows']}")
+    print(f"Created users: {summary['created_users']}")
+    print(f"Created employees: {summary['created_employees']}")
+    print(f"Skipped (validation errors): {summary['skipped']}")
+    print(f"Skipped (user already has an employee): {summary['skipped_existing']}")
+    print(f"Errors: {len(errors)}")
+    print(f"Elapsed: {elapsed:.1f}s ({summary['rows'] / max(elapsed, 1e-9):.0f} rows/s)")
+    if errors:
+        print("Sample errors:")
+        for idx, e in errors[:10]:
+            print(f"- row {idx + 1}: {e}")
+    if summary["file_errors"]:
+        print(f"Skipped files: {len(summary['file_errors'])}")
+        for name, e in summary["file_errors"][:10]:
+            print(f"- {name}: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
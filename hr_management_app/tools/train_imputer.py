@@ -6,66 +6,94 @@ Usage: run from repo root with virtualenv activated:
 
 This script will read employees (and users) from the DB, build a training set,
 train models and save them under src/models/imputer_model.joblib
+
+Rows are streamed from the DB in chunks (--chunk-size); see --help for the
+model and training options (--n-jobs, --max-samples, --max-depth, --max-rows).
 """
 
+import argparse
 import os
 import sys
 from pprint import pprint
 
-# ensure local src on path
-ROOT = os.path.dirname(os.path.dirname(__file__))
+# ensure local src (and the repository root, for the hr_management_app package) on path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SRC = os.path.join(ROOT, "src")
-if SRC not in sys.path:
-    sys.path.insert(0, SRC)
+for p in (SRC, os.path.dirname(ROOT)):
+    if p not in sys.path:
+        sys.path.insert(0, p)
 
 try:
-    from hr_management_app.src.ml.imputer_ml import fit_imputer_from_records
+    from hr_management_app.src.ml.imputer_ml import JOB_MODELS, fit_imputer_from_chunks
 except Exception:
-    from ml.imputer_ml import fit_imputer_from_records  # type: ignore
+    from ml.imputer_ml import JOB_MODELS, fit_imputer_from_chunks  # type: ignore
 try:
     from hr_management_app.src.database.database import _conn
 except Exception:
     from hr_management_app.src.database.database import _conn  # type: ignore
 
 
-def fetch_records(limit=None):
-    # join users and employees to get name, email, job_title, role, year_start
-    q = """
-    SELECT u.email, e.name, e.job_title, e.role, e.year_start
-    FROM users u
-    LEFT JOIN employees e ON e.user_id = u.id
-    WHERE e.name IS NOT NULL
-    """
-    out = []
-    # Use context manager to ensure DB connection is closed promptly to avoid ResourceWarning
+QUERY = """
+SELECT u.email, e.name, e.job_title, e.role, e.year_start
+FROM users u
+LEFT JOIN employees e ON e.user_id = u.id
+WHERE e.name IS NOT NULL
+"""
+FIELDS = ("email", "name", "job_title", "role", "year_start")
+
+
+def iter_record_chunks(chunk_size=5000):
+    """Yield lists of training records, reading the DB cursor chunk_size rows at a time."""
     with _conn() as conn:
         c = conn.cursor()
-        if limit:
-            c.execute(q, (limit,))
-        else:
-            c.execute(q)
-        rows = c.fetchall()
-
-    for email, name, job_title, role, year_start in rows:
-        out.append(
-            {
-                "email": email,
-                "name": name,
-                "job_title": job_title,
-                "role": role,
-                "year_start": year_start,
-            }
-        )
-    return out
+        c.execute(QUERY)
+        while True:
+            rows = c.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(zip(FIELDS, row)) for row in rows]
 
 
-if __name__ == "__main__":
-    print("Fetching records from DB...")
-    records = fetch_records()
-    print(f"Got {len(records)} records for training")
-    if len(records) < 50:
-        print("Warning: fewer than 50 records; model may be weak.")
-    print("Training model...")
-    model = fit_imputer_from_records(records)
+def add_training_args(ap):
+    ap.add_argument("--job-model", choices=JOB_MODELS, default="forest")
+    ap.add_argument("--chunk-size", type=int, default=5000)
+    ap.add_argument("--n-jobs", type=int, default=-1, help="cores for training (-1: all)")
+    ap.add_argument(
+        "--max-samples", type=float, default=None, help="bootstrap sample per tree (fraction, forest only)"
+    )
+    ap.add_argument("--max-depth", type=int, default=None, help="tree depth limit (forest only)")
+    ap.add_argument(
+        "--max-rows", type=int, default=None, help="train on a subsample stratified by job title"
+    )
+
+
+def training_options(args):
+    return {
+        "job_model": args.job_model,
+        "n_jobs": args.n_jobs,
+        "max_samples": args.max_samples,
+        "max_depth": args.max_depth,
+        "max_rows": args.max_rows,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Train the ML imputer from the employees table.")
+    add_training_args(ap)
+    args = ap.parse_args(argv)
+    print("Training model from DB records...")
+    model = fit_imputer_from_chunks(iter_record_chunks(args.chunk_size), **training_options(args))
     print("Model training complete. Saved model artifact.")
+    meta = model.get("metadata", {})
+    if meta:
+        print(
+            f"Trained on {meta['job_rows']} of {meta['rows']} records in {meta['train_seconds']}s; "
+            f"model size {meta['model_bytes'] / 1e6:.1f} MB"
+        )
+        if meta["rows"] < 50:
+            print("Warning: fewer than 50 records; model may be weak.")
     pprint(model.keys())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,26 @@
 """Train imputer models from an XLSX file and save sklearn joblib artifact.
 
 Usage: run with the project's python executable, e.g.:
-    .venv/Scripts/python.exe hr_management_app/tools/train_imputer_from_xlsx.py
+    .venv/Scripts/python.exe hr_management_app/tools/train_imputer_from_xlsx.py [path.xlsx]
+
+The sheet is read in chunks and fed to fit_imputer_from_chunks, so the rows are
+never all held as dicts; the training options are those of train_imputer.py.
 """
 
+import argparse
 import os
 from pprint import pprint
 
+# train_imputer (next to this file) also puts the project on sys.path
+from train_imputer import add_training_args, training_options
+
 try:
-    from hr_management_app.src.ml.imputer_ml import fit_imputer_from_records
+    from hr_management_app.src.ml.imputer_ml import fit_imputer_from_chunks
+    from hr_management_app.src.parsers.file_parser import iter_excel_chunks
 except Exception:
     # allow running from repo root when package not installed
-    from ml.imputer_ml import fit_imputer_from_records  # type: ignore
-try:
-    from openpyxl import load_workbook
-except Exception as exc:
-    raise SystemExit(
-        "openpyxl not installed. Run: python -m pip install openpyxl"
-    ) from exc
+    from ml.imputer_ml import fit_imputer_from_chunks  # type: ignore
+    from parsers.file_parser import iter_excel_chunks  # type: ignore
 
 IN_FILE = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "data", "dummy_import_20k.xlsx"
@@ -27,43 +30,43 @@ OUT_PATH = os.path.join(
 )
 
 
-def read_xlsx(path):
-    wb = load_workbook(path, read_only=True)
-    ws = wb.active
-    if ws is None:
-        raise RuntimeError("Workbook has no active sheet")
-    it = ws.iter_rows(values_only=True)
-    headers = list(next(it))
-    records = []
-    for row in it:
-        r = dict(zip(headers, row))
-        # normalize keys to expected names (lowercase); coerce keys to str
-        rec = {str(k).lower(): v for k, v in r.items()}
-        records.append(rec)
-    return records
+def iter_xlsx_chunks(path, chunk_size, samples=None):
+    """Chunks of records with lower-cased keys; rows missing a field are copied into `samples` (up to 10)."""
+    for chunk in iter_excel_chunks(path, chunk_size):
+        records = [{str(k).lower(): v for k, v in r.items()} for r in chunk]
+        if samples is not None and len(samples) < 10:
+            samples.extend(
+                r for r in records if not r.get("job_title") or not r.get("year_start")
+            )
+            del samples[10:]
+        yield records
 
 
-if __name__ == "__main__":
-    print("Reading", IN_FILE)
-    recs = read_xlsx(IN_FILE)
-    print("Loaded", len(recs), "rows")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Train the ML imputer from an XLSX file.")
+    ap.add_argument("path", nargs="?", default=IN_FILE)
+    add_training_args(ap)
+    args = ap.parse_args(argv)
 
-    # filter rows with at least some fields
+    print("Reading", args.path)
+    samples = []
     print("Training sklearn models (if sklearn available)...")
-    model = fit_imputer_from_records(recs, save_to=OUT_PATH)
+    model = fit_imputer_from_chunks(
+        iter_xlsx_chunks(args.path, args.chunk_size, samples),
+        save_to=OUT_PATH,
+        **training_options(args),
+    )
     print("Saved model to", OUT_PATH)
     try:
         print("Model type:", model.get("type"))
         if model.get("type") == "sklearn":
             le_job = model.get("le_job")
             print("Job classes:", len(getattr(le_job, "classes_", [])))
+            pprint(model.get("metadata"))
     except Exception:
         pass
 
     # quick smoke predictions on a few rows with missing fields
-    samples = [r for r in recs if not r.get("job_title") or not r.get("year_start")][
-        :10
-    ]
     if samples:
         print(
             "Running sample predictions on first",
@@ -83,3 +86,7 @@ if __name__ == "__main__":
         pprint(out[:5])
     else:
         print("No sample rows with missing values found for smoke test")
+
+
+if __name__ == "__main__":
+    main()